@@ -0,0 +1 @@
+"""Benchmarks for the qpc command line client."""
@@ -0,0 +1,81 @@
+"""Time cold starts of `qpc scan list` against a local stub.
+
+Usage: python benchmarks/bench_cold_start.py [--runs N] [--tree PATH ...]
+
+Runs `qpc scan list` --runs times in fresh interpreters, against a stub
+answering one page of scans, and reports the median, mean and 95th
+percentile wall time. Each --tree is a checkout of qpc to run instead of
+this one, to compare revisions (e.g. one extracted with `git archive`).
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
+
+from benchmarks.bench_download_rss import write_qpc_home  # noqa: E402
+from qpc.scan import SCAN_URI  # noqa: E402
+from qpc.tests.stub_server import StubServer, json_response  # noqa: E402
+
+SCANS = 10
+
+
+def scans(handler, body):
+    """Answer a page of scans."""
+    results = [
+        {"id": index, "name": f"scan-{index}", "scan_type": "inspect", "sources": []}
+        for index in range(SCANS)
+    ]
+    return json_response({"count": SCANS, "next": None, "results": results})
+
+
+def run_qpc(tree, env):
+    """Run `qpc scan list` from tree and return how long it took."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "qpc", "scan", "list"],
+        env=env,
+        check=True,
+        cwd=tree,
+        stdout=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument(
+        "--tree",
+        type=Path,
+        nargs="+",
+        default=[Path(__file__).absolute().parent.parent],
+    )
+    args = parser.parse_args()
+
+    print(f"{'tree':<40} {'median':>9} {'mean':>9} {'p95':>9}")
+    with (
+        StubServer({SCAN_URI: scans}) as stub,
+        tempfile.TemporaryDirectory() as tmp,
+    ):
+        home = Path(tmp)
+        write_qpc_home(stub, home)
+        env = {**os.environ, "HOME": str(home)}
+        for tree in args.tree:
+            times = [run_qpc(tree, env) for _ in range(args.runs)]
+            p95 = statistics.quantiles(times, n=20)[-1]
+            print(
+                f"{str(tree):<40} {statistics.median(times) * 1000:>7.1f}ms"
+                f" {statistics.mean(times) * 1000:>7.1f}ms {p95 * 1000:>7.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Measure the peak memory of `qpc report download` on a very large report.
+
+Usage: python benchmarks/bench_download_rss.py [--size-mb MB] [--max-rss-mb MB]
+
+A local stub streams a synthetic report tarball (2 GiB by default, built
+on the fly as a stored gzip stream so the stub itself stays small) and qpc
+downloads it in a subprocess. The benchmark fails if the subprocess peak
+RSS exceeds --max-rss-mb, i.e. if the body is buffered in memory.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
+
+from qpc.report import REPORT_URI  # noqa: E402
+from qpc.tests.stub_server import StubResponse, StubServer  # noqa: E402
+
+REPORT_ID = 1
+BLOCK_SIZE = 1024 * 1024
+TAR_RECORD_SIZE = 10240
+
+
+def synthetic_tarball(size):
+    """Yield a gzipped tarball holding one member of size bytes.
+
+    Deflate level 0 stores the data uncompressed, so the stream is about as
+    large as the member, like a tarball of already compressed data.
+    """
+    compressor = zlib.compressobj(level=0, wbits=31)
+    member = tarfile.TarInfo("report.json")
+    member.size = size
+    written = 0
+    header = member.tobuf(format=tarfile.GNU_FORMAT)
+    written += len(header)
+    yield compressor.compress(header)
+    block = os.urandom(BLOCK_SIZE)
+    remaining = size
+    while remaining:
+        piece = block[: min(BLOCK_SIZE, remaining)]
+        remaining -= len(piece)
+        written += len(piece)
+        yield compressor.compress(piece)
+    # member padding, end-of-archive marker and record padding
+    trailer = -written % tarfile.BLOCKSIZE + 2 * tarfile.BLOCKSIZE
+    trailer += -(written + trailer) % TAR_RECORD_SIZE
+    yield compressor.compress(b"\0" * trailer)
+    yield compressor.flush()
+
+
+def write_qpc_home(stub, home):
+    """Write the server config and token a qpc subprocess reads from home."""
+    config_dir = home / ".config" / "qpc"
+    config_dir.mkdir(parents=True)
+    server_config = {"host": "127.0.0.1", "port": stub.port, "use_http": True}
+    (config_dir / "server.config").write_text(json.dumps(server_config))
+    (config_dir / "client_token").write_text(json.dumps({"token": "benchmark"}))
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--max-rss-mb", type=int, default=256)
+    args = parser.parse_args()
+    size = args.size_mb * 1024 * 1024
+
+    def report(handler, body):
+        return StubResponse(
+            body=synthetic_tarball(size),
+            headers={"Content-Type": "application/gzip"},
+        )
+
+    with (
+        StubServer({f"{REPORT_URI}{REPORT_ID}": report}) as stub,
+        tempfile.TemporaryDirectory() as tmp,
+    ):
+        home = Path(tmp)
+        write_qpc_home(stub, home)
+        output = home / "report.tar.gz"
+        command = [
+            sys.executable,
+            "-m",
+            "qpc",
+            "report",
+            "download",
+            "--report",
+            str(REPORT_ID),
+            "--output-file",
+            str(output),
+        ]
+        env = {**os.environ, "HOME": str(home)}
+        start = time.perf_counter()
+        subprocess.run(command, env=env, check=True, cwd=Path(__file__).parent.parent)
+        elapsed = time.perf_counter() - start
+        peak_rss_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+        written_mb = output.stat().st_size / 1024 / 1024
+
+    print(f"downloaded   {written_mb:,.0f} MiB in {elapsed:.1f}s")
+    print(f"throughput   {written_mb / elapsed:,.0f} MiB/s")
+    print(f"peak RSS     {peak_rss_mb:,.0f} MiB (limit {args.max_rss_mb} MiB)")
+    if peak_rss_mb > args.max_rss_mb:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare the pooled HTTP/1.1 session with the HTTP/2 transport.
+
+Usage: python benchmarks/bench_http2.py [--latency SECONDS] [--concurrency N]
+
+Issues 100 and 1000 GETs through qpc.request.request_many with 100
+requests in flight (--concurrency), against a local TLS stub that answers
+after a fixed latency, once over HTTP/1.1 and once over HTTP/2. Reports the
+wall time and how many connections the stub accepted: the HTTP/1.1 session
+opens one per request in flight, HTTP/2 multiplexes them on one. Requires
+httpx and h2.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
+
+from qpc import http2, request, utils  # noqa: E402
+from qpc.tests.stub_server import StubServer, configure_qpc, json_response  # noqa: E402
+
+ITEM_PATH = "/api/v1/items/"
+SIZES = (100, 1000)
+
+
+def _measure(stub, calls, concurrency):
+    """Return the time to fetch calls items, and the connections opened."""
+    # size the HTTP/1.1 pool for every request in flight
+    request.set_concurrency(concurrency)
+    request.close_session()
+    stub.reset_counters()
+    # distinct query strings, so identical GETs are not coalesced
+    batch = [
+        {"method": "GET", "path": ITEM_PATH, "params": {"id": call}}
+        for call in range(calls)
+    ]
+    start = time.perf_counter()
+    results = request.request_many(batch, concurrency=concurrency)
+    elapsed = time.perf_counter() - start
+    assert all(result.response.status_code == 200 for result in results)  # noqa: PLR2004
+    return elapsed, stub.connection_count
+
+
+def _use_http2(enabled):
+    config = utils.read_server_config()
+    config[utils.CONFIG_HTTP2_KEY] = enabled
+    utils.write_server_config(config)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+    if not http2.http2_available():
+        sys.exit("httpx and h2 are not installed; pip install qpc[http2]")
+
+    def slow_item(handler, body):
+        time.sleep(args.latency)
+        return json_response({"id": 1})
+
+    print(f"{'calls':>6} {'HTTP/1.1':>10} {'conns':>6} {'HTTP/2':>10} {'conns':>6}")
+    with (
+        StubServer({ITEM_PATH: slow_item}, tls=True) as http1_stub,
+        StubServer({ITEM_PATH: slow_item}, http2=True) as http2_stub,
+        tempfile.TemporaryDirectory() as tmp,
+    ):
+        for calls in SIZES:
+            configure_qpc(http1_stub, tmp)
+            http1_time, http1_conns = _measure(http1_stub, calls, args.concurrency)
+            configure_qpc(http2_stub, tmp)
+            _use_http2(True)
+            http2_time, http2_conns = _measure(http2_stub, calls, args.concurrency)
+            print(
+                f"{calls:>6} {http1_time:>9.3f}s {http1_conns:>6}"
+                f" {http2_time:>9.3f}s {http2_conns:>6}"
+            )
+        request.close_session()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Measure the import time of qpc commands with `python -X importtime`.
+
+Usage: python benchmarks/bench_importtime.py [--runs N] [COMMAND ...]
+
+Runs each command (default: a few common ones, with --help so no server is
+needed) in a fresh interpreter with -X importtime, once as qpc runs it,
+importing only the module of the invoked command, and once after importing
+the module of every command first, as qpc did before the command registry
+of qpc.cli. Reports the median total import time and the number of qpc
+modules imported.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).absolute().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from qpc.cli import COMMANDS  # noqa: E402
+
+COMMAND_LINES = (
+    "scan job --help",
+    "report list --help",
+    "cred add --help",
+    "server status --help",
+)
+EAGER_IMPORTS = "".join(
+    f"import {path.split(':')[0]}\n"
+    for actions in COMMANDS.values()
+    for path in actions.values()
+)
+RUN_QPC = "import sys\nfrom qpc.__main__ import main\nsys.argv[0] = 'qpc'\nmain()\n"
+
+
+def import_times(code, args, home):
+    """Return the total import time in ms and the qpc modules of one run."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        env={**os.environ, "HOME": home},
+        check=False,
+    )
+    total = 0
+    modules = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _cumulative, name = line.split(":", 1)[1].split("|")
+        total += int(self_us)
+        modules += name.strip().startswith("qpc")
+    return total / 1000, modules
+
+
+def _measure(code, args, runs, home):
+    samples = [import_times(code, args, home) for _ in range(runs)]
+    return statistics.median(ms for ms, _modules in samples), samples[0][1]
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("commands", nargs="*", default=COMMAND_LINES)
+    args = parser.parse_args()
+
+    print(f"{'command':<24} {'lazy':>9} {'modules':>8} {'eager':>9} {'modules':>8}")
+    with tempfile.TemporaryDirectory() as home:
+        for command in args.commands:
+            argv = command.split()
+            lazy_ms, lazy_modules = _measure(RUN_QPC, argv, args.runs, home)
+            eager_ms, eager_modules = _measure(
+                EAGER_IMPORTS + RUN_QPC, argv, args.runs, home
+            )
+            print(
+                f"{command:<24} {lazy_ms:>7.1f}ms {lazy_modules:>8}"
+                f" {eager_ms:>7.1f}ms {eager_modules:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Compare qpc's JSON codec with and without orjson on a large report.
+
+Usage: python benchmarks/bench_json.py [--sources N]
+
+Builds a synthetic deployments report (about 200 MB of pretty JSON with the
+default 1000 sources) and times decoding it, and encoding it compactly and
+as `report details` prints it, once through orjson and once through the
+json fallback. Both codecs must produce the same documents.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
+
+from qpc import utils  # noqa: E402
+
+
+def synthetic_report(sources):
+    """Return a report with sources sources of 100 systems each."""
+    return {
+        "report_id": 1,
+        "report_type": "details",
+        "report_version": "1.0.0.benchmark",
+        "sources": [
+            {
+                "server_id": "c5b4a5f2-2a6e-4b5d-9f0f-0b2d7e0c7a1e",
+                "source_name": f"source-{source}",
+                "source_type": "network",
+                "facts": [
+                    {
+                        "uname_hostname": f"host{source}-{system}.example.com",
+                        "cpu_count": 8,
+                        "cpu_core_per_socket": 4,
+                        "cpu_bogomips": 4788.75 + system,
+                        "memory_total_gb": 15.5,
+                        "ifconfig_ip_addresses": [
+                            f"10.{source % 256}.{system}.{address}"
+                            for address in range(4)
+                        ],
+                        "installed_products": [
+                            {"id": product, "name": f"Product {product}"}
+                            for product in range(10)
+                        ],
+                        "redhat_packages_gpg_is_redhat": True,
+                        "subscription_manager_id": None,
+                        "date_yum_history": "2024-01-17",
+                    }
+                    for system in range(100)
+                ],
+            }
+            for source in range(sources)
+        ],
+    }
+
+
+def _timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _run(report):
+    pretty, pretty_time = _timed(utils.json_dumps, report, indent=4, sort_keys=True)
+    compact, compact_time = _timed(utils.json_dumps, report)
+    _, loads_time = _timed(utils.json_loads, pretty)
+    return (pretty, compact), (loads_time, compact_time, pretty_time)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sources", type=int, default=1000)
+    args = parser.parse_args()
+    if utils.orjson is None:
+        sys.exit("orjson is not installed; pip install qpc[orjson]")
+    report = synthetic_report(args.sources)
+
+    documents, fast = _run(report)
+    orjson = utils.orjson
+    utils.orjson = None
+    try:
+        fallback_documents, slow = _run(report)
+    finally:
+        utils.orjson = orjson
+    print(f"report size  {len(documents[0]) / 1024 / 1024:,.0f} MiB pretty")
+    print(f"{'':>8} {'orjson':>8} {'json':>8} {'speedup':>8}")
+    for name, fast_time, slow_time in zip(
+        ("loads", "compact", "pretty"), fast, slow, strict=True
+    ):
+        print(
+            f"{name:>8} {fast_time:>7.2f}s {slow_time:>7.2f}s"
+            f" {slow_time / fast_time:>7.1f}x"
+        )
+    if documents != fallback_documents:
+        sys.exit("orjson and json wrote different documents")
+
+
+if __name__ == "__main__":
+    main()
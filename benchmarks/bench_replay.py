@@ -0,0 +1,153 @@
+"""Time qpc commands replayed from a cassette at simulated link speeds.
+
+Usage: python benchmarks/bench_replay.py [--sources N] [--cassette PATH]
+    [--latency SECONDS ...] [--bandwidth MBPS ...]
+
+Records `cred list` (20 pages), `report merge` of 50 scan jobs and
+`report details` of a synthetic report (--sources sources of 100 systems)
+against the local stub, then stops the stub and replays each command from
+the cassette, once per latency and bandwidth. No request reaches the
+network while replaying, so the timings only depend on qpc itself and on
+the simulated link.
+"""
+
+import argparse
+import itertools
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
+
+from benchmarks.bench_download_rss import write_qpc_home  # noqa: E402
+from benchmarks.bench_json import synthetic_report  # noqa: E402
+from qpc import cassette, utils  # noqa: E402
+from qpc.cred import CREDENTIAL_URI  # noqa: E402
+from qpc.report import ASYNC_MERGE_URI, DETAILS_PATH_SUFFIX, REPORT_URI  # noqa: E402
+from qpc.scan import SCAN_JOB_URI  # noqa: E402
+from qpc.tests.stub_server import StubServer, json_response  # noqa: E402
+
+CREDENTIAL_PAGES = 20
+PAGE_SIZE = 100
+SCAN_JOBS = 50
+REPORT_ID = 1
+
+
+def stub_routes(sources):
+    """Return the stub routes the benchmarked commands use."""
+
+    def credentials(handler, body):
+        query = parse_qs(urlsplit(handler.path).query)
+        page = int(query.get("page", ["1"])[0])
+        results = [
+            {"id": page * PAGE_SIZE + index, "name": f"cred-{page}-{index}"}
+            for index in range(PAGE_SIZE)
+        ]
+        next_link = None
+        if page < CREDENTIAL_PAGES:
+            next_link = f"{CREDENTIAL_URI}?page={page + 1}"
+        data = {"count": CREDENTIAL_PAGES * PAGE_SIZE, "next": next_link}
+        return json_response({**data, "results": results})
+
+    details = utils.create_tar_buffer({"report.json": synthetic_report(sources)})
+
+    def report_details(handler, body):
+        response = json_response({})
+        response.headers = {"Content-Type": "application/json+gzip"}
+        response.body = details
+        return response
+
+    routes = {
+        CREDENTIAL_URI: credentials,
+        f"{REPORT_URI}{REPORT_ID}{DETAILS_PATH_SUFFIX}": report_details,
+        ASYNC_MERGE_URI: lambda handler, body: json_response({"job_id": 1}, 201),
+    }
+    for job in range(1, SCAN_JOBS + 1):
+        routes[f"{SCAN_JOB_URI}{job}/"] = lambda handler, body, job=job: json_response(
+            {"id": job, "report_id": job}
+        )
+    return routes
+
+
+def commands(output):
+    """Return the benchmarked qpc commands, by name."""
+    return {
+        "cred list": ["cred", "list"],
+        "report merge": [
+            "report",
+            "merge",
+            "--job-ids",
+            *(str(job) for job in range(1, SCAN_JOBS + 1)),
+        ],
+        "report details": [
+            "report",
+            "details",
+            "--report",
+            str(REPORT_ID),
+            "--json",
+            "--output-file",
+            str(output),
+        ],
+    }
+
+
+def run_qpc(arguments, env):
+    """Run qpc with arguments and return how long it took."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "qpc", *arguments],
+        env=env,
+        check=True,
+        cwd=Path(__file__).parent.parent,
+        stdout=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sources", type=int, default=50)
+    parser.add_argument("--cassette", type=Path, help="keep the cassette there")
+    parser.add_argument("--latency", type=float, nargs="+", default=[0, 0.02, 0.1])
+    parser.add_argument(
+        "--bandwidth", type=float, nargs="+", default=[0, 1], help="0: unlimited"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        home = Path(tmp)
+        path = args.cassette or home / "cassette.jsonl"
+        path.unlink(missing_ok=True)
+        to_run = commands(home / "report.json")
+        env = {**os.environ, "HOME": str(home)}
+        with StubServer(stub_routes(args.sources)) as stub:
+            write_qpc_home(stub, home)
+            record_env = {**env, cassette.RECORD_ENV: str(path)}
+            recorded = {
+                name: run_qpc(arguments, record_env)
+                for name, arguments in to_run.items()
+            }
+        print(f"cassette     {path.stat().st_size / 1024 / 1024:,.1f} MiB")
+        print(f"{'latency':>8} {'MB/s':>6} " + " ".join(f"{n:>15}" for n in to_run))
+        print(f"{'record':>15} " + " ".join(f"{t:>14.2f}s" for t in recorded.values()))
+        for latency, bandwidth in itertools.product(args.latency, args.bandwidth):
+            replay_env = {
+                **env,
+                cassette.REPLAY_ENV: str(path),
+                cassette.LATENCY_ENV: str(latency),
+                cassette.BANDWIDTH_ENV: str(bandwidth * 1_000_000 or ""),
+            }
+            timings = [run_qpc(arguments, replay_env) for arguments in to_run.values()]
+            print(
+                f"{latency:>7.2f}s {bandwidth or '-':>6} "
+                + " ".join(f"{timing:>14.2f}s" for timing in timings)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Compare per-call connections with the pooled qpc session over TLS.
+
+Usage: python benchmarks/bench_session.py [--calls N]
+
+Runs N GETs against a local TLS stub, first through the module-level
+``requests.get`` helper (a new pool per call, as qpc used to do) and then
+through ``qpc.request.get_session()``, reporting wall time and how many
+connections (and therefore TLS handshakes) the stub accepted.
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import requests
+import urllib3
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
+
+from qpc.request import close_session, get_session  # noqa: E402
+from qpc.tests.stub_server import StubServer, json_response  # noqa: E402
+
+STATUS_PATH = "/api/v1/status/"
+
+
+def _run(label, stub, calls, get):
+    stub.reset_counters()
+    url = stub.url + STATUS_PATH
+    start = time.perf_counter()
+    for _ in range(calls):
+        get(url, verify=False).raise_for_status()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<22} {calls:>6} calls  {elapsed:8.3f}s  "
+        f"{elapsed / calls * 1000:7.2f} ms/call  "
+        f"{stub.connection_count:>5} handshakes"
+    )
+    return elapsed
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore", urllib3.exceptions.InsecureRequestWarning)
+    routes = {STATUS_PATH: lambda handler, body: json_response({"api_version": 2})}
+    with StubServer(routes, tls=True) as stub:
+        before = _run("requests.get per call", stub, args.calls, requests.get)
+        after = _run("pooled qpc session", stub, args.calls, get_session().get)
+        close_session()
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Check qpc's startup time and per-command overhead against baselines.
+
+Usage: python benchmarks/bench_startup.py [--runs N] [--threshold PERCENT]
+    [--baseline PATH] [--update]
+
+Measures, offline and against a local stub:
+
+- the total import time reported by `python -X importtime` for
+  `qpc --version` and `qpc scan list`,
+- the wall time of `qpc --version` and of `qpc scan list`,
+- the wall time of `qpc report details` downloading a 100 MB report.
+
+Each value is the median of --runs fresh interpreters (fewer for the
+report), in milliseconds. They are compared with the baselines of
+startup_baseline.json, and the script exits with status 1 when one of them
+exceeds its baseline by more than the threshold of that file (or
+--threshold). Timings depend on the machine: run with --update on the
+machine checking for regressions to record its baselines first.
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).absolute().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.bench_cold_start import scans  # noqa: E402
+from benchmarks.bench_download_rss import write_qpc_home  # noqa: E402
+from benchmarks.bench_importtime import RUN_QPC, import_times  # noqa: E402
+from benchmarks.bench_json import synthetic_report  # noqa: E402
+from qpc import utils  # noqa: E402
+from qpc.report import DETAILS_PATH_SUFFIX, REPORT_URI  # noqa: E402
+from qpc.scan import SCAN_URI  # noqa: E402
+from qpc.tests.stub_server import StubServer, json_response  # noqa: E402
+
+BASELINE = Path(__file__).absolute().parent / "startup_baseline.json"
+DEFAULT_THRESHOLD = 20
+# enough runs for the medians to vary well below the threshold between runs
+DEFAULT_RUNS = 50
+REPORT_ID = 1
+REPORT_MB = 100
+# downloading and writing the report takes seconds, fewer runs are enough
+REPORT_RUNS = 5
+
+
+def report_details_route(size_mb):
+    """Return a stub route answering a details report of about size_mb MB."""
+    source_size = len(json.dumps(synthetic_report(1)))
+    sources = math.ceil(size_mb * 1024 * 1024 / source_size)
+    details = utils.create_tar_buffer({"report.json": synthetic_report(sources)})
+
+    def report_details(handler, body):
+        response = json_response({})
+        response.headers = {"Content-Type": "application/json+gzip"}
+        response.body = details
+        return response
+
+    return report_details
+
+
+def wall_time(arguments, env, runs):
+    """Return the median wall time of qpc with arguments, in milliseconds."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "qpc", *arguments],
+            env=env,
+            check=True,
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+        )
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def import_time(arguments, home, runs):
+    """Return the median total import time of qpc with arguments, in ms."""
+    return statistics.median(
+        import_times(RUN_QPC, arguments, home)[0] for _ in range(runs)
+    )
+
+
+def measure(runs):
+    """Return the measured values, in milliseconds, by name."""
+    routes = {
+        SCAN_URI: scans,
+        f"{REPORT_URI}{REPORT_ID}{DETAILS_PATH_SUFFIX}": report_details_route(
+            REPORT_MB
+        ),
+    }
+    with StubServer(routes) as stub, tempfile.TemporaryDirectory() as tmp:
+        home = Path(tmp)
+        write_qpc_home(stub, home)
+        env = {**os.environ, "HOME": str(home)}
+        report_details = [
+            "report",
+            "details",
+            "--report",
+            str(REPORT_ID),
+            "--json",
+            "--output-file",
+            str(home / "report.json"),
+        ]
+        return {
+            "importtime --version": import_time(["--version"], tmp, runs),
+            "importtime scan list": import_time(["scan", "list"], tmp, runs),
+            "wall --version": wall_time(["--version"], env, runs),
+            "wall scan list": wall_time(["scan", "list"], env, runs),
+            f"wall report details {REPORT_MB} MB": wall_time(
+                report_details, env, min(runs, REPORT_RUNS)
+            ),
+        }
+
+
+def main():
+    """Run the benchmarks and compare them with the baselines."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--threshold", type=float, help="percent, overrides file")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument(
+        "--update", action="store_true", help="record the values as baselines"
+    )
+    args = parser.parse_args()
+
+    stored = {"threshold_percent": DEFAULT_THRESHOLD, "baselines_ms": {}}
+    if args.baseline.exists():
+        stored = json.loads(args.baseline.read_text())
+    threshold = args.threshold
+    if threshold is None:
+        threshold = stored["threshold_percent"]
+    baselines = stored["baselines_ms"]
+
+    measured = measure(args.runs)
+    regressions = []
+    print(f"{'benchmark':<32} {'baseline':>10} {'measured':>10} {'change':>8}")
+    for name, value in measured.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            print(f"{name:<32} {'-':>10} {value:>8.1f}ms")
+            continue
+        change = (value - baseline) / baseline * 100
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<32} {baseline:>8.1f}ms {value:>8.1f}ms {change:>+7.1f}%{flag}")
+
+    if args.update:
+        stored["baselines_ms"] = {
+            name: round(value, 1) for name, value in measured.items()
+        }
+        args.baseline.write_text(json.dumps(stored, indent=2) + "\n")
+        print(f"baselines written to {args.baseline}")
+    elif regressions:
+        sys.exit(f"regressed by more than {threshold}%: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
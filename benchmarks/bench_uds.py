@@ -0,0 +1,66 @@
+"""Compare request latency over TCP, TLS and a Unix domain socket.
+
+Usage: python benchmarks/bench_uds.py [--requests N]
+
+Sends N sequential GETs through qpc.request.request to a local stub
+listening on https://127.0.0.1, http://127.0.0.1 and a Unix socket, and
+prints the median and 99th percentile latency of each transport. Every
+transport starts with a fresh session, so the first request pays for the
+connection (and TLS handshake) like a short qpc command would.
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
+
+from qpc import request  # noqa: E402
+from qpc.tests.stub_server import StubServer, configure_qpc, json_response  # noqa: E402
+
+ITEM_PATH = "/api/v1/items/"
+
+
+def _latencies(stub, directory, count):
+    configure_qpc(stub, directory)
+    request.close_session()
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        request.request(request.GET, ITEM_PATH)
+        latencies.append(time.perf_counter() - start)
+    request.close_session()
+    return latencies
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    routes = {ITEM_PATH: lambda handler, body: json_response({"id": 1})}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        transports = {
+            "tls": StubServer(routes, tls=True),
+            "tcp": StubServer(routes),
+            "unix": StubServer(routes, unix_socket=Path(tmp) / "qpc.sock"),
+        }
+        print(f"{'transport':>9} {'first':>9} {'median':>9} {'p99':>9} {'req/s':>8}")
+        for name, stub in transports.items():
+            with stub:
+                latencies = _latencies(stub, Path(tmp) / name, args.requests)
+            steady = sorted(latencies[1:])
+            p99 = steady[int(len(steady) * 0.99) - 1]
+            print(
+                f"{name:>9} {latencies[0] * 1000:>7.2f}ms"
+                f" {statistics.median(steady) * 1000:>7.3f}ms"
+                f" {p99 * 1000:>7.3f}ms {len(latencies) / sum(latencies):>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
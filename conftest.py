@@ -19,9 +19,11 @@ QPC_PATH_CONSTANTS = (
     "INSIGHTS_CONFIG",
     "INSIGHTS_ENCRYPTION",
     "INSIGHTS_AUTH_TOKEN",
+    "QPC_CACHE_DIR",
     "QPC_CLIENT_TOKEN",
     "QPC_LOG",
     "QPC_SERVER_CONFIG",
+    "QPC_SERVER_INFO",
 )
 
 
@@ -32,6 +34,48 @@ def mock_path_constants(tmp_path, monkeypatch):
         monkeypatch.setattr(f"qpc.utils.{path}", tmp_path / path)
 
 
+@pytest.fixture(autouse=True)
+def instant_retries(monkeypatch):
+    """Retry transient request failures without waiting between attempts."""
+    from qpc.request import RetryPolicy, reset_retry_budget  # noqa: PLC0415
+
+    monkeypatch.setattr("qpc.request.retry_policy", RetryPolicy(backoff_base=0))
+    reset_retry_budget()
+
+
+@pytest.fixture(autouse=True)
+def forget_server_info():
+    """Do not carry server versions recorded by one test over to another."""
+    from qpc.request import reset_server_info  # noqa: PLC0415
+
+    reset_server_info()
+
+
+@pytest.fixture(autouse=True)
+def forget_coalesced_requests():
+    """Do not share GET responses between tests."""
+    from qpc.request import forget_coalesced_requests  # noqa: PLC0415
+
+    forget_coalesced_requests()
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breaker():
+    """Do not carry failures recorded by one test over to another."""
+    from qpc.request import reset_circuit_breaker  # noqa: PLC0415
+
+    reset_circuit_breaker()
+
+
+@pytest.fixture(autouse=True)
+def reset_timeouts():
+    """Start every test with short timeouts and no deadline."""
+    from qpc.request import TIMEOUT_SHORT, set_deadline, set_timeout_class  # noqa: PLC0415
+
+    set_timeout_class(TIMEOUT_SHORT)
+    set_deadline(None)
+
+
 def _set_path_constants_to_none():
     """Set qpc path constants to None."""
     for constant in QPC_PATH_CONSTANTS:
@@ -1,28 +1,51 @@
 """QPC Package Initialization."""
 
-from importlib import metadata
-from pathlib import Path
-from tomllib import load
-
-try:
-    # Let's get the package version from poetry
-    __package__version__ = metadata.version(__package__)
-except metadata.PackageNotFoundError:
-    # PackageNotFoundError may be raised if *not* called from
-    # within a virtual environment, such as during execution of
-    # `python setup.py install` in downstream builds.
-    # As a failsafe, try to load the version defined for poetry
-    # from the pyproject.toml.
+import os
+import sys
+
+
+def _dist_info_version():
+    """Get the version from the name of the package's dist-info directory.
+
+    Installers name it after the package and its version, and looking it up
+    on sys.path is much faster than importing importlib.metadata, which
+    would slow down every qpc invocation, such as `qpc --version`. For the
+    same reason, pathlib is only imported when this fails.
+    """
+    prefix = f"{__package__}-"
+    for entry in sys.path:
+        try:
+            names = os.listdir(entry or ".")  # noqa: PTH208
+        except OSError:
+            continue
+        for name in names:
+            if name.startswith(prefix) and name.endswith(".dist-info"):
+                return name.removeprefix(prefix).removesuffix(".dist-info")
+    return None
+
+
+def _package_version():
+    if version := _dist_info_version():
+        return version
+    # No dist-info directory is found when running from a source checkout,
+    # such as during execution of `python setup.py install` in downstream
+    # builds. Load the version defined in the pyproject.toml, then.
+    from pathlib import Path  # noqa: PLC0415
+
     toml_path = Path(__file__).absolute().parent.parent / "pyproject.toml"
-    with toml_path.open("rb") as f:
-        toml_data = load(f)
-        __package__version__ = (
+    if toml_path.exists():
+        from tomllib import load  # noqa: PLC0415
+
+        with toml_path.open("rb") as f:
+            toml_data = load(f)
             # Expect a value at this exact location.
             # Yes, this will raise KeyError if absent.
             # We want to know ASAP if this breaks.
-            toml_data["project"]["version"]
-        )
+            return toml_data["project"]["version"]
+    # Other installations, such as eggs, are left to importlib.metadata.
+    from importlib import metadata  # noqa: PLC0415
+
+    return metadata.version(__package__)
+
 
-del load
-del Path
-del metadata
+__package__version__ = _package_version()
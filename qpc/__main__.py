@@ -1,12 +1,26 @@
 """Main qpc entrypoint."""
 
-import gettext
+import sys
 
-from qpc.cli import CLI
+from qpc.release import VERSION, get_current_sha1
 
 
 def main():
     """Execute qpc CLI."""
+    # `qpc --version` is run often, by monitoring agents among others, so it
+    # and --build-sha are answered without importing the CLI and its modules.
+    # The output is the one of argparse, which prints the value on its line.
+    if sys.argv[1:] == ["--version"]:
+        print(VERSION)
+        return
+    if sys.argv[1:] == ["--build-sha"]:
+        print(get_current_sha1())
+        return
+
+    import gettext  # noqa: PLC0415
+
+    from qpc.cli import CLI  # noqa: PLC0415
+
     gettext.install("qpc")
     CLI().main()
 
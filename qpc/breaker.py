@@ -0,0 +1,123 @@
+"""Circuit breaker failing fast once the server stops answering.
+
+After FAILURE_THRESHOLD consecutive failed attempts (a connection error, a
+timeout or a 5xx response), the circuit opens: requests fail immediately,
+without being sent, for COOLDOWN seconds. Then it is half-open and lets a
+single probe request through; the circuit closes again if the probe gets an
+answer, and reopens for another cool-down if it fails. Commands issuing many
+requests thus stop waiting out a timeout per request on a degraded server.
+"""
+
+import threading
+import time
+from logging import getLogger
+
+from qpc import messages
+from qpc.translation import _
+
+logger = getLogger(__name__)
+
+# Consecutive failed attempts that open the circuit.
+FAILURE_THRESHOLD = 5
+# Seconds the circuit stays open before a probe request is let through.
+COOLDOWN = 30.0
+# Responses with a status code from this one on count as failures.
+SERVER_ERROR_STATUS = 500
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(Exception):
+    """A request was not sent because the circuit is open."""
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker for the requests of a command.
+
+    :param threshold: consecutive failed attempts that open the circuit
+    :param cooldown: seconds the circuit stays open before a probe
+    """
+
+    def __init__(self, threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.trip_count = 0
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """Let a request through, or raise CircuitOpenError to skip it."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if (
+                self.state == OPEN
+                and time.monotonic() - self._opened_at >= self.cooldown
+            ):
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probing:
+                # a single request probes whether the server is back
+                self._probing = True
+                return
+            self.skipped += 1
+        raise CircuitOpenError()
+
+    def record(self, status_code=None):
+        """Record the outcome of an attempt.
+
+        :param status_code: status code of the response, or None if the
+            attempt failed with a connection error or a timeout
+        """
+        failed = status_code is None or status_code >= SERVER_ERROR_STATUS
+        with self._lock:
+            self._probing = False
+            if not failed:
+                self.completed += 1
+                self._consecutive_failures = 0
+                if self.state != CLOSED:
+                    self.state = CLOSED
+                    logger.info(_(messages.CIRCUIT_CLOSED))
+                return
+            self.failed += 1
+            self._consecutive_failures += 1
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self._consecutive_failures >= self.threshold
+            ):
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self.trip_count += 1
+                logger.error(
+                    _(messages.CIRCUIT_OPENED),
+                    {"failures": self._consecutive_failures, "cooldown": self.cooldown},
+                )
+
+    def cancel(self):
+        """Forget an attempt let through that ended without an outcome.
+
+        A probe that raised before it could be recorded, e.g. on an invalid
+        URL or an interruption, would otherwise keep every later request
+        from probing the server.
+        """
+        with self._lock:
+            self._probing = False
+
+    def log_summary(self):
+        """Log what completed and what was skipped, if the circuit ever opened."""
+        if not self.trip_count:
+            return
+        logger.error(
+            _(messages.CIRCUIT_SUMMARY),
+            {
+                "completed": self.completed,
+                "failed": self.failed,
+                "skipped": self.skipped,
+            },
+        )
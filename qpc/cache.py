@@ -0,0 +1,264 @@
+"""On-disk cache of GET responses, revalidated with ETag and Last-Modified.
+
+Cached bodies are never served without asking the server first: the stored
+validators are sent as If-None-Match/If-Modified-Since, and a 304 answer is
+replaced by the cached response. Commands opt in through
+CliCommand.CACHEABLE; --no-cache disables the cache for a whole run.
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+from dataclasses import dataclass
+from logging import getLogger
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from qpc import utils
+
+logger = getLogger(__name__)
+
+# Upper bound for the size of the cached bodies; least recently used
+# entries are evicted once it is exceeded.
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Headers describing the transfer rather than the representation; bodies
+# are stored decoded, so these must not be replayed.
+_SKIPPED_HEADERS = frozenset(
+    {"connection", "content-encoding", "content-length", "transfer-encoding"}
+)
+
+cache_enabled = True
+
+
+def set_cache_enabled(enabled):
+    """Enable or disable the response cache for this process."""
+    global cache_enabled  # noqa: PLW0603
+    cache_enabled = enabled
+
+
+def cache_key(method, url, params, client_config):
+    """Return the cache key for a request.
+
+    The key covers the server, the full URL with its query string and the
+    identity the request is made with, so entries are never shared between
+    servers or users.
+
+    :param method: request method
+    :param url: absolute request url, without query parameters
+    :param params: query parameters, as accepted by requests
+    :param client_config: ClientConfig the request is made with
+    :returns: hex digest identifying the request
+    """
+    prepared = requests.Request(method, url, params=params).prepare()
+    token_digest = hashlib.sha256((client_config.token or "").encode()).hexdigest()
+    identity = json.dumps(
+        [method, prepared.url, client_config.server_location, token_digest]
+    )
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+def cache_control(response):
+    """Return the Cache-Control directives of a response as a dict.
+
+    Directives without a value, like no-store, map to None.
+    """
+    directives = {}
+    for directive in response.headers.get("Cache-Control", "").split(","):
+        name, _sep, value = directive.partition("=")
+        name = name.strip().lower()
+        if name:
+            directives[name] = value.strip().strip('"') or None
+    return directives
+
+
+def reuse_lifetime(response):
+    """Return for how long a response may be reused without asking the server.
+
+    :param response: a response with its body already read
+    :returns: seconds, math.inf if the server set no limit, or None if the
+        response must not be reused
+    """
+    if response.status_code != requests.codes.ok:
+        return None
+    directives = cache_control(response)
+    if "no-store" in directives or "no-cache" in directives:
+        return None
+    if "no-cache" in response.headers.get("Pragma", "").lower():
+        return None
+    if "max-age" in directives:
+        try:
+            max_age = int(directives["max-age"])
+        except (TypeError, ValueError):
+            return None
+        return max_age if max_age > 0 else None
+    return math.inf
+
+
+def is_storable(response):
+    """Check whether a response may be cached for later revalidation."""
+    if response.status_code != requests.codes.ok:
+        return False
+    if "no-store" in cache_control(response):
+        return False
+    return "ETag" in response.headers or "Last-Modified" in response.headers
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """A cached response, as stored by ResponseCache."""
+
+    url: str
+    status_code: int
+    headers: dict
+    encoding: str | None
+    body: bytes
+
+    def validators(self):
+        """Return the conditional request headers for revalidating this entry."""
+        validators = {}
+        if etag := self.headers.get("ETag"):
+            validators["If-None-Match"] = etag
+        if last_modified := self.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = last_modified
+        return validators
+
+    def to_response(self, not_modified=None):
+        """Rebuild the cached response.
+
+        :param not_modified: the 304 response whose headers refresh the entry
+        :returns: requests.Response with the cached body
+        """
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.url = self.url
+        response.encoding = self.encoding
+        response.headers = CaseInsensitiveDict(self.headers)
+        if not_modified is not None:
+            response.headers.update(_storable_headers(not_modified.headers))
+            response.request = not_modified.request
+            response.elapsed = not_modified.elapsed
+        response._content = self.body
+        return response
+
+
+def _storable_headers(headers):
+    return {
+        name: value
+        for name, value in headers.items()
+        if name.lower() not in _SKIPPED_HEADERS
+    }
+
+
+class ResponseCache:
+    """Directory of cached responses with size-bounded LRU eviction.
+
+    Every entry is a pair of files named after its key: <key>.json holds the
+    metadata and validators, <key>.body the response body. The metadata
+    file's mtime records when the entry was last used.
+    """
+
+    def __init__(self, directory, max_bytes=CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _paths(self, key):
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def get(self, key):
+        """Return the entry stored for key, or None if there is none.
+
+        :param key: cache key, see cache_key()
+        :returns: CacheEntry or None
+        """
+        meta_path, body_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            entry = CacheEntry(
+                url=meta["url"],
+                status_code=meta["status_code"],
+                headers=meta["headers"],
+                encoding=meta.get("encoding"),
+                body=body_path.read_bytes(),
+            )
+            # mark as recently used for eviction
+            os.utime(meta_path)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return entry
+
+    def put(self, key, response):
+        """Store a response under key if it can be revalidated later.
+
+        :param key: cache key, see cache_key()
+        :param response: the response to store
+        :returns: True if the response was stored
+        """
+        if not is_storable(response):
+            return False
+        meta_path, body_path = self._paths(key)
+        meta = {
+            "url": response.url,
+            "status_code": response.status_code,
+            "headers": _storable_headers(response.headers),
+            "encoding": response.encoding,
+        }
+        try:
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            _write_atomically(body_path, response.content)
+            _write_atomically(meta_path, json.dumps(meta).encode())
+        except OSError as err:
+            logger.debug("Failed to cache response for %s: %s", response.url, err)
+            return False
+        self.evict()
+        return True
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits max_bytes."""
+        with self._lock:
+            entries = []
+            total = 0
+            for meta_path in self.directory.glob("*.json"):
+                body_path = meta_path.with_suffix(".body")
+                try:
+                    used = meta_path.stat().st_mtime
+                    size = body_path.stat().st_size
+                except OSError:
+                    continue
+                entries.append((used, size, meta_path, body_path))
+                total += size
+            entries.sort()
+            for _used, size, meta_path, body_path in entries:
+                if total <= self.max_bytes:
+                    break
+                meta_path.unlink(missing_ok=True)
+                body_path.unlink(missing_ok=True)
+                total -= size
+
+    def clear(self):
+        """Remove every cached entry."""
+        with self._lock:
+            for path in self.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+            for path in self.directory.glob("*.body"):
+                path.unlink(missing_ok=True)
+
+
+def _write_atomically(path, content):
+    """Write content next to path and move it into place."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}")
+    try:
+        tmp_path.write_bytes(content)
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def get_response_cache():
+    """Return the response cache stored under the qpc data directory."""
+    return ResponseCache(utils.QPC_CACHE_DIR)
@@ -0,0 +1,224 @@
+"""Record server exchanges to a cassette file and replay them offline.
+
+With QPC_RECORD_CASSETTE set to a file path, every response qpc receives
+through the shared session is appended to that file. With
+QPC_REPLAY_CASSETTE set instead, responses are served from the file and no
+request reaches the network, so commands can be benchmarked or tested
+without a server. QPC_REPLAY_LATENCY (seconds per request) and
+QPC_REPLAY_BANDWIDTH (bytes per second) simulate a slower link.
+
+A cassette holds one JSON object per line. Requests are matched by method
+and path, query string included; identical requests receive the recorded
+responses in order, the last one being repeated once they run out.
+Request headers and cookies are never recorded, and the token field of
+JSON bodies, such as the answer to server login, is redacted, so
+cassettes hold no credentials.
+"""
+
+import base64
+import io
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from qpc import messages
+from qpc.exceptions import QPCError
+from qpc.translation import _
+
+RECORD_ENV = "QPC_RECORD_CASSETTE"
+REPLAY_ENV = "QPC_REPLAY_CASSETTE"
+LATENCY_ENV = "QPC_REPLAY_LATENCY"
+BANDWIDTH_ENV = "QPC_REPLAY_BANDWIDTH"
+
+# Headers describing how the body was sent, which no longer applies to the
+# recorded (decoded) body.
+_TRANSFER_HEADERS = frozenset(
+    {"content-encoding", "content-length", "transfer-encoding", "connection"}
+)
+# Fields of JSON bodies replaced by REDACTED when recorded.
+_SECRET_FIELDS = frozenset({"token"})
+REDACTED = "REDACTED"
+
+
+class CassetteMissError(QPCError):
+    """The replayed cassette holds no response for a request."""
+
+
+def _interaction_key(method, path_url):
+    return f"{method} {path_url}"
+
+
+def _redact(body):
+    """Return body with the secret fields of a JSON object redacted."""
+    try:
+        document = json.loads(body)
+    except ValueError:
+        return body
+    if not isinstance(document, dict) or _SECRET_FIELDS.isdisjoint(document):
+        return body
+    for field in _SECRET_FIELDS.intersection(document):
+        document[field] = REDACTED
+    return json.dumps(document).encode("utf-8")
+
+
+class CassetteRecorder:
+    """Append the exchanges of a session to a cassette file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def record(self, request, response):
+        """Append a request and the response it received.
+
+        :param request: requests.PreparedRequest that was sent
+        :param response: requests.Response received; its body is read
+        """
+        body = _redact(response.content)
+        interaction = {
+            "method": request.method,
+            "path": request.path_url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in _TRANSFER_HEADERS
+                and name.lower() != "set-cookie"
+            },
+        }
+        try:
+            interaction["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            interaction["body_base64"] = base64.b64encode(body).decode("ascii")
+        line = json.dumps(interaction, sort_keys=True) + "\n"
+        with self._lock, self.path.open("a", encoding="utf-8") as cassette:
+            cassette.write(line)
+
+
+class RecordingAdapter(BaseAdapter):
+    """Transport adapter recording the exchanges of the adapter it wraps."""
+
+    def __init__(self, adapter, recorder):
+        super().__init__()
+        self.adapter = adapter
+        self.recorder = recorder
+
+    def send(self, request, **kwargs):
+        """Send the request with the wrapped adapter and record the response."""
+        response = self.adapter.send(request, **kwargs)
+        self.recorder.record(request, response)
+        return response
+
+    def close(self):
+        """Close the wrapped adapter."""
+        self.adapter.close()
+
+
+class _ThrottledBody(io.BytesIO):
+    """Response body read no faster than bandwidth bytes per second."""
+
+    def __init__(self, body, bandwidth):
+        super().__init__(body)
+        self.bandwidth = bandwidth
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        if self.bandwidth and chunk:
+            time.sleep(len(chunk) / self.bandwidth)
+        return chunk
+
+    def release_conn(self):
+        """Nothing to release; requests calls this once a body is consumed."""
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter answering requests from a cassette file.
+
+    :param path: the cassette file
+    :param latency: seconds to wait before each response
+    :param bandwidth: bytes per second response bodies are read at, or None
+        for no limit
+    """
+
+    def __init__(self, path, latency=0.0, bandwidth=None):
+        super().__init__()
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self._interactions = defaultdict(list)
+        self._replayed = defaultdict(int)
+        self._lock = threading.Lock()
+        with Path(path).open(encoding="utf-8") as cassette:
+            for line in cassette:
+                if line.strip():
+                    interaction = json.loads(line)
+                    key = _interaction_key(interaction["method"], interaction["path"])
+                    self._interactions[key].append(interaction)
+
+    def _next_interaction(self, request):
+        key = _interaction_key(request.method, request.path_url)
+        with self._lock:
+            interactions = self._interactions.get(key)
+            if not interactions:
+                raise CassetteMissError(
+                    _(messages.CASSETTE_NO_RESPONSE)
+                    % {"method": request.method, "path": request.path_url}
+                )
+            index = min(self._replayed[key], len(interactions) - 1)
+            self._replayed[key] += 1
+            return interactions[index]
+
+    def send(self, request, **kwargs):
+        """Return the next recorded response to request."""
+        interaction = self._next_interaction(request)
+        if "body_base64" in interaction:
+            body = base64.b64decode(interaction["body_base64"])
+        else:
+            body = interaction["body"].encode("utf-8")
+        if self.latency:
+            time.sleep(self.latency)
+        response = Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction["reason"]
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response.headers["Content-Length"] = str(len(body))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = _ThrottledBody(body, self.bandwidth)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        """Nothing to close."""
+
+
+def mount_cassette(session):
+    """Record or replay the exchanges of session, if the environment asks to.
+
+    :param session: requests.Session whose adapters are already mounted
+    """
+    replay_path = os.environ.get(REPLAY_ENV)
+    if replay_path:
+        bandwidth = os.environ.get(BANDWIDTH_ENV)
+        adapter = ReplayAdapter(
+            replay_path,
+            latency=float(os.environ.get(LATENCY_ENV) or 0),
+            bandwidth=float(bandwidth) if bandwidth else None,
+        )
+        for prefix in list(session.adapters):
+            session.mount(prefix, adapter)
+        return
+    record_path = os.environ.get(RECORD_ENV)
+    if record_path:
+        recorder = CassetteRecorder(record_path)
+        for prefix, adapter in list(session.adapters.items()):
+            session.mount(prefix, RecordingAdapter(adapter, recorder))
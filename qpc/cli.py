@@ -1,71 +1,87 @@
 """QPC Command Line Interface."""
 
 import argparse
+import importlib
 import sys
 
 from qpc import cred, insights, messages, report, scan, server, source, vault
-from qpc.cred.commands import (
-    CredAddCommand,
-    CredClearCommand,
-    CredEditCommand,
-    CredListCommand,
-    CredShowCommand,
-)
-from qpc.insights.commands import (
-    InsightsConfigureCommand,
-    InsightsLoginCommand,
-    InsightsPublishCommand,
-)
 from qpc.release import QPC_VAR_PROGRAM_NAME, VERSION, get_current_sha1
-from qpc.report.aggregate import ReportAggregateCommand
-from qpc.report.commands import (
-    ReportDeploymentsCommand,
-    ReportDetailsCommand,
-    ReportDownloadCommand,
-    ReportInsightsCommand,
-    ReportListCommand,
-    ReportMergeCommand,
-    ReportShowCommand,
-    ReportUploadCommand,
-)
-from qpc.scan.commands import (
-    ScanAddCommand,
-    ScanCancelCommand,
-    ScanClearCommand,
-    ScanEditCommand,
-    ScanJobCommand,
-    ScanListCommand,
-    ScanShowCommand,
-    ScanStartCommand,
-)
-from qpc.server.commands import (
-    ConfigureHostCommand,
-    LoginHostCommand,
-    LogoutHostCommand,
-    ServerStatusCommand,
-)
-from qpc.source.commands import (
-    SourceAddCommand,
-    SourceClearCommand,
-    SourceEditCommand,
-    SourceListCommand,
-    SourceShowCommand,
-)
 from qpc.translation import _
 from qpc.utils import (
     ensure_config_dir_exists,
     ensure_data_dir_exists,
-    get_server_location,
+    get_client_config,
     logger,
-    read_client_token,
+    positive_float,
+    positive_int,
     setup_logging,
 )
-from qpc.vault.commands import (
-    VaultAddCommand,
-    VaultClearCommand,
-    VaultEditCommand,
-    VaultShowCommand,
-)
+
+# Command classes by subcommand and action, as "module:class" paths, so only
+# the module of the invoked command is imported. The order is the one of the
+# choices listed in the help.
+COMMANDS = {
+    server.SUBCOMMAND: {
+        server.CONFIG: "qpc.server.configure_host:ConfigureHostCommand",
+        server.LOGIN: "qpc.server.login_host:LoginHostCommand",
+        server.LOGOUT: "qpc.server.logout_host:LogoutHostCommand",
+        server.STATUS: "qpc.server.status:ServerStatusCommand",
+    },
+    cred.SUBCOMMAND: {
+        cred.ADD: "qpc.cred.add:CredAddCommand",
+        cred.LIST: "qpc.cred.list:CredListCommand",
+        cred.EDIT: "qpc.cred.edit:CredEditCommand",
+        cred.SHOW: "qpc.cred.show:CredShowCommand",
+        cred.CLEAR: "qpc.cred.clear:CredClearCommand",
+    },
+    source.SUBCOMMAND: {
+        source.ADD: "qpc.source.add:SourceAddCommand",
+        source.LIST: "qpc.source.list:SourceListCommand",
+        source.SHOW: "qpc.source.show:SourceShowCommand",
+        source.CLEAR: "qpc.source.clear:SourceClearCommand",
+        source.EDIT: "qpc.source.edit:SourceEditCommand",
+    },
+    scan.SUBCOMMAND: {
+        scan.ADD: "qpc.scan.add:ScanAddCommand",
+        scan.START: "qpc.scan.start:ScanStartCommand",
+        scan.LIST: "qpc.scan.list:ScanListCommand",
+        scan.SHOW: "qpc.scan.show:ScanShowCommand",
+        scan.CANCEL: "qpc.scan.cancel:ScanCancelCommand",
+        scan.EDIT: "qpc.scan.edit:ScanEditCommand",
+        scan.CLEAR: "qpc.scan.clear:ScanClearCommand",
+        scan.JOB: "qpc.scan.job:ScanJobCommand",
+    },
+    report.SUBCOMMAND: {
+        report.AGGREGATE: "qpc.report.aggregate:ReportAggregateCommand",
+        report.DEPLOYMENTS: "qpc.report.deployments:ReportDeploymentsCommand",
+        report.DETAILS: "qpc.report.details:ReportDetailsCommand",
+        report.INSIGHTS: "qpc.report.insights:ReportInsightsCommand",
+        report.DOWNLOAD: "qpc.report.download:ReportDownloadCommand",
+        report.LIST: "qpc.report.list:ReportListCommand",
+        report.MERGE: "qpc.report.merge:ReportMergeCommand",
+        report.SHOW: "qpc.report.show:ReportShowCommand",
+        report.UPLOAD: "qpc.report.upload:ReportUploadCommand",
+    },
+    insights.SUBCOMMAND: {
+        insights.CONFIG: "qpc.insights.configure:InsightsConfigureCommand",
+        insights.LOGIN: "qpc.insights.login:InsightsLoginCommand",
+        insights.PUBLISH: "qpc.insights.publish:InsightsPublishCommand",
+    },
+    vault.SUBCOMMAND: {
+        vault.ADD: "qpc.vault.add:VaultAddCommand",
+        vault.EDIT: "qpc.vault.edit:VaultEditCommand",
+        vault.SHOW: "qpc.vault.show:VaultShowCommand",
+        vault.CLEAR: "qpc.vault.clear:VaultClearCommand",
+    },
+}
+# Subcommand starting an interactive shell, see qpc.shell.
+SHELL = "shell"
+
+
+def load_command(subcommand, action):
+    """Import and return the CliCommand subclass of subcommand and action."""
+    module_name, class_name = COMMANDS[subcommand][action].split(":")
+    return getattr(importlib.import_module(module_name), class_name)
 
 
 class BuildShaAction(argparse.Action):
@@ -96,6 +112,17 @@ class BuildShaAction(argparse.Action):
         parser.exit()
 
 
+def non_negative_int(value):
+    """Argparse type for options accepting an integer greater or equal to zero."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"invalid non-negative int value: '{value}'")
+    return number
+
+
 class CLI:
     """Defines the CLI class.
 
@@ -103,8 +130,14 @@ class CLI:
     to the valid set of commands supported by qpc.
     """
 
-    def __init__(self, name="cli", usage=None, shortdesc=None, description=None):
-        """Create main command line handler."""
+    def __init__(  # noqa: PLR0913
+        self, name="cli", usage=None, shortdesc=None, description=None, argv=None
+    ):
+        """Create main command line handler.
+
+        :param argv: arguments to parse, sys.argv[1:] by default
+        """
+        self.argv = sys.argv[1:] if argv is None else argv
         self.shortdesc = shortdesc
         if shortdesc is not None and description is None:
             description = shortdesc
@@ -120,6 +153,36 @@ class CLI:
             default=0,
             help=_(messages.VERBOSITY_HELP),
         )
+        self.parser.add_argument(
+            "--retries",
+            dest="retries",
+            metavar="RETRIES",
+            type=non_negative_int,
+            default=None,
+            help=_(messages.RETRIES_HELP),
+        )
+        self.parser.add_argument(
+            "--concurrency",
+            dest="concurrency",
+            metavar="CONCURRENCY",
+            type=positive_int,
+            default=None,
+            help=_(messages.CONCURRENCY_HELP),
+        )
+        self.parser.add_argument(
+            "--deadline",
+            dest="deadline",
+            metavar="SECONDS",
+            type=positive_float,
+            default=None,
+            help=_(messages.DEADLINE_HELP),
+        )
+        self.parser.add_argument(
+            "--no-cache",
+            dest="no_cache",
+            action="store_true",
+            help=_(messages.NO_CACHE_HELP),
+        )
         # Note: We deliberately omit "required=True" from this specific subparser.
         # This means a bare "qpc" call with no arguments will still be handled by our
         # code, not argparse's input validation, and result in us calling print_help.
@@ -127,84 +190,79 @@ class CLI:
         self.name = name
         self.args = None
         self.subcommands = {}
-        self._add_subcommand(
-            server.SUBCOMMAND,
-            [
-                ConfigureHostCommand,
-                LoginHostCommand,
-                LogoutHostCommand,
-                ServerStatusCommand,
-            ],
-        )
-        self._add_subcommand(
-            cred.SUBCOMMAND,
-            [
-                CredAddCommand,
-                CredListCommand,
-                CredEditCommand,
-                CredShowCommand,
-                CredClearCommand,
-            ],
-        )
-        self._add_subcommand(
-            source.SUBCOMMAND,
-            [
-                SourceAddCommand,
-                SourceListCommand,
-                SourceShowCommand,
-                SourceClearCommand,
-                SourceEditCommand,
-            ],
-        )
-
-        self._add_subcommand(
-            scan.SUBCOMMAND,
-            [
-                ScanAddCommand,
-                ScanStartCommand,
-                ScanListCommand,
-                ScanShowCommand,
-                ScanCancelCommand,
-                ScanEditCommand,
-                ScanClearCommand,
-                ScanJobCommand,
-            ],
-        )
-        self._add_subcommand(
-            report.SUBCOMMAND,
-            [
-                ReportAggregateCommand,
-                ReportDeploymentsCommand,
-                ReportDetailsCommand,
-                ReportInsightsCommand,
-                ReportDownloadCommand,
-                ReportListCommand,
-                ReportMergeCommand,
-                ReportShowCommand,
-                ReportUploadCommand,
-            ],
-        )
-        self._add_subcommand(
-            insights.SUBCOMMAND,
-            [
-                InsightsConfigureCommand,
-                InsightsLoginCommand,
-                InsightsPublishCommand,
-            ],
-        )
-        self._add_subcommand(
-            vault.SUBCOMMAND,
-            [
-                VaultAddCommand,
-                VaultEditCommand,
-                VaultShowCommand,
-                VaultClearCommand,
-            ],
-        )
+        invoked = self._invoked_command(self.argv)
+        for subcommand, actions in COMMANDS.items():
+            if invoked is None:
+                self._add_subcommand(subcommand, actions)
+            elif invoked[0] == subcommand:
+                self._add_subcommand(subcommand, [invoked[1]])
+            else:
+                # only named in the usage and help of the main parser
+                self.subparsers.add_parser(subcommand)
+        self.subparsers.add_parser(SHELL)
 
         ensure_data_dir_exists()
         ensure_config_dir_exists()
 
+    def _option_value_follows(self, token):
+        """Tell whether the value of the main parser options in token follows.
+
+        :returns: True if the value of the option is the next token, False if
+            the options take no value or token holds it, or None if token is
+            not plainly options of the main parser other than help
+        """
+        name, equals, _value = token.partition("=")
+        option = self.parser._option_string_actions.get(name)
+        if option is not None:
+            if isinstance(option, argparse._HelpAction):
+                return None
+            return option.nargs is None and not equals
+        # several flags in one token, such as -vv
+        if token.startswith("--") or equals:
+            return None
+        for flag in token[1:]:
+            option = self.parser._option_string_actions.get(f"-{flag}")
+            if option is None or option.nargs != 0 or flag == "h":
+                return None
+        return False
+
+    def _invoked_command(self, argv):
+        """Find the subcommand and action in argv, before it is parsed.
+
+        Only the parser of the invoked command is built, so the help and
+        errors of argparse are only the same as with every parser built when
+        nothing else may be printed: argv must name a known command, and
+        hold no option before it that is unknown, abbreviated or asking for
+        the help of the main parser or of the subcommand.
+
+        :returns: (subcommand, action) of a known command, (None, None) when
+            argv names no subcommand, such as for --version, or the shell, in
+            which case no command is built, or None when argv does not name one plainly,
+            in which case every command is built
+        """
+        subcommand = action = None
+        tokens = iter(argv)
+        for token in tokens:
+            if not token.startswith("-"):
+                if subcommand is not None:
+                    action = token
+                    break
+                subcommand = token
+                continue
+            if subcommand is not None:
+                # options of the subcommand parser, which only has help
+                return None
+            value_follows = self._option_value_follows(token)
+            if value_follows is None:
+                return None
+            if value_follows:
+                next(tokens, None)
+        if subcommand in {None, SHELL}:
+            return None, None
+        if action in COMMANDS.get(subcommand, {}):
+            return subcommand, action
+        return None
+
     def _add_subcommand(self, subcommand, actions):
         subcommand_parser = self.subparsers.add_parser(subcommand)
         action_subparsers = subcommand_parser.add_subparsers(
@@ -212,9 +270,23 @@ class CLI:
         )
         self.subcommands[subcommand] = {}
         for action in actions:
-            action_inst = action(action_subparsers)
-            action_dic = self.subcommands[action.SUBCOMMAND]
-            action_dic[action.ACTION] = action_inst
+            command = load_command(subcommand, action)
+            self.subcommands[subcommand][action] = command(action_subparsers)
+
+    def _configure_requests(self):
+        """Apply the options of the main parser to the requests of the command."""
+        # only imported to run a command, not to print the help or version
+        from qpc.cache import set_cache_enabled  # noqa: PLC0415
+        from qpc.request import (  # noqa: PLC0415
+            configure_retries,
+            set_concurrency,
+            set_deadline,
+        )
+
+        configure_retries(self.args.retries)
+        set_concurrency(self.args.concurrency)
+        set_deadline(self.args.deadline)
+        set_cache_enabled(not self.args.no_cache)
 
     def main(self):
         """Execute of subcommand operation.
@@ -223,18 +295,25 @@ class CLI:
         to find the best command match. If no match is found the
         usage is displayed
         """
-        self.args = self.parser.parse_args()
+        self.args = self.parser.parse_args(self.argv)
         setup_logging(self.args.verbosity)
+        if self.args.subcommand == SHELL:
+            # the shell checks the configuration of each command it runs
+            from qpc.shell import QPCShell  # noqa: PLC0415
+
+            QPCShell(self.argv[: self.argv.index(SHELL)]).cmdloop()
+            return
         is_server_cmd = self.args.subcommand == server.SUBCOMMAND
         is_server_config = is_server_cmd and self.args.action == server.CONFIG
+        config = get_client_config()
 
         if not is_server_config:
             # Before attempting to run command, check server location
-            if not get_server_location():
+            if not config.server_location:
                 logger.error(_(messages.SERVER_CONFIG_REQUIRED), QPC_VAR_PROGRAM_NAME)
                 sys.exit(1)
 
-            if not is_server_cmd and not read_client_token():
+            if not is_server_cmd and not config.token:
                 logger.error(_(messages.SERVER_LOGIN_REQUIRED), QPC_VAR_PROGRAM_NAME)
                 sys.exit(1)
 
@@ -242,7 +321,8 @@ class CLI:
             subcommand = self.subcommands[self.args.subcommand]
             if self.args.action in subcommand:
                 action = subcommand[self.args.action]
-                action.main(self.args)
+                self._configure_requests()
+                action.main(self.args, config)
             else:
                 self.parser.print_help()
         else:
@@ -2,13 +2,35 @@
 
 import sys
 
-from qpc.request import request
-from qpc.utils import QPC_MIN_SERVER_VERSION, handle_error_response, log_args
+from qpc.request import (
+    TIMEOUT_SHORT,
+    log_circuit_summary,
+    request,
+    reset_circuit_breaker,
+    reset_retry_budget,
+    set_timeout_class,
+)
+from qpc.utils import (
+    QPC_MIN_SERVER_VERSION,
+    get_client_config,
+    handle_error_response,
+    log_args,
+)
 
 
 class CliCommand:
     """Base class for all sub-commands."""
 
+    # Sub-commands issuing GET requests whose responses are worth keeping
+    # set this to revalidate them against the on-disk response cache.
+    CACHEABLE = False
+    # Sub-commands writing large response bodies to disk set this to read
+    # them in chunks with self.response.iter_chunks().
+    STREAM_RESPONSE = False
+    # Sub-commands transferring reports set this to TIMEOUT_LONG to wait
+    # longer for the server.
+    TIMEOUT = TIMEOUT_SHORT
+
     def __init__(  # noqa: PLR0913
         self, subcommand, action, parser, req_method, req_path, success_codes
     ):
@@ -20,6 +42,7 @@ class CliCommand:
         self.req_path = req_path
         self.success_codes = success_codes
         self.args = None
+        self.config = None
         self.req_payload = None
         self.req_params = None
         self.req_headers = None
@@ -61,6 +84,9 @@ class CliCommand:
             headers=self.req_headers,
             parser=self.parser,
             min_server_version=self.min_server_version,
+            config=self.config,
+            use_cache=self.CACHEABLE,
+            stream=self.STREAM_RESPONSE,
         )
 
         if self.response.status_code not in self.success_codes:
@@ -69,14 +95,24 @@ class CliCommand:
         else:
             self._handle_response_success()
 
-    def main(self, args):
+    def main(self, args, config=None):
         """Trigger main command flow.
 
         The method that does a basic check for command
         validity and set's the process in motion.
+
+        :param args: the parsed command line arguments
+        :param config: ClientConfig loaded at startup; read if not provided
         """
         self.args = args
+        self.config = config or get_client_config()
+        reset_retry_budget()
+        reset_circuit_breaker()
+        set_timeout_class(self.TIMEOUT)
         self._validate_args()
         log_args(self.args)
 
-        self._do_command()
+        try:
+            self._do_command()
+        finally:
+            log_circuit_summary()
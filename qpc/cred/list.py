@@ -25,6 +25,7 @@ class CredListCommand(CliCommand):
 
     SUBCOMMAND = credential.SUBCOMMAND
     ACTION = credential.LIST
+    CACHEABLE = True
 
     def __init__(self, subparsers):
         """Create command."""
@@ -0,0 +1,59 @@
+"""Encryption of the secrets qpc stores, such as the Insights auth token.
+
+Kept apart from qpc.utils and imported only where a secret is read or
+written, as loading cryptography and its OpenSSL bindings is costly for
+every other command.
+"""
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from qpc import utils
+from qpc.insights.exceptions import QPCEncryptionKeyError
+
+
+def write_encryption_key_if_non_existent():
+    """Generate encryption key.
+
+    Key will be generated only once and saved at INSIGHTS_ENCRYPTION file,
+    the function will check its existence every time it is called
+    """
+    if not utils.INSIGHTS_ENCRYPTION.exists():
+        key = Fernet.generate_key()
+        utils.INSIGHTS_ENCRYPTION.write_bytes(key)
+        utils.INSIGHTS_ENCRYPTION.chmod(0o600)
+
+
+def load_encryption_key():
+    """Load encryption from insights_encryption file."""
+    stats = utils.INSIGHTS_ENCRYPTION.stat()
+    if oct(stats.st_mode).endswith("00"):
+        return utils.INSIGHTS_ENCRYPTION.read_bytes()
+
+    raise QPCEncryptionKeyError(
+        "There was a problem while trying to load the password encryption key."
+    )
+
+
+def encrypt_password(password):
+    """Encrypt password before saving it to a config file."""
+    write_encryption_key_if_non_existent()
+    key = load_encryption_key()
+
+    encryption_algorithm = Fernet(key)
+
+    encrypted_password = encryption_algorithm.encrypt(password.encode())
+    return encrypted_password.decode()
+
+
+def decrypt_password(password):
+    """Retrieve password from login config file and decrypt it."""
+    key = load_encryption_key()
+    encryption_algorithm = Fernet(key)
+
+    try:
+        decrypted_password = encryption_algorithm.decrypt(password.encode())
+    except InvalidToken as exc:
+        raise QPCEncryptionKeyError(
+            "There was a problem while decrypting your password."
+        ) from exc
+    return decrypted_password.decode()
@@ -0,0 +1,191 @@
+"""HTTP/2 transport for the shared session, for servers configured with --http2.
+
+Http2Adapter, mounted on the shared session in place of the pooled HTTP/1.1
+adapter, sends requests through an httpx client, which multiplexes every
+request in flight to a server over one HTTP/2 connection. Over TLS the
+protocol is negotiated, so a server without HTTP/2 is still reached over
+HTTP/1.1; plain HTTP servers are assumed to speak HTTP/2 (prior knowledge).
+Requires the optional httpx and h2 packages.
+
+The client runs on an event loop thread owned by the adapter, and the
+threads of request_many() wait for it: httpx's synchronous HTTP/2 connection
+is not safe to share between threads, as concurrent requests may send their
+stream identifiers out of order, which servers reject.
+"""
+
+import asyncio
+import io
+import ssl
+import threading
+
+from requests import Response
+from requests import exceptions as requests_exceptions
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import h2  # noqa: F401
+    import httpx
+except ImportError:
+    httpx = None
+
+# Headers describing the encoded body, which responses hand out decoded.
+_ENCODING_HEADERS = frozenset({"content-encoding", "content-length"})
+
+
+def http2_available():
+    """Check the packages the HTTP/2 transport needs are installed."""
+    return httpx is not None
+
+
+def _httpx_timeout(timeout):
+    """Convert a requests timeout, None, seconds or (connect, read) to httpx."""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def _translate_error(err, request):
+    """Return the requests exception matching the httpx exception err."""
+    if isinstance(err, httpx.ConnectTimeout):
+        error_class = requests_exceptions.ConnectTimeout
+    elif isinstance(err, httpx.TimeoutException):
+        error_class = requests_exceptions.ReadTimeout
+    else:
+        error_class = requests_exceptions.ConnectionError
+    return error_class(err, request=request)
+
+
+class _ResponseBody(io.RawIOBase):
+    """Readable body of a streamed httpx response, decoded."""
+
+    def __init__(self, response, request, run):
+        super().__init__()
+        self._response = response
+        self._request = request
+        self._run = run
+        self._chunks = response.aiter_bytes()
+        self._pending = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            try:
+                self._pending = self._run(anext(self._chunks))
+            except StopAsyncIteration:
+                self.release_conn()
+                return 0
+            except httpx.TransportError as err:
+                self.release_conn()
+                raise _translate_error(err, self._request) from err
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def release_conn(self):
+        """Release the stream, which lets the connection serve other requests."""
+        if not self._response.is_closed:
+            self._run(self._response.aclose())
+
+    def close(self):
+        self.release_conn()
+        super().close()
+
+
+class Http2Adapter(BaseAdapter):
+    """Transport adapter sending requests over multiplexed HTTP/2 connections.
+
+    :param max_connections: most connections kept open; a connection only
+        serves streams beyond the server's concurrent stream limit
+    """
+
+    def __init__(self, max_connections):
+        super().__init__()
+        self.max_connections = max_connections
+        # one client per verify setting, as httpx fixes it per client
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+        self._loop = None
+        self._loop_thread = None
+
+    def _run(self, coroutine):
+        """Run coroutine on the event loop thread and return its result."""
+        with self._clients_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, daemon=True
+                )
+                self._loop_thread.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def _client(self, verify, cleartext):
+        key = (verify, cleartext)
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                if isinstance(verify, str):
+                    verify = ssl.create_default_context(cafile=verify)
+                client = httpx.AsyncClient(
+                    http1=not cleartext,
+                    http2=True,
+                    verify=verify,
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                    ),
+                )
+                self._clients[key] = client
+            return client
+
+    def send(  # noqa: PLR0913 PLR0917
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        """Send a requests.PreparedRequest and return a requests.Response."""
+        client = self._client(verify, request.url.startswith("http://"))
+        # h2 strips the connection-specific headers HTTP/2 forbids
+        http2_request = client.build_request(
+            request.method,
+            request.url,
+            headers=request.headers,
+            content=request.body,
+            timeout=_httpx_timeout(timeout),
+        )
+        try:
+            http2_response = self._run(client.send(http2_request, stream=True))
+        except httpx.TransportError as err:
+            raise _translate_error(err, request) from err
+
+        response = Response()
+        response.status_code = http2_response.status_code
+        response.reason = http2_response.reason_phrase
+        response.headers = CaseInsensitiveDict(
+            (name, value)
+            for name, value in http2_response.headers.items()
+            if name.lower() not in _ENCODING_HEADERS
+        )
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = _ResponseBody(http2_response, request, self._run)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        """Close the connections of every client and stop the event loop."""
+        with self._clients_lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        for client in clients:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._loop_thread.join()
+        loop.close()
@@ -5,10 +5,11 @@ import time
 from logging import getLogger
 
 import requests
-from requests.exceptions import BaseHTTPError, ConnectionError
+from requests.exceptions import BaseHTTPError, ConnectionError, Timeout
 
 from qpc import messages
 from qpc.insights.exceptions import InsightsAuthError
+from qpc.request import request_timeout
 from qpc.translation import _
 from qpc.utils import CONFIG_SSO_HOST_KEY, read_insights_config
 
@@ -31,7 +32,7 @@ def get_sso_endpoint(endpoint):
     url = f"https://{insights_sso_server}{OPENID_CONFIG_ENDPOINT}"  # Always SSL
     try:
         logger.info(_(messages.INSIGHTS_SSO_CONFIG_QUERY), url, endpoint)
-        response = requests.get(url)
+        response = requests.get(url, timeout=request_timeout())
     except ConnectionError as err:
         raise err
     except BaseHTTPError as err:
@@ -67,8 +68,13 @@ class InsightsAuth:
         try:
             device_auth_endpoint = get_sso_endpoint(DEVICE_AUTH_ENDPOINT_KEY)
             logger.info(_(messages.INSIGHTS_LOGIN_REQUEST), device_auth_endpoint)
-            response = requests.post(device_auth_endpoint, headers=headers, data=params)
-        except ConnectionError as err:
+            response = requests.post(
+                device_auth_endpoint,
+                headers=headers,
+                data=params,
+                timeout=request_timeout(),
+            )
+        except (ConnectionError, Timeout) as err:
             raise InsightsAuthError(_(messages.INSIGHTS_LOGIN_REQUEST_FAILED % err))
         except BaseHTTPError as err:
             raise InsightsAuthError(_(messages.INSIGHTS_LOGIN_REQUEST_FAILED % err))
@@ -114,9 +120,12 @@ class InsightsAuth:
                         token_endpoint = get_sso_endpoint(TOKEN_ENDPOINT_KEY)
                     logger.debug(_(messages.INSIGHTS_LOGIN_VERIFYING), token_endpoint)
                     response = requests.post(
-                        token_endpoint, headers=headers, data=params
+                        token_endpoint,
+                        headers=headers,
+                        data=params,
+                        timeout=request_timeout(),
                     )
-                except ConnectionError as err:
+                except (ConnectionError, Timeout) as err:
                     raise InsightsAuthError(
                         _(messages.INSIGHTS_LOGIN_VERIFICATION_FAILED % err)
                     )
@@ -4,6 +4,8 @@ from urllib.parse import urljoin
 
 import requests
 
+from qpc.request import request_timeout
+
 
 class InsightsClient(requests.Session):
     """An HTTP Client for C.RH.C. based on requests Session class."""
@@ -20,6 +22,7 @@ class InsightsClient(requests.Session):
         self.headers["Authorization"] = f"Bearer {auth_token}"
 
     def request(self, method, url, *args, **kwargs):
-        """Prepare a request and send it."""
+        """Prepare a request and send it, with the timeouts of the command."""
         request_url = urljoin(self.base_url, url) if self.base_url else url
+        kwargs.setdefault("timeout", request_timeout())
         return super().request(method, request_url, *args, **kwargs)
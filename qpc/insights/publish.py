@@ -7,13 +7,18 @@ from logging import getLogger
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
-from requests.exceptions import BaseHTTPError, ConnectionError, JSONDecodeError
+from requests.exceptions import (
+    BaseHTTPError,
+    ConnectionError,
+    JSONDecodeError,
+    Timeout,
+)
 
 from qpc import insights, messages
 from qpc.clicommand import CliCommand
 from qpc.exceptions import QPCError
 from qpc.insights.http import InsightsClient
-from qpc.request import GET
+from qpc.request import GET, TIMEOUT_LONG
 from qpc.request import request as qpc_request
 from qpc.translation import _
 from qpc.utils import (
@@ -35,6 +40,7 @@ class InsightsPublishCommand(CliCommand):
 
     SUBCOMMAND = insights.SUBCOMMAND
     ACTION = insights.PUBLISH
+    TIMEOUT = TIMEOUT_LONG
 
     def __init__(self, subparsers):
         """Create command."""
@@ -208,7 +214,7 @@ class InsightsPublishCommand(CliCommand):
         try:
             response = session_client.post(url=url, files=files)
             logger.info(_(messages.INSIGHTS_PUBLISH_RESPONSE), response.text)
-        except ConnectionError as err:
+        except (ConnectionError, Timeout) as err:
             logger.error(_(messages.INSIGHTS_PUBLISH_FAILED), err)
             return False
         except BaseHTTPError as err:
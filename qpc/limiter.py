@@ -0,0 +1,140 @@
+"""Adaptive limit on the number of requests a batch keeps in flight.
+
+The limit follows AIMD (additive increase, multiplicative decrease), like
+TCP congestion control: every response that comes back in time widens the
+limit by one request per round of requests, up to a ceiling, and a response
+that shows the server is overloaded halves it. A server is considered
+overloaded when it answers 429 or 503, or when a response takes much longer
+than the fastest response of the batch.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from logging import getLogger
+
+from qpc import messages
+from qpc.translation import _
+
+logger = getLogger(__name__)
+
+# Status codes a server uses to ask clients to slow down.
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+# A response is late when it takes longer than LATENCY_FACTOR times the
+# fastest response of the batch plus LATENCY_SLACK seconds.
+LATENCY_FACTOR = 2
+LATENCY_SLACK = 0.05
+# Factor the limit is multiplied by when the server is overloaded.
+DECREASE_FACTOR = 0.5
+
+
+class AdaptiveLimiter:
+    """Thread-safe AIMD limit on the number of requests in flight.
+
+    :param initial: number of requests allowed in flight at first
+    :param ceiling: upper bound of the limit
+    """
+
+    def __init__(self, initial, ceiling):
+        self.ceiling = ceiling
+        self.limit = float(max(1, min(initial, ceiling)))
+        self.in_flight = 0
+        self.throttle_count = 0
+        self.peak = 0
+        self._min_latency = None
+        self._decreased_at = -1.0
+        self._condition = threading.Condition()
+
+    @property
+    def concurrency(self):
+        """Return how many requests may currently be in flight."""
+        return max(1, int(self.limit))
+
+    def try_acquire(self):
+        """Take a slot for a request if one is free, returning False if not."""
+        with self._condition:
+            if self.in_flight >= self.concurrency:
+                return False
+            self._take()
+            return True
+
+    def acquire(self):
+        """Take a slot for a request, waiting until one is free."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.in_flight < self.concurrency)
+            self._take()
+
+    def _take(self):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+
+    def release(self):
+        """Give back the slot of a completed request."""
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """Hold a slot for the duration of the context."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def record(self, sent_at, status_code):
+        """Adjust the limit to the outcome of a request.
+
+        Responses to requests sent before the last decrease do not decrease
+        the limit again, so a burst of throttled responses counts once.
+
+        :param sent_at: time.monotonic() when the request was sent
+        :param status_code: status code of the response
+        """
+        latency = time.monotonic() - sent_at
+        with self._condition:
+            previous = self.concurrency
+            reason = None
+            if status_code in THROTTLE_STATUS_CODES:
+                reason = status_code
+            else:
+                if self._min_latency is None or latency < self._min_latency:
+                    self._min_latency = latency
+                if latency > self._min_latency * LATENCY_FACTOR + LATENCY_SLACK:
+                    reason = f"{latency:.2f}s"
+            if reason is None:
+                if self.in_flight >= previous:
+                    # only a limit that is reached has shown it can grow
+                    self.limit = min(float(self.ceiling), self.limit + 1 / self.limit)
+                if self.concurrency > previous:
+                    logger.info(
+                        _(messages.REQUEST_CONCURRENCY_INCREASED), self.concurrency
+                    )
+            elif sent_at >= self._decreased_at:
+                self.limit = max(1.0, self.limit * DECREASE_FACTOR)
+                self._decreased_at = time.monotonic()
+                self.throttle_count += 1
+                logger.info(
+                    _(messages.REQUEST_THROTTLED),
+                    {"reason": reason, "concurrency": self.concurrency},
+                )
+            self._condition.notify_all()
+
+    def log_summary(self, request_count):
+        """Log how many requests were sent and how the limit evolved.
+
+        Logged at info level when the limit backed off, at debug level
+        otherwise.
+        """
+        logger.log(
+            logging.INFO if self.throttle_count else logging.DEBUG,
+            _(messages.REQUEST_BATCH_SUMMARY),
+            {
+                "count": request_count,
+                "peak": self.peak,
+                "concurrency": self.concurrency,
+                "throttled": self.throttle_count,
+            },
+        )
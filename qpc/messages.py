@@ -280,6 +280,67 @@ DISABLE_OPT_PRODUCTS_HELP = (
 )
 
 VERBOSITY_HELP = "Verbose mode. Use up to -vvvv for more verbosity."
+RETRIES_HELP = (
+    "Maximum number of retries for a request that failed with a transient error; "
+    "the default is 3."
+)
+CONCURRENCY_HELP = (
+    "Number of requests sent to the server at the same time by commands that act "
+    "on several objects, before adapting it to the server load; the default is 4."
+)
+DEADLINE_HELP = (
+    "Maximum number of seconds the command may run, including retries and "
+    "following pages of results; by default there is no limit."
+)
+NO_CACHE_HELP = (
+    "Do not use or update the local cache of server responses; always "
+    "download full responses from the server."
+)
+SHELL_INTRO = (
+    'Type %s commands without the program name, such as "scan list". '
+    'Type "help" for the list of commands and "exit" or Ctrl-D to quit.'
+)
+SHELL_NESTED = "Commands cannot start another shell."
+SHELL_SYNTAX_ERROR = "Invalid command line: %s"
+SHELL_COMMAND_FAILED = "The command failed unexpectedly: %s"
+HTTP2_TRANSPORT_UNAVAILABLE = (
+    "The server is configured for HTTP/2, which requires the httpx and h2 "
+    'packages. Install them with "pip install qpc[http2]". Using HTTP/1.1.'
+)
+REQUEST_RETRYING = (
+    "%(method)s %(url)s failed (%(reason)s). Retrying in %(delay).1f seconds "
+    "(attempt %(attempt)s of %(retries)s)."
+)
+REQUEST_TIMED_OUT = (
+    "%(method)s %(url)s did not complete in time. Use the --short-timeout or "
+    "--long-timeout options of the server config command to wait longer."
+)
+CASSETTE_NO_RESPONSE = "The replayed cassette holds no response to %(method)s %(path)s."
+DEADLINE_EXCEEDED = "The command did not complete within its %s second deadline."
+REQUEST_SKIPPED = "%(method)s %(url)s was not sent, as the server is failing."
+CIRCUIT_OPENED = (
+    "The server failed %(failures)s times in a row. Requests are not sent "
+    "for %(cooldown)s seconds, after which a single request checks whether "
+    "the server has recovered."
+)
+CIRCUIT_CLOSED = "The server is answering again. Resuming requests."
+CIRCUIT_SUMMARY = (
+    "The server was failing: %(completed)s requests completed, %(failed)s "
+    "failed and %(skipped)s were skipped without being sent."
+)
+REQUEST_THROTTLED = (
+    "The server is overloaded (%(reason)s). Sending at most %(concurrency)s "
+    "requests at a time."
+)
+REQUEST_CONCURRENCY_INCREASED = "Sending at most %s requests at a time."
+REQUEST_CONCURRENCY_CLAMPED = (
+    "--concurrency %(concurrency)s is above the --max-concurrency of server "
+    "config. Sending at most %(ceiling)s requests at a time."
+)
+REQUEST_BATCH_SUMMARY = (
+    "Sent %(count)s requests with up to %(peak)s at a time. The server was "
+    "overloaded %(throttled)s times; the limit is now %(concurrency)s requests."
+)
 
 
 CONNECTION_ERROR_MSG = (
@@ -289,6 +350,13 @@ CONNECTION_ERROR_MSG = (
     'with port "%(port)s" but is not responding.'
 )
 
+CONNECTION_ERROR_SOCKET_MSG = (
+    "A connection error occurred while attempting to "
+    "communicate with the server. The server has been "
+    'configured to be contacted via the Unix socket "%(socket)s" but is not '
+    "responding."
+)
+
 READ_FILE_ERROR = "Error reading from %(path)s: %(error)s."
 WRITE_FILE_ERROR = "Error writing to %(path)s: %(error)s."
 NOT_A_FILE = "Input %s was not a file."
@@ -313,16 +381,52 @@ SERVER_CONFIG_REQUIRED = (
     "Configure server using command below: \n$ %s server config --host HOST --port PORT"
 )
 SERVER_LOGIN_REQUIRED = "Log in using the command below: \n$ %s server login"
-SERVER_CONFIG_HOST_HELP = "Host or IP address for the server."
+SERVER_CONFIG_HOST_HELP = (
+    "Host or IP address for the server, or unix:///path/to/socket for a "
+    "server listening on a Unix socket on this host."
+)
 SERVER_CONFIG_PORT_HELP = "Port number for the server; the default is 9443."
 SERVER_CONFIG_SSL_CERT_HELP = (
     "File path to the SSL certificate to use for verification."
 )
+SERVER_CONFIG_SHORT_TIMEOUT_HELP = (
+    "Seconds to wait for a connection to the server and then for each response, "
+    "as CONNECT,READ, for commands that list, show, add, edit or remove objects; "
+    "the default is 10,60."
+)
+SERVER_CONFIG_LONG_TIMEOUT_HELP = (
+    "Seconds to wait for a connection to the server and then for each response, "
+    "as CONNECT,READ, for commands that download or upload reports; "
+    "the default is 10,600."
+)
+SERVER_CONFIG_MAX_CONCURRENCY_HELP = (
+    "Maximum number of requests sent to the server at the same time by commands "
+    "that act on several objects; the default is 16."
+)
 SERVER_CONFIG_SUCCESS = (
     "Server connectivity was successfully configured. "
     'The server will be contacted via "%(protocol)s" at host "%(host)s"'
     ' with port "%(port)s".'
 )
+SERVER_CONFIG_HTTP2_HELP = (
+    "Send the requests of a command over a single multiplexed HTTP/2 "
+    "connection to the server. Requires the httpx and h2 packages."
+)
+SERVER_CONFIG_RESPONSE_CACHE_HELP = (
+    "Keep the responses of commands listing and showing objects in a local "
+    "cache, and only download them again when they changed on the server."
+)
+SERVER_CONFIG_HTTP2_UNAVAILABLE = (
+    "HTTP/2 requires the httpx and h2 packages. "
+    'Install them with "pip install qpc[http2]".'
+)
+SERVER_CONFIG_SOCKET_SUCCESS = (
+    "Server connectivity was successfully configured. "
+    'The server will be contacted via the Unix socket "%(socket)s".'
+)
+SERVER_CONFIG_SOCKET_NOT_ABSOLUTE = (
+    "The Unix socket path %s must be absolute, i.e. unix:///path/to/socket."
+)
 SERVER_INTERNAL_ERROR = (
     "An internal server error occurred. For more information, see the server log file."
 )
@@ -365,6 +469,15 @@ DOWNLOAD_PATH_HELP = (
 )
 DOWNLOAD_SUCCESSFULLY_WRITTEN = "Report %(report)s successfully written to %(path)s."
 DOWNLOAD_SJ_DOES_NOT_EXIST = "Scan Job %s does not exist."
+DOWNLOAD_RESUMING = "Resuming download of report %(report)s at byte %(offset)s."
+DOWNLOAD_INTERRUPTED = (
+    "Download of report %(report)s was interrupted. Run the command again to "
+    "resume it from %(path)s."
+)
+DOWNLOAD_CHECKSUM_MISMATCH = (
+    "Report %(report)s does not match its checksum. The downloaded file "
+    "%(path)s was removed."
+)
 
 SERVER_TOO_OLD_FOR_CLI = (
     "The CLI requires a minimum server version of %(min_version)s.  "
@@ -7,13 +7,15 @@ from requests import codes
 
 from qpc import messages, report, scan
 from qpc.clicommand import CliCommand
-from qpc.request import GET, request
+from qpc.request import GET, TIMEOUT_LONG, request
 from qpc.translation import _
 from qpc.utils import (
     check_extension,
     extract_json_from_tar,
+    spool_chunks,
     validate_write_file,
     write_file,
+    write_file_chunks,
 )
 
 logger = getLogger(__name__)
@@ -27,6 +29,8 @@ class ReportDetailsCommand(CliCommand):
 
     SUBCOMMAND = report.SUBCOMMAND
     ACTION = report.DETAILS
+    STREAM_RESPONSE = True
+    TIMEOUT = TIMEOUT_LONG
 
     def __init__(self, subparsers):
         """Create command."""
@@ -126,14 +130,15 @@ class ReportDetailsCommand(CliCommand):
             )
 
     def _handle_response_success(self):
-        file_content = None
-        if self.args.output_json:
-            file_content = extract_json_from_tar(self.response.content)
-        else:
-            file_content = self.response.text
-
         try:
-            write_file(self.args.path, file_content)
+            if self.args.output_json:
+                with spool_chunks(self.response.iter_chunks()) as tarball:
+                    file_content = extract_json_from_tar(tarball)
+                write_file(self.args.path, file_content)
+            elif self.args.path:
+                write_file_chunks(self.args.path, self.response.iter_chunks())
+            else:
+                write_file(self.args.path, self.response.text)
             logger.info(_(messages.REPORT_SUCCESSFULLY_WRITTEN))
         except EnvironmentError as err:
             logger.error(
@@ -1,15 +1,26 @@
 """ReportDownloadCommand is used to download all reports."""
 
+import json
+import os
+import re
 import sys
+import time
 from logging import getLogger
+from pathlib import Path
 
+import requests
 from requests import codes
 
 from qpc import messages, report, scan
 from qpc.clicommand import CliCommand
-from qpc.request import GET, request
+from qpc.report.utils import (
+    parse_digest_header,
+    verify_file_digest,
+    verify_tarball_manifest,
+)
+from qpc.request import GET, TIMEOUT_LONG, log_retry, request, retry_delay
 from qpc.translation import _
-from qpc.utils import check_extension, validate_write_file, write_file
+from qpc.utils import check_extension, validate_write_file, write_file_chunks
 
 logger = getLogger(__name__)
 
@@ -22,6 +33,8 @@ class ReportDownloadCommand(CliCommand):
 
     SUBCOMMAND = report.SUBCOMMAND
     ACTION = report.DOWNLOAD
+    STREAM_RESPONSE = True
+    TIMEOUT = TIMEOUT_LONG
 
     def __init__(self, subparsers):
         """Create command."""
@@ -32,7 +45,11 @@ class ReportDownloadCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             GET,
             report.REPORT_URI,
-            [codes.ok],
+            [
+                codes.ok,
+                codes.partial_content,
+                codes.requested_range_not_satisfiable,
+            ],
         )
         id_group = self.parser.add_mutually_exclusive_group(required=True)
         id_group.add_argument(
@@ -55,6 +72,9 @@ class ReportDownloadCommand(CliCommand):
             required=True,
         )
         self.report_id = None
+        self.output_path = None
+        self.part_path = None
+        self.part_info_path = None
 
     def _validate_args(self):
         self.req_headers = {"Accept": "application/gzip"}
@@ -91,10 +111,149 @@ class ReportDownloadCommand(CliCommand):
             self.report_id = self.args.report_id
             self.req_path = f"{self.req_path}{self.report_id}"
 
+        # download to a .part file first, resuming what an earlier run left
+        self.output_path = Path(os.path.expandvars(self.args.path)).expanduser()
+        self.part_path = self.output_path.with_name(f"{self.output_path.name}.part")
+        self.part_info_path = self.part_path.with_name(f"{self.part_path.name}.json")
+        offset = self._part_size()
+        if not offset:
+            return
+        part_info = self._read_part_info()
+        if part_info.get("report") != str(self.report_id) or not part_info.get(
+            "validator"
+        ):
+            # left by the download of another report, or without a way to
+            # tell whether the report changed since: start over
+            logger.debug("Discarding %s, it cannot be resumed", self.part_path)
+            self._remove_part()
+            return
+        logger.info(
+            _(messages.DOWNLOAD_RESUMING),
+            {"report": self.report_id, "offset": offset},
+        )
+        self.req_headers["Range"] = f"bytes={offset}-"
+        # only resume if the report did not change in the meantime
+        self.req_headers["If-Range"] = part_info["validator"]
+
+    def _read_part_info(self):
+        """Return the report id and validator the .part file was written for."""
+        try:
+            part_info = json.loads(self.part_info_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return part_info if isinstance(part_info, dict) else {}
+
+    def _write_part_info(self, response):
+        """Record which report, in which version, the .part file holds."""
+        part_info = {"report": str(self.report_id), "validator": _validator(response)}
+        self.part_info_path.write_text(json.dumps(part_info))
+
+    def _remove_part(self):
+        """Remove the .part file and what is recorded about it."""
+        self.part_path.unlink(missing_ok=True)
+        self.part_info_path.unlink(missing_ok=True)
+
+    def _part_size(self):
+        try:
+            return self.part_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _request_range(self, offset, validator=None):
+        """Request the report from offset, after an interrupted transfer."""
+        headers = {"Accept": "application/gzip"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            if validator:
+                headers["If-Range"] = validator
+        response = request(
+            parser=self.parser,
+            method=GET,
+            path=self.req_path,
+            headers=headers,
+            min_server_version=self.min_server_version,
+            config=self.config,
+            stream=True,
+        )
+        if response.status_code not in self.success_codes:
+            self._handle_response_error()
+        return response
+
+    def _download(self, response):
+        """Write the report to the .part file, resuming after interruptions.
+
+        :returns: the last response, whose headers describe the report
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            offset = self._part_size()
+            if response.status_code == codes.requested_range_not_satisfiable:
+                if _range_total(response) == offset:
+                    # the .part file already holds the whole report
+                    return response
+                self._remove_part()
+                response = self._request_range(0)
+                continue
+            if (
+                response.status_code == codes.partial_content
+                and _range_start(response) != offset
+            ):
+                if not offset:
+                    # a range that was never asked for
+                    self._handle_response_error()
+                response = self._request_range(0)
+                continue
+            try:
+                if response.status_code == codes.ok:
+                    self._write_part_info(response)
+                write_file_chunks(
+                    self.part_path,
+                    response.iter_chunks(),
+                    append=response.status_code == codes.partial_content,
+                )
+                return response
+            except (
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.ConnectionError,
+            ) as err:
+                delay = retry_delay(GET, attempt, started)
+                if delay is None:
+                    logger.error(
+                        _(messages.DOWNLOAD_INTERRUPTED),
+                        {"report": self.report_id, "path": self.part_path},
+                    )
+                    sys.exit(1)
+                attempt += 1
+                log_retry(GET, response.url, type(err).__name__, delay, attempt)
+                time.sleep(delay)
+                response = self._request_range(
+                    self._part_size(), self._read_part_info().get("validator")
+                )
+
+    def _verify(self, response):
+        """Check the .part file against the server or the manifest checksum."""
+        digest = parse_digest_header(response.headers)
+        if digest is not None:
+            return verify_file_digest(self.part_path, *digest)
+        verified = verify_tarball_manifest(self.part_path)
+        if verified is None:
+            logger.debug("Report %s has no checksum to verify", self.report_id)
+            return True
+        return verified
+
     def _handle_response_success(self):
-        file_content = self.response.content
         try:
-            write_file(self.args.path, file_content, True)
+            response = self._download(self.response)
+            if not self._verify(response):
+                self._remove_part()
+                logger.error(
+                    _(messages.DOWNLOAD_CHECKSUM_MISMATCH),
+                    {"report": self.report_id, "path": self.part_path},
+                )
+                sys.exit(1)
+            self.part_path.replace(self.output_path)
+            self.part_info_path.unlink(missing_ok=True)
             logger.info(
                 _(messages.DOWNLOAD_SUCCESSFULLY_WRITTEN),
                 {"report": self.report_id, "path": self.args.path},
@@ -108,3 +267,20 @@ class ReportDownloadCommand(CliCommand):
     def _handle_response_error(self):
         logger.error(_(messages.DOWNLOAD_NO_REPORT_FOUND), self.args.report_id)
         sys.exit(1)
+
+
+def _validator(response):
+    """Return the ETag, or else the Last-Modified date, of a response."""
+    return response.headers.get("ETag") or response.headers.get("Last-Modified")
+
+
+def _range_start(response):
+    """Return the first byte position of a 206 response's Content-Range."""
+    match = re.match(r"bytes (\d+)-", response.headers.get("Content-Range", ""))
+    return int(match.group(1)) if match else None
+
+
+def _range_total(response):
+    """Return the complete length given in a Content-Range header."""
+    match = re.search(r"/(\d+)$", response.headers.get("Content-Range", ""))
+    return int(match.group(1)) if match else None
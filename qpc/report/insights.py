@@ -7,10 +7,15 @@ from requests import codes
 
 from qpc import messages, report, scan
 from qpc.clicommand import CliCommand
-from qpc.request import GET, request
+from qpc.request import GET, TIMEOUT_LONG, request
 from qpc.source import NETWORK_SOURCE_TYPE, SATELLITE_SOURCE_TYPE, VCENTER_SOURCE_TYPE
 from qpc.translation import _
-from qpc.utils import check_extension, validate_write_file, write_file
+from qpc.utils import (
+    check_extension,
+    validate_write_file,
+    write_file,
+    write_file_chunks,
+)
 
 logger = getLogger(__name__)
 
@@ -23,6 +28,8 @@ class ReportInsightsCommand(CliCommand):
 
     SUBCOMMAND = report.SUBCOMMAND
     ACTION = report.INSIGHTS
+    STREAM_RESPONSE = True
+    TIMEOUT = TIMEOUT_LONG
 
     def __init__(self, subparsers):
         """Create command."""
@@ -141,10 +148,9 @@ class ReportInsightsCommand(CliCommand):
     def _handle_response_success(self):
         try:
             if self.args.path:
-                file_content = self.response.content
+                write_file_chunks(self.args.path, self.response.iter_chunks())
             else:
-                file_content = self.response.text
-            write_file(self.args.path, file_content, binary=True)
+                write_file(self.args.path, self.response.text, binary=True)
             logger.info(_(messages.REPORT_SUCCESSFULLY_WRITTEN))
         except EnvironmentError as err:
             logger.error(
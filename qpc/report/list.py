@@ -1,6 +1,5 @@
 """ReportListCommand is used to list available reports."""
 
-import json
 from logging import getLogger
 
 from requests import codes
@@ -21,6 +20,7 @@ class ReportListCommand(CliCommand):
 
     SUBCOMMAND = report.SUBCOMMAND
     ACTION = report.LIST
+    CACHEABLE = True
 
     def __init__(self, subparsers):
         """Create command."""
@@ -40,6 +40,6 @@ class ReportListCommand(CliCommand):
         self.req_path = f"{self.req_path}"
 
     def _handle_response_success(self):
-        json_data = json.loads(self.response.text)
+        json_data = self.response.json()
         response_json = pretty_format(json_data)
         print(response_json)
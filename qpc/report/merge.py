@@ -11,10 +11,10 @@ from qpc import messages, report
 from qpc.clicommand import CliCommand
 from qpc.release import QPC_VAR_PROGRAM_NAME
 from qpc.report import utils
-from qpc.request import GET, POST, request
+from qpc.request import GET, POST, TIMEOUT_LONG, request_many
 from qpc.scan import SCAN_JOB_URI
 from qpc.translation import _
-from qpc.utils import pretty_format
+from qpc.utils import handle_error_response, pretty_format
 
 logger = getLogger(__name__)
 
@@ -34,6 +34,7 @@ class ReportMergeCommand(CliCommand):
 
     SUBCOMMAND = report.SUBCOMMAND
     ACTION = report.MERGE
+    TIMEOUT = TIMEOUT_LONG
 
     def __init__(self, subparsers):
         """Create command."""
@@ -90,12 +91,24 @@ class ReportMergeCommand(CliCommand):
         report_ids = []
         job_not_found = []
         report_not_found = []
-        for scan_job_id in set(self.args.scan_job_ids):
-            # check for existence of scan_job
-            path = SCAN_JOB_URI + str(scan_job_id) + "/"
-            response = request(
-                parser=self.parser, method=GET, path=path, params=None, payload=None
-            )
+        scan_job_ids = list(set(self.args.scan_job_ids))
+        # check for existence of scan_jobs
+        lookups = request_many(
+            {
+                "parser": self.parser,
+                "method": GET,
+                "path": SCAN_JOB_URI + str(scan_job_id) + "/",
+                "params": None,
+                "payload": None,
+            }
+            for scan_job_id in scan_job_ids
+        )
+        for scan_job_id, lookup in zip(scan_job_ids, lookups):
+            if lookup.error is not None:
+                # the server could not be reached or refused the request; the
+                # reason was logged by request()
+                sys.exit(1)
+            response = lookup.response
             if response.status_code == codes.ok:
                 json_data = response.json()
                 report_id = json_data.get("report_id", None)
@@ -105,9 +118,12 @@ class ReportMergeCommand(CliCommand):
                     # there is not a report id associated with this scan job
                     report_not_found.append(scan_job_id)
                     not_found = True
-            else:
+            elif response.status_code == codes.not_found:
                 job_not_found.append(scan_job_id)
                 not_found = True
+            else:
+                handle_error_response(response)
+                sys.exit(1)
         return not_found, report_ids, job_not_found, report_not_found
 
     def _validate_create_json(self, files):
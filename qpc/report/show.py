@@ -1,6 +1,5 @@
 """ReportShowCommand is used to show an individual report."""
 
-import json
 import sys
 from logging import getLogger
 
@@ -23,6 +22,7 @@ class ReportShowCommand(CliCommand):
 
     SUBCOMMAND = report.SUBCOMMAND
     ACTION = report.SHOW
+    CACHEABLE = True
 
     def __init__(self, subparsers):
         """Create command."""
@@ -52,7 +52,7 @@ class ReportShowCommand(CliCommand):
         self.req_path = f"{self.req_path}{self.report_id}/"
 
     def _handle_response_success(self):
-        json_data = json.loads(self.response.text)
+        json_data = self.response.json()
         response_json = pretty_format(json_data)
         print(response_json)
 
@@ -10,7 +10,7 @@ from qpc import messages, report
 from qpc.clicommand import CliCommand
 from qpc.release import QPC_VAR_PROGRAM_NAME
 from qpc.report import utils
-from qpc.request import POST
+from qpc.request import POST, TIMEOUT_LONG
 from qpc.translation import _
 from qpc.utils import pretty_format
 
@@ -32,6 +32,7 @@ class ReportUploadCommand(CliCommand):
 
     SUBCOMMAND = report.SUBCOMMAND
     ACTION = report.UPLOAD
+    TIMEOUT = TIMEOUT_LONG
 
     def __init__(self, subparsers):
         """Create command."""
@@ -1,11 +1,17 @@
 """Helper functions for processing reports."""
 
+import base64
+import binascii
+import hashlib
 import json
+import tarfile
+import zlib
 from logging import getLogger
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 
 from qpc import messages
 from qpc.translation import _
+from qpc.utils import json_loads
 
 logger = getLogger(__name__)
 
@@ -18,6 +24,11 @@ REPORT_TYPE_KEY = "report_type"
 DEFAULT_REPORT_VERSION = "0.0.44.legacy"
 DETAILS_REPORT_TYPE = "details"
 
+# Checksum file listing the sha256 of the files in a report tarball.
+MANIFEST_NAME = "SHA256SUM"
+# Digest algorithms (RFC 9530, RFC 3230) mapped to their hashlib names.
+DIGEST_ALGORITHMS = {"sha-256": "sha256", "sha-512": "sha512"}
+
 
 def validate_and_create_json(file):
     """Validate the details report file and create sources JSON.
@@ -30,67 +41,160 @@ def validate_and_create_json(file):
     file = Path(file)
     if file.is_file():
         details_report = None
-        with file.open(encoding="utf-8") as details_file:
-            try:
-                details_report = json.load(details_file)
-            except json.decoder.JSONDecodeError:
-                logger.error(_(messages.REPORT_UPLOAD_FILE_INVALID_JSON), file)
-                return None
+        try:
+            details_report = json_loads(file.read_bytes())
+        except json.decoder.JSONDecodeError:
+            logger.error(_(messages.REPORT_UPLOAD_FILE_INVALID_JSON), file)
+            return None
 
-            # validate version type
-            file_report_version = details_report.get(REPORT_VERSION_KEY, None)
-            if not file_report_version:
-                # warn about old format but continue
-                logger.error(_(messages.REPORT_MISSING_REPORT_VERSION), file)
-                file_report_version = DEFAULT_REPORT_VERSION
-
-            file_report_type = details_report.get(REPORT_TYPE_KEY, DETAILS_REPORT_TYPE)
-            if file_report_type != DETAILS_REPORT_TYPE:
-                # terminate if different from details type
-                logger.error(
-                    _(messages.REPORT_INVALID_REPORT_TYPE),
-                    {"file": file, "report_type": file_report_type},
-                )
-                return None
+        # validate version type
+        file_report_version = details_report.get(REPORT_VERSION_KEY, None)
+        if not file_report_version:
+            # warn about old format but continue
+            logger.error(_(messages.REPORT_MISSING_REPORT_VERSION), file)
+            file_report_version = DEFAULT_REPORT_VERSION
 
-            # validate sources
-            sources = details_report.get(SOURCES_KEY, None)
-            if sources:
-                has_error = False
-                for source in sources:
-                    facts = source.get(FACTS_KEY)
-                    server_id = source.get(SERVER_ID_KEY)
-                    if not facts:
-                        logger.error(
-                            _(messages.REPORT_JSON_MISSING_ATTR),
-                            {"file": file, "key": FACTS_KEY},
-                        )
-                        has_error = True
-                        break
-                    if not server_id:
-                        logger.error(
-                            _(messages.REPORT_JSON_MISSING_ATTR),
-                            {"file": file, "key": FACTS_KEY},
-                        )
-                        has_error = True
-                        break
-                    # Add version/type to all sources since merge
-                    source[REPORT_TYPE_KEY] = file_report_type
-                    source[REPORT_VERSION_KEY] = file_report_version
-
-                if not has_error:
-                    # Source is valid so add it
-                    logger.info(_(messages.REPORT_JSON_DIR_FILE_SUCCESS), file)
-                else:
-                    return None
+        file_report_type = details_report.get(REPORT_TYPE_KEY, DETAILS_REPORT_TYPE)
+        if file_report_type != DETAILS_REPORT_TYPE:
+            # terminate if different from details type
+            logger.error(
+                _(messages.REPORT_INVALID_REPORT_TYPE),
+                {"file": file, "report_type": file_report_type},
+            )
+            return None
+
+        # validate sources
+        sources = details_report.get(SOURCES_KEY, None)
+        if sources:
+            has_error = False
+            for source in sources:
+                facts = source.get(FACTS_KEY)
+                server_id = source.get(SERVER_ID_KEY)
+                if not facts:
+                    logger.error(
+                        _(messages.REPORT_JSON_MISSING_ATTR),
+                        {"file": file, "key": FACTS_KEY},
+                    )
+                    has_error = True
+                    break
+                if not server_id:
+                    logger.error(
+                        _(messages.REPORT_JSON_MISSING_ATTR),
+                        {"file": file, "key": FACTS_KEY},
+                    )
+                    has_error = True
+                    break
+                # Add version/type to all sources since merge
+                source[REPORT_TYPE_KEY] = file_report_type
+                source[REPORT_VERSION_KEY] = file_report_version
+
+            if not has_error:
+                # Source is valid so add it
+                logger.info(_(messages.REPORT_JSON_DIR_FILE_SUCCESS), file)
             else:
-                logger.error(
-                    _(messages.REPORT_JSON_MISSING_ATTR),
-                    {"file": file, "key": SOURCES_KEY},
-                )
                 return None
+        else:
+            logger.error(
+                _(messages.REPORT_JSON_MISSING_ATTR),
+                {"file": file, "key": SOURCES_KEY},
+            )
+            return None
     else:
         logger.error(_(messages.FILE_NOT_FOUND), file)
         return None
 
     return sources
+
+
+def parse_digest_header(headers):
+    """Get the checksum of a whole representation from response headers.
+
+    Repr-Digest (RFC 9530) is preferred over the older Digest (RFC 3230)
+    header; both describe the full representation even for 206 responses.
+
+    :param headers: response headers
+    :returns: tuple of hashlib algorithm name and expected digest bytes, or
+        None if the server did not provide a supported digest
+    """
+    candidates = []
+    for member in headers.get("Repr-Digest", "").split(","):
+        name, _sep, value = member.partition("=")
+        value = value.strip()
+        if len(value) > 1 and value.startswith(":") and value.endswith(":"):
+            candidates.append((name, value[1:-1]))
+    for member in headers.get("Digest", "").split(","):
+        name, _sep, value = member.partition("=")
+        candidates.append((name, value.strip()))
+    for name, value in candidates:
+        algorithm = DIGEST_ALGORITHMS.get(name.strip().lower())
+        if algorithm is None:
+            continue
+        try:
+            return algorithm, base64.b64decode(value, validate=True)
+        except binascii.Error:
+            continue
+    return None
+
+
+def verify_file_digest(path, algorithm, expected):
+    """Check a file against an expected digest.
+
+    :param path: Path of the file to check
+    :param algorithm: hashlib algorithm name
+    :param expected: expected digest bytes
+    :returns: True if the file matches
+    """
+    with Path(path).open("rb") as checked_file:
+        return hashlib.file_digest(checked_file, algorithm).digest() == expected
+
+
+def verify_tarball_manifest(path):
+    """Check the files of a report tarball against its SHA256SUM manifest.
+
+    :param path: Path of the tar.gz file to check
+    :returns: True if every file listed in the manifest matches, False if a
+        file is missing, differs or the tarball is corrupt, and None if the
+        file is not a tarball or has no manifest
+    """
+    try:
+        tar = tarfile.open(path, mode="r:gz")
+    except tarfile.ReadError:
+        return None
+    try:
+        with tar:
+            manifests, digests = _hash_tarball_members(tar)
+    except (tarfile.TarError, EOFError, OSError, zlib.error):
+        return False
+    if not manifests:
+        return None
+    for directory, manifest in manifests:
+        for line in manifest.decode("utf-8", errors="replace").splitlines():
+            expected, _sep, name = line.strip().partition(" ")
+            name = name.strip().lstrip("*")
+            if not name:
+                continue
+            if digests.get(directory / name) != expected.lower():
+                return False
+    return True
+
+
+def _hash_tarball_members(tar):
+    """Read the manifests of a tarball and hash its other files.
+
+    :returns: tuple of a list of (directory, manifest content) pairs and a
+        dict mapping member paths to their sha256 hex digest
+    """
+    manifests = []
+    digests = {}
+    for member in tar:
+        if not member.isfile():
+            continue
+        member_file = tar.extractfile(member)
+        member_path = PurePosixPath(member.name)
+        if member_path.name == MANIFEST_NAME:
+            manifests.append((member_path.parent, member_file.read()))
+        else:
+            digests[member_path] = hashlib.file_digest(
+                member_file, "sha256"
+            ).hexdigest()
+    return manifests, digests
@@ -1,26 +1,48 @@
 """Common module for handling request calls to the server."""
 
+import contextvars
+import functools
+import gzip
 import json
+import logging
+import math
+import random
 import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qs, urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from qpc import messages
+from qpc import cache, messages
+from qpc.breaker import CircuitBreaker, CircuitOpenError
+from qpc.cassette import CassetteMissError, mount_cassette
+from qpc.limiter import AdaptiveLimiter
 from qpc.release import QPC_VAR_PROGRAM_NAME
 from qpc.translation import _
+from qpc.unix_socket import UNIX_SOCKET_SCHEME, UnixSocketAdapter
 from qpc.utils import (
     CONFIG_HOST_KEY,
+    CONFIG_LONG_TIMEOUT_KEY,
     CONFIG_PORT_KEY,
+    CONFIG_SHORT_TIMEOUT_KEY,
     CONFIG_USE_HTTP,
     QPC_MIN_SERVER_VERSION,
-    get_server_location,
+    get_client_config,
     get_ssl_verify,
     handle_error_response,
+    json_dumps,
+    json_loads,
     log_request_info,
     logger,
-    read_client_token,
-    read_server_config,
+    read_server_info,
+    write_server_info,
 )
 
 # Need to determine how we get this information; config file at install?
@@ -33,12 +55,316 @@ PUT = "PUT"
 
 CONNECTION_ERROR_MSG = messages.CONNECTION_ERROR_MSG
 
+# Connection pool tuning for the shared session. qpc talks to a single server,
+# so one pool is enough; maxsize bounds how many keep-alive sockets are retained.
+POOL_CONNECTIONS = 1
+POOL_MAXSIZE = 10
+
+# Default number of requests request_many() starts with in flight, and the
+# default ceiling it adapts that number up to.
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_CONCURRENCY = 16
+
+_session = None
+# server.config the session was built for: its transport and pool size
+_session_server_config = None
+_session_lock = threading.Lock()
+request_concurrency = DEFAULT_CONCURRENCY
+
+# AdaptiveLimiter of the request_many() batch a request belongs to, if any.
+batch_limiter = contextvars.ContextVar("batch_limiter", default=None)
+
+# Transient failures of idempotent requests are retried with jittered
+# exponential backoff, bounded per request and per command.
+RETRY_METHODS = frozenset({GET, PUT, DELETE})
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+DEFAULT_RETRIES = 3
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 10.0
+RETRY_MAX_TOTAL_TIME = 60.0
+RETRY_BUDGET = 20
+
+# Commands wait for a connection and then for each read of a response for
+# the (connect, read) timeouts of their class, in seconds: short for those
+# listing, showing, adding, editing or removing objects, long for those
+# transferring reports. The timeouts can be changed in server.config.
+TIMEOUT_SHORT = CONFIG_SHORT_TIMEOUT_KEY
+TIMEOUT_LONG = CONFIG_LONG_TIMEOUT_KEY
+DEFAULT_TIMEOUTS = {TIMEOUT_SHORT: (10.0, 60.0), TIMEOUT_LONG: (10.0, 600.0)}
+
+timeout_class = TIMEOUT_SHORT
+# time.monotonic() by which the command must complete, and its duration
+_deadline = None
+_deadline_seconds = None
+
+# Size of the chunks streamed responses are read in.
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# JSON request bodies of at least this many bytes are compressed with a
+# content coding the server advertised in its Accept-Encoding header.
+COMPRESSION_THRESHOLD = 64 * 1024
+GZIP_COMPRESSION_LEVEL = 6
+ZSTD_COMPRESSION_LEVEL = 3
+
+# How long a server version recorded in the server_info file is trusted
+# before it is read again from a response.
+SERVER_INFO_TTL = 3600
+
+_NOT_DECODED = object()
+
 try:
     exception_class = json.decoder.JSONDecodeError
 except AttributeError:
     exception_class = ValueError
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class QPCResponse:
+    """Wrap a response so its JSON body is decoded at most once.
+
+    Attribute access is forwarded to the wrapped response; json() decodes
+    lazily on first use and returns the cached result (or re-raises the
+    cached decoding error) afterwards.
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self._json = _NOT_DECODED
+        self._json_error = None
+
+    def __getattr__(self, name):
+        """Forward attribute access to the wrapped response."""
+        return getattr(self._response, name)
+
+    def __bool__(self):
+        """Return True if the status code is less than 400."""
+        return bool(self._response)
+
+    def __repr__(self):
+        """Represent as the wrapped response."""
+        return repr(self._response)
+
+    def json(self):
+        """Return the decoded JSON body, decoding it only on the first call."""
+        if self._json_error is not None:
+            raise self._json_error
+        if self._json is _NOT_DECODED:
+            try:
+                self._json = self._decode_json()
+            except ValueError as err:
+                self._json_error = err
+                raise
+        return self._json
+
+    def _decode_json(self):
+        encoding = (self._response.encoding or "utf-8").lower()
+        if encoding in {"utf-8", "utf8"}:
+            try:
+                return json_loads(self._response.content)
+            except ValueError:
+                pass
+        # other encodings, and the error requests raises for invalid JSON
+        return self._response.json()
+
+    def iter_chunks(self, chunk_size=STREAM_CHUNK_SIZE):
+        """Iterate over the raw body in chunks, without holding it in memory.
+
+        Responses requested with stream=True are read from the connection as
+        they are iterated; the connection is released once they are exhausted.
+        Iterating exits once the command ran past its deadline.
+        """
+        for chunk in self._response.iter_content(chunk_size=chunk_size):
+            check_deadline()
+            yield chunk
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Settings controlling how transient request failures are retried.
+
+    :param retries: max retries for a single request
+    :param backoff_base: delay before the first retry, doubled on each retry
+    :param backoff_max: upper bound for a single delay
+    :param max_total_time: upper bound for the time spent on one request
+    :param budget: max retries across every request of a command
+    """
+
+    retries: int = DEFAULT_RETRIES
+    backoff_base: float = RETRY_BACKOFF_BASE
+    backoff_max: float = RETRY_BACKOFF_MAX
+    max_total_time: float = RETRY_MAX_TOTAL_TIME
+    budget: int = RETRY_BUDGET
+
+    def backoff(self, attempt):
+        """Return a jittered delay for the given (zero based) retry attempt."""
+        ceiling = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return random.uniform(0, ceiling)
+
+
+class RetryBudget:
+    """Thread-safe count of the retries a command may still perform."""
+
+    def __init__(self, total):
+        self.remaining = total
+        self._lock = threading.Lock()
+
+    def consume(self):
+        """Use one retry from the budget, returning False if none are left."""
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+retry_policy = RetryPolicy()
+retry_budget = RetryBudget(retry_policy.budget)
+
+
+def configure_retries(retries=None):
+    """Set the retry policy for this process and reset the retry budget.
+
+    :param retries: max retries for a single request; None keeps the default
+    """
+    global retry_policy  # noqa: PLW0603
+    if retries is not None:
+        retry_policy = RetryPolicy(retries=retries)
+    reset_retry_budget()
+
+
+def reset_retry_budget():
+    """Refill the retry budget; called at the start of each command."""
+    global retry_budget  # noqa: PLW0603
+    retry_budget = RetryBudget(retry_policy.budget)
+
+
+def save_request_settings():
+    """Return the settings of the main options, see restore_request_settings()."""
+    return retry_policy, request_concurrency, cache.cache_enabled
+
+
+def restore_request_settings(settings):
+    """Restore the settings of the main options saved by save_request_settings().
+
+    `qpc shell` restores them before each command, so the options given to
+    one command do not carry over to the next.
+    """
+    global retry_policy  # noqa: PLW0603
+    retry_policy, concurrency, cache_enabled = settings
+    reset_retry_budget()
+    set_concurrency(concurrency)
+    cache.set_cache_enabled(cache_enabled)
+
+
+circuit_breaker = CircuitBreaker()
+
+
+def reset_circuit_breaker():
+    """Close the circuit and clear its counts; called at the start of each command."""
+    global circuit_breaker  # noqa: PLW0603
+    circuit_breaker = CircuitBreaker()
+
+
+def log_circuit_summary():
+    """Log what the command completed and skipped, if the circuit ever opened."""
+    circuit_breaker.log_summary()
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header into a number of seconds.
+
+    :param value: header value, either delay-seconds or an HTTP-date
+    :returns: the delay in seconds, or None if absent or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def retry_delay(method, attempt, started, retry_after=None):
+    """Decide whether a failed request is retried and after how long.
+
+    :returns: the delay in seconds, or None if the request is not retried
+    """
+    if method not in RETRY_METHODS or attempt >= retry_policy.retries:
+        return None
+    delay = parse_retry_after(retry_after)
+    if delay is None:
+        delay = retry_policy.backoff(attempt)
+    if time.monotonic() - started + delay > retry_policy.max_total_time:
+        return None
+    remaining = remaining_time()
+    if remaining is not None and delay >= remaining:
+        return None
+    if not retry_budget.consume():
+        return None
+    return delay
+
+
+def set_timeout_class(timeout_class_key):
+    """Set the class of timeouts used by the requests of the current command.
 
+    :param timeout_class_key: TIMEOUT_SHORT or TIMEOUT_LONG
+    """
+    global timeout_class  # noqa: PLW0603
+    timeout_class = timeout_class_key
+
+
+def set_deadline(seconds):
+    """Set how long the command may run, from now.
+
+    :param seconds: the duration in seconds; None removes the deadline
+    """
+    global _deadline, _deadline_seconds  # noqa: PLW0603
+    _deadline_seconds = seconds
+    _deadline = None if seconds is None else time.monotonic() + seconds
+
+
+def remaining_time():
+    """Return the seconds left before the deadline, or None without one."""
+    if _deadline is None:
+        return None
+    return _deadline - time.monotonic()
+
+
+def check_deadline():
+    """Exit if the command ran past its deadline."""
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        logger.error(_(messages.DEADLINE_EXCEEDED), _deadline_seconds)
+        sys.exit(1)
+
+
+def request_timeout():
+    """Return the (connect, read) timeouts of the next request.
+
+    They are the timeouts of the current command class, shortened so the
+    request does not outlast the deadline.
+    """
+    check_deadline()
+    timeout = get_client_config().timeout(timeout_class)
+    connect, read = timeout or DEFAULT_TIMEOUTS[timeout_class]
+    remaining = remaining_time()
+    if remaining is not None:
+        connect, read = min(connect, remaining), min(read, remaining)
+    return connect, read
+
+
+@functools.cache
 def version_tuple(version_str: str) -> tuple:
     """
     Parse a version string to a tuple containing its first three integer segments.
@@ -60,31 +386,29 @@ def handle_general_errors(response, min_server_version):
     :param response: The response object.
     :returns: The response object.
     """
-    server_version = response.headers.get("X-Server-Version")
-    if not server_version:
-        server_version = QPC_MIN_SERVER_VERSION
+    location = _server_location(response)
+    server_info = get_server_info(location) or record_server_info(
+        location, response.headers
+    )
+    if server_info is None:
+        # the response did not come from a qpc server (i.e. from a proxy)
+        server_info = ServerInfo(QPC_MIN_SERVER_VERSION)
 
-    if "0.0.0" not in server_version and version_tuple(server_version) < version_tuple(
-        min_server_version
-    ):
+    if not server_info.is_at_least(min_server_version):
         logger.error(
             _(messages.SERVER_TOO_OLD_FOR_CLI),
-            {"min_version": min_server_version, "current_version": server_version},
+            {
+                "min_version": min_server_version,
+                "current_version": server_info.version,
+            },
         )
         sys.exit(1)
 
-    token_expired = {"detail": "Token has expired"}
-    response_data = None
-    try:
-        response_data = response.json()
-    except exception_class:
-        pass
-
     if response.status_code == 401:
         handle_error_response(response)
         logger.error(_(messages.SERVER_LOGIN_REQUIRED), QPC_VAR_PROGRAM_NAME)
         sys.exit(1)
-    elif response.status_code == 400 and response_data == token_expired:
+    elif response.status_code == 400 and _is_token_expired(response):
         handle_error_response(response)
         logger.error(_(messages.SERVER_LOGIN_REQUIRED), QPC_VAR_PROGRAM_NAME)
         sys.exit(1)
@@ -96,6 +420,379 @@ def handle_general_errors(response, min_server_version):
     return response
 
 
+@dataclass(frozen=True)
+class ServerInfo:
+    """Version and capabilities a server reported in its response headers.
+
+    :param version: the X-Server-Version header
+    :param accept_encoding: content codings the server accepts for request
+        bodies, from its Accept-Encoding header (RFC 7694)
+    :param checked_at: when the headers were read, as a timestamp
+    """
+
+    version: str
+    accept_encoding: frozenset = frozenset()
+    checked_at: float = 0.0
+
+    def is_at_least(self, min_server_version):
+        """Check whether the server is not older than min_server_version."""
+        return "0.0.0" in self.version or version_tuple(self.version) >= version_tuple(
+            min_server_version
+        )
+
+    def accepts_encoding(self, coding):
+        """Check whether request bodies may be sent with the given coding."""
+        return coding in self.accept_encoding
+
+
+# ServerInfo recorded in this process, by server location, and the
+# server.config it was recorded under.
+_server_info = {}
+_server_info_config = None
+# Locations this process asked for their capabilities, see negotiate_server_info.
+_negotiated = set()
+
+
+def _forget_server_info_of_old_config():
+    """Forget the server information recorded before server.config changed.
+
+    server config clears what earlier runs recorded; what this process
+    recorded, e.g. in the shell, must not outlive it either.
+    """
+    global _server_info_config  # noqa: PLW0603
+    server_config = get_client_config().server_config
+    if server_config is not _server_info_config:
+        if server_config != _server_info_config:
+            _server_info.clear()
+            _negotiated.clear()
+        _server_info_config = server_config
+
+
+def _server_location(response):
+    """Return the scheme and authority a response was received from."""
+    url = urlsplit(str(response.url))
+    return f"{url.scheme}://{url.netloc}"
+
+
+def get_server_info(location=None):
+    """Return what is known about a server's version and capabilities.
+
+    Information recorded by this process is used first, then information
+    recorded by earlier runs if it is younger than SERVER_INFO_TTL and the
+    response cache is enabled.
+
+    :param location: server location; defaults to the configured server
+    :returns: ServerInfo, or None if the server has not been contacted yet
+    """
+    _forget_server_info_of_old_config()
+    if location is None:
+        location = get_client_config().server_location
+    server_info = _server_info.get(location)
+    if server_info is not None or not cache.cache_enabled:
+        return server_info
+    recorded = read_server_info().get(location)
+    try:
+        server_info = ServerInfo(
+            version=recorded["version"],
+            accept_encoding=frozenset(recorded["accept_encoding"]),
+            checked_at=recorded["checked_at"],
+        )
+        version_tuple(server_info.version)
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not 0 <= time.time() - server_info.checked_at < SERVER_INFO_TTL:
+        return None
+    _server_info[location] = server_info
+    return server_info
+
+
+def record_server_info(location, headers):
+    """Record the version and capabilities a server reports in its headers.
+
+    :param location: server location the headers were received from
+    :param headers: response headers
+    :returns: ServerInfo, or None if the headers do not report a version
+    """
+    version = headers.get("X-Server-Version")
+    if not version:
+        return None
+    accept_encoding = frozenset(
+        coding.split(";", 1)[0].strip().lower()
+        for coding in headers.get("Accept-Encoding", "").split(",")
+        if coding.strip()
+    )
+    server_info = ServerInfo(version, accept_encoding, time.time())
+    _forget_server_info_of_old_config()
+    _server_info[location] = server_info
+    if cache.cache_enabled:
+        try:
+            version_tuple(version)
+        except ValueError:
+            # let handle_general_errors report it; do not persist it
+            return server_info
+        recorded = read_server_info()
+        recorded[location] = {
+            "version": version,
+            "accept_encoding": sorted(accept_encoding),
+            "checked_at": server_info.checked_at,
+        }
+        try:
+            write_server_info(recorded)
+        except OSError as err:
+            logger.debug("Failed to record server information: %s", err)
+    return server_info
+
+
+def reset_server_info():
+    """Forget the server information recorded by this process."""
+    _server_info.clear()
+    _negotiated.clear()
+
+
+def forget_server_info(location):
+    """Forget what this process and earlier runs recorded about a server.
+
+    :param location: server location
+    """
+    _forget_server_info_of_old_config()
+    _server_info.pop(location, None)
+    recorded = read_server_info()
+    if recorded.pop(location, None) is None:
+        return
+    try:
+        write_server_info(recorded)
+    except OSError as err:
+        logger.debug("Failed to record server information: %s", err)
+
+
+@dataclass
+class _CoalescedGet:
+    """A GET shared by identical requests of this process.
+
+    done is set once the first caller received the response; response stays
+    None if that request failed or the response may not be shared.
+    """
+
+    generation: int
+    done: threading.Event = field(default_factory=threading.Event)
+    response: QPCResponse | None = None
+    expires: float = math.inf
+
+    def is_fresh(self):
+        """Check whether the response may still be reused."""
+        return time.monotonic() < self.expires
+
+
+# Identical GETs issued by this process, shared until a mutating request.
+_coalesced = {}
+_coalesced_lock = threading.Lock()
+_coalesced_generation = 0
+
+
+def forget_coalesced_requests():
+    """Forget the GET responses shared within this process.
+
+    Called around every mutating request, since it may change any resource;
+    GETs already in flight are not shared afterwards.
+    """
+    global _coalesced_generation  # noqa: PLW0603
+    with _coalesced_lock:
+        _coalesced.clear()
+        _coalesced_generation += 1
+
+
+def is_name_lookup(url):
+    """Check whether a GET url only filters a listing by object name."""
+    return parse_qs(urlsplit(url).query).keys() == {"name"}
+
+
+def expire_coalesced_requests(lookup_ttl):
+    """Forget the GET responses shared within this process, but name lookups.
+
+    Called by `qpc shell` between commands, so each command shows what the
+    server holds now while the name to id lookups of the previous commands
+    are reused for up to lookup_ttl seconds; mutating requests still forget
+    them all.
+
+    :param lookup_ttl: seconds for which name lookups may still be reused
+    """
+    expires = time.monotonic() + lookup_ttl
+    with _coalesced_lock:
+        for key, entry in list(_coalesced.items()):
+            if entry.response is not None and is_name_lookup(key[0]):
+                entry.expires = min(entry.expires, expires)
+            else:
+                del _coalesced[key]
+
+
+def coalesce_key(url, params, headers):
+    """Return the key identifying identical GETs of this process."""
+    prepared = requests.Request(GET, url, params=params, headers=headers).prepare()
+    return prepared.url, tuple(sorted(prepared.headers.lower_items()))
+
+
+def coalesce_get(key, send):
+    """Send a GET, or share the response of an identical one.
+
+    The first caller sends the request; concurrent callers wait for its
+    response and later callers reuse it while its Cache-Control allows.
+
+    :param key: key of the request, see coalesce_key()
+    :param send: callable sending the request and returning the response
+    :returns: QPCResponse, possibly shared with other callers
+    """
+    with _coalesced_lock:
+        entry = _coalesced.get(key)
+        if entry is not None and entry.done.is_set() and not entry.is_fresh():
+            entry = None
+        leader = entry is None
+        if leader:
+            entry = _CoalescedGet(_coalesced_generation)
+            _coalesced[key] = entry
+    if not leader:
+        entry.done.wait()
+        if entry.response is not None:
+            return entry.response
+        # the first request failed or may not be shared; send our own
+        return send()
+    try:
+        response = send()
+        lifetime = cache.reuse_lifetime(response)
+        with _coalesced_lock:
+            if lifetime is None or entry.generation != _coalesced_generation:
+                if _coalesced.get(key) is entry:
+                    del _coalesced[key]
+            else:
+                entry.response = response
+                entry.expires = time.monotonic() + lifetime
+        return response
+    except BaseException:
+        with _coalesced_lock:
+            if _coalesced.get(key) is entry:
+                del _coalesced[key]
+        raise
+    finally:
+        entry.done.set()
+
+
+def get_session():
+    """Return the process-wide HTTP session, creating it on first use.
+
+    Reusing one session keeps connections alive between calls, so commands
+    that issue many requests only pay for the TCP and TLS handshakes once.
+    The session is built again once server.config changes, e.g. by a server
+    config command run in the shell, as the transport it mounted may no
+    longer apply.
+
+    :returns: requests.Session object
+    """
+    global _session, _session_server_config  # noqa: PLW0603
+    client_config = get_client_config()
+    server_config = client_config.server_config
+    with _session_lock:
+        if _session is not None and server_config is not _session_server_config:
+            if server_config != _session_server_config:
+                _session.close()
+                _session = None
+            _session_server_config = server_config
+        if _session is None:
+            session = requests.Session()
+            # one connection per request request_many() may keep in flight
+            pool_maxsize = max(POOL_MAXSIZE, request_concurrency, max_concurrency())
+            adapter = HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS, pool_maxsize=pool_maxsize
+            )
+            if client_config.http2:
+                # httpx is only imported by the servers configured to use it
+                from qpc.http2 import Http2Adapter, http2_available  # noqa: PLC0415
+
+                if http2_available():
+                    adapter = Http2Adapter(max_connections=pool_maxsize)
+                else:
+                    logger.warning(_(messages.HTTP2_TRANSPORT_UNAVAILABLE))
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.mount(
+                f"{UNIX_SOCKET_SCHEME}://", UnixSocketAdapter(pool_maxsize=pool_maxsize)
+            )
+            mount_cassette(session)
+            _session = session
+            _session_server_config = server_config
+        return _session
+
+
+def close_session():
+    """Close the process-wide HTTP session and its pooled connections."""
+    global _session  # noqa: PLW0603
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def set_concurrency(concurrency):
+    """Set how many requests request_many() starts with in flight.
+
+    :param concurrency: concurrent requests; None keeps the current value
+    """
+    global request_concurrency  # noqa: PLW0603
+    if concurrency is not None and concurrency != request_concurrency:
+        request_concurrency = concurrency
+        # rebuild the session so its pool can hold one connection per worker
+        close_session()
+
+
+def max_concurrency():
+    """Return the ceiling of the requests request_many() keeps in flight.
+
+    It is the max_concurrency of server.config or, when that is not set,
+    DEFAULT_MAX_CONCURRENCY raised to --concurrency if that asks for more.
+    """
+    configured = get_client_config().max_concurrency
+    if configured:
+        return configured
+    return max(DEFAULT_MAX_CONCURRENCY, request_concurrency)
+
+
+def create_limiter(concurrency=None):
+    """Create the AdaptiveLimiter of a batch of requests.
+
+    :param concurrency: fixed ceiling of the requests in flight; by default
+        the batch starts with the --concurrency value and adapts it up to
+        the max_concurrency of server.config
+    :returns: AdaptiveLimiter
+    """
+    if concurrency:
+        return AdaptiveLimiter(concurrency, concurrency)
+    ceiling = max_concurrency()
+    if request_concurrency > ceiling:
+        logger.warning(
+            _(messages.REQUEST_CONCURRENCY_CLAMPED),
+            {"concurrency": request_concurrency, "ceiling": ceiling},
+        )
+    return AdaptiveLimiter(request_concurrency, ceiling)
+
+
+def record_outcome(sent_at, status_code):
+    """Let the limiter of the current batch adapt to a response.
+
+    :param sent_at: time.monotonic() when the request was sent
+    :param status_code: status code of the response
+    """
+    limiter = batch_limiter.get()
+    if limiter is not None:
+        limiter.record(sent_at, status_code)
+
+
+def _is_token_expired(response):
+    """Check if the response body reports an expired token."""
+    token_expired = {"detail": "Token has expired"}
+    try:
+        return response.json() == token_expired
+    except exception_class:
+        return False
+
+
 def post(url, payload, headers=None):
     """Post JSON payload to the given url.
 
@@ -104,20 +801,27 @@ def post(url, payload, headers=None):
     :param payload: dictionary of payload to be posted
     :returns: reponse object
     """
-    ssl_verify = get_ssl_verify()
-    return requests.post(url, json=payload, headers=headers, verify=ssl_verify)
+    return _send_json(POST, url, payload, headers)
 
 
-def get(url, params=None, headers=None):
+def get(url, params=None, headers=None, stream=False):
     """Get JSON data from the given url.
 
     :param url: the server, port, and path
     (i.e. http://127.0.0.1:8000/api/v1/credentials)
     :param params: uri encoding params (i.e. ?param1=hello&param2=world)
+    :param stream: defer downloading the body until it is accessed
     :returns: reponse object
     """
     ssl_verify = get_ssl_verify()
-    return requests.get(url, params=params, headers=headers, verify=ssl_verify)
+    return get_session().get(
+        url,
+        params=params,
+        headers=headers,
+        verify=ssl_verify,
+        stream=stream,
+        timeout=request_timeout(),
+    )
 
 
 def patch(url, payload, headers=None):
@@ -128,8 +832,7 @@ def patch(url, payload, headers=None):
     :param payload: dictionary of payload to be posted
     :returns: reponse object
     """
-    ssl_verify = get_ssl_verify()
-    return requests.patch(url, json=payload, headers=headers, verify=ssl_verify)
+    return _send_json(PATCH, url, payload, headers)
 
 
 def delete(url, headers=None):
@@ -140,7 +843,9 @@ def delete(url, headers=None):
     :returns: reponse object
     """
     ssl_verify = get_ssl_verify()
-    return requests.delete(url, headers=headers, verify=ssl_verify)
+    return get_session().delete(
+        url, headers=headers, verify=ssl_verify, timeout=request_timeout()
+    )
 
 
 def put(url, payload, headers=None):
@@ -151,8 +856,111 @@ def put(url, payload, headers=None):
     :param payload: dictionary of payload to be posted
     :returns: reponse object
     """
+    return _send_json(PUT, url, payload, headers)
+
+
+def _send_json(method, url, payload, headers=None):
+    """Send payload as a JSON body, compressed if the server supports it.
+
+    A server answering 415 to a compressed body no longer accepts that
+    coding (RFC 7694); what this and earlier runs recorded about it is
+    replaced by its new capabilities and the body is sent again
+    uncompressed.
+    """
     ssl_verify = get_ssl_verify()
-    return requests.put(url, json=payload, headers=headers, verify=ssl_verify)
+    if payload is None:
+        return get_session().request(
+            method, url, headers=headers, verify=ssl_verify, timeout=request_timeout()
+        )
+    body = json_dumps(payload, allow_nan=False)
+    req_headers = {**(headers or {}), "Content-Type": "application/json"}
+    coding = select_content_coding(url, len(body), headers)
+    if coding is not None:
+        response = get_session().request(
+            method,
+            url,
+            data=compress_body(body, coding),
+            headers={**req_headers, "Content-Encoding": coding},
+            verify=ssl_verify,
+            timeout=request_timeout(),
+        )
+        if response.status_code != requests.codes.unsupported_media_type:
+            return response
+        location = _server_location(response)
+        forget_server_info(location)
+        record_server_info(location, response.headers)
+        response.close()
+    return get_session().request(
+        method,
+        url,
+        data=body,
+        headers=req_headers,
+        verify=ssl_verify,
+        timeout=request_timeout(),
+    )
+
+
+def select_content_coding(url, size, headers=None):
+    """Pick the content coding for a request body sent to url.
+
+    Bodies are only compressed with a coding a response of the server, in
+    this run or a recent one, advertised. When nothing is known about the
+    server yet, as for the body of report upload, which is the first request
+    of its process, the server is asked with negotiate_server_info().
+
+    :param url: the url the body is sent to
+    :param size: size of the uncompressed body in bytes
+    :param headers: headers of the request, for the negotiation request
+    :returns: "zstd", "gzip" or None to send the body uncompressed
+    """
+    if size < COMPRESSION_THRESHOLD:
+        return None
+    url_parts = urlsplit(url)
+    server_info = get_server_info(f"{url_parts.scheme}://{url_parts.netloc}")
+    if server_info is None:
+        server_info = negotiate_server_info(url, headers)
+    if server_info is None:
+        return None
+    if zstandard is not None and server_info.accepts_encoding("zstd"):
+        return "zstd"
+    if server_info.accepts_encoding("gzip"):
+        return "gzip"
+    return None
+
+
+def negotiate_server_info(url, headers=None):
+    """Record the capabilities of a server from its answer to OPTIONS url.
+
+    The request has no body, so it costs a round trip instead of sending a
+    large body twice to a server rejecting its coding. Each server is only
+    asked once per process; a failed negotiation leaves the body uncompressed.
+
+    :param url: the url a body is about to be sent to
+    :param headers: headers of that request
+    :returns: ServerInfo, or None if the server did not report it
+    """
+    url_parts = urlsplit(url)
+    location = f"{url_parts.scheme}://{url_parts.netloc}"
+    if location in _negotiated:
+        return None
+    _negotiated.add(location)
+    try:
+        response = get_session().options(
+            url, headers=headers, verify=get_ssl_verify(), timeout=request_timeout()
+        )
+    except (requests.exceptions.RequestException, CassetteMissError) as err:
+        logger.debug("Failed to negotiate the content coding of %s: %s", url, err)
+        return None
+    response.close()
+    return record_server_info(location, response.headers)
+
+
+def compress_body(body, coding):
+    """Compress a request body with the given content coding."""
+    if coding == "zstd":
+        compressor = zstandard.ZstdCompressor(level=ZSTD_COMPRESSION_LEVEL)
+        return compressor.compress(body)
+    return gzip.compress(body, compresslevel=GZIP_COMPRESSION_LEVEL)
 
 
 methods = {
@@ -164,6 +972,30 @@ methods = {
 }
 
 
+def _send_or_exit(send, method, url, client_config):
+    """Call send() for request(), exiting if the request could not be made."""
+    if method != GET:
+        forget_coalesced_requests()
+    try:
+        return send()
+    except (requests.exceptions.ConnectionError, requests.exceptions.SSLError):
+        check_deadline()
+        handle_connection_error(client_config)
+        sys.exit(1)
+    except requests.exceptions.Timeout:
+        handle_timeout(method, url)
+        sys.exit(1)
+    except CircuitOpenError:
+        logger.debug(_(messages.REQUEST_SKIPPED), {"method": method, "url": url})
+        sys.exit(1)
+    except CassetteMissError as error:
+        logger.error(error.message)
+        sys.exit(1)
+    finally:
+        if method != GET:
+            forget_coalesced_requests()
+
+
 def request(  # noqa: PLR0913
     method,
     path,
@@ -172,6 +1004,9 @@ def request(  # noqa: PLR0913
     parser=None,
     headers=None,
     min_server_version=QPC_MIN_SERVER_VERSION,
+    config=None,
+    use_cache=False,
+    stream=False,
 ):
     """Create a generic handler for passing to specific request methods.
 
@@ -182,6 +1017,11 @@ def request(  # noqa: PLR0913
     :param parser: parser for printing usage on failure
     :param headers: headers to include
     :param min_server_version: min qpc server version allowed
+    :param config: ClientConfig to use instead of the memoized one
+    :param use_cache: revalidate GET responses against the on-disk cache, if
+        the server configuration enables it
+    :param stream: for GET requests, leave the body on the connection so it
+        can be consumed with iter_chunks(); not combined with use_cache
     :returns: reponse object
     :raises: AssertionError error if method is not supported
     """
@@ -189,36 +1029,188 @@ def request(  # noqa: PLR0913
     log_command = None
     if parser is not None:
         log_command = parser.prog
-    token = read_client_token()
-    url = get_server_location() + path
-    req_headers = headers or {}
-    if token:
-        req_headers["Authorization"] = f"Token {token}"
+    client_config = config or get_client_config()
+    url = client_config.server_location + path
+    req_headers = build_request_headers(client_config, headers)
 
     if method not in methods:
         logger.error("Unsupported request method %s", method)
         parser.print_help()
         sys.exit(1)
 
-    try:
-        result = perform_request(
-            method, url, params, payload, req_headers, min_server_version
+    send = functools.partial(
+        _send_cached,
+        method,
+        url,
+        params,
+        payload,
+        req_headers,
+        min_server_version=min_server_version,
+        client_config=client_config,
+        use_cache=use_cache,
+        stream=stream,
+    )
+    if method == GET and not stream and cache.cache_enabled:
+        send = functools.partial(
+            coalesce_get, coalesce_key(url, params, req_headers), send
         )
+    result = _send_or_exit(send, method, url, client_config)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        # decoding large bodies is costly, only do it when it will be logged
+        response_json = "<streamed body ignored>"
+        if not stream:
+            response_json = decode_response_json(result)
+        log_request_info(method, log_command, url, response_json, result.status_code)
+    return result
 
-    except (requests.exceptions.ConnectionError, requests.exceptions.SSLError):
-        handle_connection_error()
-        sys.exit(1)
 
-    log_request_info(
-        method, log_command, url, decode_response_json(result), result.status_code
+def _send_cached(  # noqa: PLR0913
+    method,
+    url,
+    params,
+    payload,
+    req_headers,
+    *,
+    min_server_version,
+    client_config,
+    use_cache,
+    stream,
+):
+    """Perform the request, revalidating against the on-disk cache if asked."""
+    response_cache = cache_key = cached = None
+    use_cache = use_cache and client_config.response_cache and cache.cache_enabled
+    if use_cache and not stream and method == GET:
+        response_cache = cache.get_response_cache()
+        cache_key = cache.cache_key(method, url, params, client_config)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            req_headers = {**req_headers, **cached.validators()}
+
+    result = perform_request(
+        method, url, params, payload, req_headers, min_server_version, stream
     )
+    if response_cache is not None:
+        result = _use_cached_response(response_cache, cache_key, cached, result)
     return result
 
 
-def handle_connection_error():
+def _use_cached_response(response_cache, cache_key, cached, response):
+    """Replace a 304 by the cached response, or cache a fresh response."""
+    if cached is not None and response.status_code == requests.codes.not_modified:
+        return QPCResponse(cached.to_response(not_modified=response))
+    response_cache.put(cache_key, response)
+    return response
+
+
+def build_request_headers(client_config, headers=None):
+    """Return the request headers, including the client token if available."""
+    req_headers = headers or {}
+    if client_config.token:
+        req_headers["Authorization"] = f"Token {client_config.token}"
+    return req_headers
+
+
+class _OnceFilter(logging.Filter):
+    """Drop warnings and errors identical to one already logged.
+
+    Items of a batch failing for the same reason, such as an unreachable
+    server or an expired login, would otherwise each log the same error.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.logged = set()
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        """Let through the first of identical warnings and errors."""
+        if record.levelno < logging.WARNING:
+            return True
+        key = (record.levelno, record.getMessage())
+        with self._lock:
+            if key in self.logged:
+                return False
+            self.logged.add(key)
+            return True
+
+
+@dataclass(frozen=True)
+class RequestResult:
+    """Outcome of one of the requests issued by request_many().
+
+    Exactly one of response and error is set; error holds the exception
+    (usually SystemExit) that request() raised for this item.
+    """
+
+    response: QPCResponse | None = None
+    error: BaseException | None = None
+
+
+def _request_one(request_kwargs):
+    """Run request() for request_many(), capturing its failure."""
+    try:
+        return RequestResult(response=request(**request_kwargs))
+    except SystemExit as err:
+        return RequestResult(error=err)
+
+
+def request_many(requests_kwargs, concurrency=None):
+    """Issue a batch of requests over the shared session with bounded concurrency.
+
+    Failures do not stop the batch: an item whose request() call would exit
+    the program is reported as a RequestResult with an error instead, its
+    error being logged only once for the batch. The
+    number of requests in flight adapts to the server load, see create_limiter().
+
+    :param requests_kwargs: iterable of dicts with keyword arguments for request()
+    :param concurrency: fixed ceiling of the requests in flight
+    :returns: list of RequestResult, in the same order as requests_kwargs
+    """
+    requests_kwargs = list(requests_kwargs)
+    limiter = create_limiter(concurrency)
+
+    def request_limited(request_kwargs):
+        with limiter.slot():
+            token = batch_limiter.set(limiter)
+            try:
+                return _request_one(request_kwargs)
+            finally:
+                batch_limiter.reset(token)
+
+    workers = min(limiter.ceiling, len(requests_kwargs))
+    once_filter = _OnceFilter()
+    logger.addFilter(once_filter)
+    try:
+        if workers <= 1:
+            results = [
+                request_limited(request_kwargs) for request_kwargs in requests_kwargs
+            ]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(request_limited, requests_kwargs))
+    finally:
+        logger.removeFilter(once_filter)
+    limiter.log_summary(len(requests_kwargs))
+    return results
+
+
+def handle_timeout(method, url):
+    """Log that a request timed out, or that the deadline has passed."""
+    check_deadline()
+    logger.error(_(messages.REQUEST_TIMED_OUT), {"method": method, "url": url})
+
+
+def handle_connection_error(client_config=None):
     """Log connection error."""
-    config = read_server_config()
-    if config is not None:
+    client_config = client_config or get_client_config()
+    config = client_config.server_config
+    if client_config.socket_path:
+        logger.error(
+            _(messages.CONNECTION_ERROR_SOCKET_MSG),
+            {"socket": client_config.socket_path},
+        )
+    elif config is not None:
         protocol = "https"
         host = config.get(CONFIG_HOST_KEY)
         port = config.get(CONFIG_PORT_KEY)
@@ -237,20 +1229,84 @@ def perform_request(  # noqa: PLR0913
     payload=None,
     req_headers=None,
     min_server_version=QPC_MIN_SERVER_VERSION,
+    stream=False,
+):
+    """Perform the api request and return the response.
+
+    Idempotent requests failing with a connection error, a timeout or a 429,
+    502, 503 or 504 response are retried according to the current retry
+    policy. No attempt is sent while the circuit breaker is open.
+
+    :raises: CircuitOpenError if the circuit breaker is open
+    """
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        circuit_breaker.before_request()
+        sent_at = time.monotonic()
+        try:
+            response = _send_request(
+                method, url, params, payload, req_headers, stream=stream
+            )
+        except requests.exceptions.SSLError:
+            circuit_breaker.record()
+            raise
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+        ) as err:
+            circuit_breaker.record()
+            delay = retry_delay(method, attempt, started)
+            if delay is None:
+                raise
+            reason = type(err).__name__
+        except BaseException:
+            # no outcome to record: let another attempt probe the server
+            circuit_breaker.cancel()
+            raise
+        else:
+            circuit_breaker.record(response.status_code)
+            record_outcome(sent_at, response.status_code)
+            if response.status_code not in RETRY_STATUS_CODES:
+                break
+            delay = retry_delay(
+                method, attempt, started, response.headers.get("Retry-After")
+            )
+            if delay is None:
+                break
+            reason = response.status_code
+            response.close()
+        attempt += 1
+        log_retry(method, url, reason, delay, attempt)
+        time.sleep(delay)
+    return handle_general_errors(QPCResponse(response), min_server_version)
+
+
+def log_retry(method, url, reason, delay, attempt):
+    """Log that a failed request is about to be retried."""
+    logger.info(
+        _(messages.REQUEST_RETRYING),
+        {
+            "method": method,
+            "url": url,
+            "reason": reason,
+            "delay": delay,
+            "attempt": attempt,
+            "retries": retry_policy.retries,
+        },
+    )
+
+
+def _send_request(  # noqa: PLR0913
+    method, url, params, payload, req_headers, *, stream=False
 ):
-    """Perform the api request and return the response."""
+    """Send a single request using the helper for the given method."""
     request_method = methods[method]
     if method == "GET":
-        return handle_general_errors(
-            request_method(url, params, req_headers), min_server_version
-        )
+        return request_method(url, params, req_headers, stream)
     if method == "DELETE":
-        return handle_general_errors(
-            request_method(url, req_headers), min_server_version
-        )
-    return handle_general_errors(
-        request_method(url, payload, req_headers), min_server_version
-    )
+        return request_method(url, req_headers)
+    return request_method(url, payload, req_headers)
 
 
 def decode_response_json(response):
@@ -7,7 +7,7 @@ from requests import codes
 
 from qpc import messages, scan
 from qpc.clicommand import CliCommand
-from qpc.request import DELETE, GET, POST, request
+from qpc.request import DELETE, GET, POST, request, request_many
 from qpc.translation import _
 from qpc.utils import handle_error_response
 
@@ -50,19 +50,35 @@ class ScanClearCommand(CliCommand):
             self.req_params = {"name": self.args.name}
 
     def _delete_entry(self, scan_entry, print_out=True):
-        deleted = False
-        delete_uri = scan.SCAN_URI + str(scan_entry["id"]) + "/"
-        response = request(DELETE, delete_uri, parser=self.parser)
-        name = scan_entry["name"]
-        if response.status_code == codes.no_content:
-            deleted = True
-            if print_out:
-                logger.info(_(messages.SCAN_REMOVED), name)
-        else:
-            handle_error_response(response)
+        return self._delete_entries([scan_entry], print_out)
+
+    def _delete_entries(self, scan_entries, print_out=True):
+        """Delete the given scans concurrently.
+
+        :returns: True if every scan was deleted
+        """
+        results = request_many(
+            {
+                "method": DELETE,
+                "path": scan.SCAN_URI + str(scan_entry["id"]) + "/",
+                "parser": self.parser,
+            }
+            for scan_entry in scan_entries
+        )
+        all_deleted = True
+        for scan_entry, result in zip(scan_entries, results):
+            name = scan_entry["name"]
+            response = result.response
+            if response is not None and response.status_code == codes.no_content:
+                if print_out:
+                    logger.info(_(messages.SCAN_REMOVED), name)
+                continue
+            all_deleted = False
+            if response is not None:
+                handle_error_response(response)
             if print_out:
                 logger.error(_(messages.SCAN_FAILED_TO_REMOVE), name)
-        return deleted
+        return all_deleted
 
     def _delete_all(self) -> bool:
         """Delete all sources."""
@@ -88,10 +104,11 @@ class ScanClearCommand(CliCommand):
             if self._delete_entry(entry) is False:
                 sys.exit(1)
         elif self.args.name and count > 1:
-            for result in results:
-                if result["name"] == self.args.name:
-                    if self._delete_entry(result) is False:
-                        sys.exit(1)
+            matching = [
+                result for result in results if result["name"] == self.args.name
+            ]
+            if self._delete_entries(matching) is False:
+                sys.exit(1)
         elif count == 0:
             logger.error(_(messages.SCAN_NO_SCANS_TO_REMOVE))
             sys.exit(1)
@@ -24,6 +24,7 @@ class ScanJobCommand(CliCommand):
 
     SUBCOMMAND = scan.SUBCOMMAND
     ACTION = scan.JOB
+    CACHEABLE = True
 
     def __init__(self, subparsers):
         """Create command."""
@@ -23,6 +23,7 @@ class ScanShowCommand(CliCommand):
 
     SUBCOMMAND = scan.SUBCOMMAND
     ACTION = scan.SHOW
+    CACHEABLE = True
 
     def __init__(self, subparsers):
         """Create command."""
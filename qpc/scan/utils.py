@@ -1,12 +1,14 @@
 """Utilities for the scan module."""
 
+import sys
 from logging import getLogger
 
 from requests import codes
 
 from qpc import messages, scan, source
-from qpc.request import GET, request
+from qpc.request import GET, request, request_many
 from qpc.translation import _
+from qpc.utils import handle_error_response
 
 logger = getLogger(__name__)
 
@@ -19,15 +21,24 @@ def get_source_ids(parser, source_names):
     """
     not_found = False
     source_ids = []
-    for source_name in set(source_names):
-        # check for existence of source
-        response = request(
-            parser=parser,
-            method=GET,
-            path=source.SOURCE_URI,
-            params={"name": source_name},
-            payload=None,
-        )
+    source_names = list(set(source_names))
+    # check for existence of sources
+    lookups = request_many(
+        {
+            "parser": parser,
+            "method": GET,
+            "path": source.SOURCE_URI,
+            "params": {"name": source_name},
+            "payload": None,
+        }
+        for source_name in source_names
+    )
+    for source_name, lookup in zip(source_names, lookups):
+        if lookup.error is not None:
+            # the server could not be reached or refused the request; the
+            # reason was logged by request()
+            sys.exit(1)
+        response = lookup.response
         if response.status_code == codes.ok:
             json_data = response.json()
             count = json_data.get("count", 0)
@@ -38,9 +49,12 @@ def get_source_ids(parser, source_names):
             else:
                 logger.error(_(messages.SOURCE_DOES_NOT_EXIST), source_name)
                 not_found = True
-        else:
+        elif response.status_code == codes.not_found:
             logger.error(_(messages.SOURCE_DOES_NOT_EXIST), source_name)
             not_found = True
+        else:
+            handle_error_response(response)
+            sys.exit(1)
     return not_found, source_ids
 
 
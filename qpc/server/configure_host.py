@@ -1,18 +1,29 @@
 """ConfigureHostCommand is used to set target host and port server."""
 
+import sys
 from argparse import SUPPRESS
 from logging import getLogger
+from pathlib import PurePosixPath
 
 import qpc.server as config
 from qpc import messages
 from qpc.clicommand import CliCommand
 from qpc.source.utils import validate_port
 from qpc.translation import _
+from qpc.unix_socket import UNIX_SOCKET_HOST, UNIX_SOCKET_PREFIX
 from qpc.utils import (
     CONFIG_HOST_KEY,
+    CONFIG_HTTP2_KEY,
+    CONFIG_LONG_TIMEOUT_KEY,
+    CONFIG_MAX_CONCURRENCY_KEY,
     CONFIG_PORT_KEY,
+    CONFIG_RESPONSE_CACHE_KEY,
+    CONFIG_SHORT_TIMEOUT_KEY,
+    CONFIG_SOCKET_KEY,
     CONFIG_SSL_VERIFY,
     CONFIG_USE_HTTP,
+    positive_int,
+    timeout_pair,
     write_server_config,
 )
 
@@ -63,6 +74,44 @@ class ConfigureHostCommand(CliCommand):
             help=_(messages.SERVER_CONFIG_SSL_CERT_HELP),
             required=False,
         )
+        self.parser.add_argument(
+            "--max-concurrency",
+            dest="max_concurrency",
+            metavar="MAX_CONCURRENCY",
+            type=positive_int,
+            help=_(messages.SERVER_CONFIG_MAX_CONCURRENCY_HELP),
+            required=False,
+        )
+        self.parser.add_argument(
+            "--short-timeout",
+            dest="short_timeout",
+            metavar="CONNECT,READ",
+            type=timeout_pair,
+            help=_(messages.SERVER_CONFIG_SHORT_TIMEOUT_HELP),
+            required=False,
+        )
+        self.parser.add_argument(
+            "--long-timeout",
+            dest="long_timeout",
+            metavar="CONNECT,READ",
+            type=timeout_pair,
+            help=_(messages.SERVER_CONFIG_LONG_TIMEOUT_HELP),
+            required=False,
+        )
+        self.parser.add_argument(
+            "--http2",
+            dest="http2",
+            action="store_true",
+            help=_(messages.SERVER_CONFIG_HTTP2_HELP),
+            required=False,
+        )
+        self.parser.add_argument(
+            "--response-cache",
+            dest="response_cache",
+            action="store_true",
+            help=_(messages.SERVER_CONFIG_RESPONSE_CACHE_HELP),
+            required=False,
+        )
         self.parser.add_argument(
             "--use-http",
             dest="use_http",
@@ -73,13 +122,16 @@ class ConfigureHostCommand(CliCommand):
 
     def _do_command(self):
         """Persist the server configuration."""
+        if self.args.host.startswith(UNIX_SOCKET_PREFIX):
+            self._configure_socket(self.args.host[len(UNIX_SOCKET_PREFIX) :])
+            return
         server_config = {
             CONFIG_HOST_KEY: self.args.host,
             CONFIG_PORT_KEY: int(self.args.port),
             CONFIG_USE_HTTP: self.args.use_http,
             CONFIG_SSL_VERIFY: self.args.ssl_verify,
         }
-        write_server_config(server_config)
+        self._write_server_config(server_config)
         protocol = "https"
         if self.args.use_http:
             protocol = "http"
@@ -91,3 +143,37 @@ class ConfigureHostCommand(CliCommand):
                 "port": self.args.port,
             },
         )
+
+    def _configure_socket(self, socket_path):
+        """Persist the configuration of a server listening on a Unix socket."""
+        if not PurePosixPath(socket_path).is_absolute():
+            logger.error(_(messages.SERVER_CONFIG_SOCKET_NOT_ABSOLUTE), socket_path)
+            sys.exit(1)
+        server_config = {
+            CONFIG_HOST_KEY: UNIX_SOCKET_HOST,
+            CONFIG_PORT_KEY: int(self.args.port),
+            CONFIG_USE_HTTP: True,
+            CONFIG_SSL_VERIFY: None,
+            CONFIG_SOCKET_KEY: socket_path,
+        }
+        self._write_server_config(server_config)
+        logger.info(_(messages.SERVER_CONFIG_SOCKET_SUCCESS), {"socket": socket_path})
+
+    def _write_server_config(self, server_config):
+        """Persist server_config along with the options shared by all servers."""
+        if self.args.max_concurrency is not None:
+            server_config[CONFIG_MAX_CONCURRENCY_KEY] = self.args.max_concurrency
+        if self.args.short_timeout is not None:
+            server_config[CONFIG_SHORT_TIMEOUT_KEY] = self.args.short_timeout
+        if self.args.long_timeout is not None:
+            server_config[CONFIG_LONG_TIMEOUT_KEY] = self.args.long_timeout
+        if self.args.http2:
+            from qpc.http2 import http2_available  # noqa: PLC0415
+
+            if not http2_available():
+                logger.error(_(messages.SERVER_CONFIG_HTTP2_UNAVAILABLE))
+                sys.exit(1)
+            server_config[CONFIG_HTTP2_KEY] = True
+        if self.args.response_cache:
+            server_config[CONFIG_RESPONSE_CACHE_KEY] = True
+        write_server_config(server_config)
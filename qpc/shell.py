@@ -0,0 +1,190 @@
+"""Interactive shell running qpc commands in a single process."""
+
+import argparse
+import cmd
+import shlex
+
+from qpc import messages, request
+from qpc.cli import CLI, COMMANDS
+from qpc.release import QPC_VAR_PROGRAM_NAME
+from qpc.translation import _
+from qpc.utils import logger
+
+# Seconds for which the name to id lookups of a command are reused by the
+# following ones, unless a command changes objects on the server.
+NAME_LOOKUP_TTL = 60
+EXIT_COMMANDS = ("exit", "quit")
+
+
+def _option_strings(parser):
+    """Return the option strings of parser that are listed in its help."""
+    return [
+        option_string
+        for option_string, action in parser._option_string_actions.items()
+        if action.help != argparse.SUPPRESS
+    ]
+
+
+class QPCShell(cmd.Cmd):
+    """Run qpc commands read from the terminal, keeping their state warm.
+
+    Each line is parsed by CLI like the arguments of qpc, so the shell has
+    the grammar of the command line. As every command runs in this process,
+    the client configuration and token, the HTTP session and its connections
+    and the recent name lookups are reused from one command to the next.
+    """
+
+    prompt = f"{QPC_VAR_PROGRAM_NAME}> "
+    # set while a shell runs, so commands cannot start another one
+    running = False
+
+    def __init__(self, options=(), **kwargs):
+        """Create the shell.
+
+        :param options: options of the main parser given before the shell
+            subcommand, applied to every command
+        """
+        super().__init__(**kwargs)
+        self.options = list(options)
+        self.intro = _(messages.SHELL_INTRO) % QPC_VAR_PROGRAM_NAME
+        # the options of one command must not carry over to the next
+        self.request_settings = request.save_request_settings()
+        self.cli = CLI(argv=[])
+
+    def cmdloop(self, intro=None):
+        """Read and run commands until exit, Ctrl-D or end of input."""
+        if QPCShell.running:
+            logger.error(_(messages.SHELL_NESTED))
+            return
+        QPCShell.running = True
+        try:
+            while True:
+                try:
+                    super().cmdloop(intro)
+                    break
+                except KeyboardInterrupt:
+                    # Ctrl-C discards the line being typed
+                    print()
+                    intro = ""
+        finally:
+            QPCShell.running = False
+
+    def preloop(self):
+        """Complete options such as --name as a whole word."""
+        try:
+            import readline  # noqa: PLC0415
+        except ImportError:
+            return
+        readline.set_completer_delims(" \t\n")
+
+    def run_command(self, argv):
+        """Run the qpc command of argv and return once it completed or failed.
+
+        Commands report their errors and exit through sys.exit() as when run
+        by qpc; SystemExit is caught here, as are interruptions and the errors
+        a command did not handle, so the shell keeps running.
+
+        :param argv: arguments of the command, without the program name
+        """
+        request.restore_request_settings(self.request_settings)
+        try:
+            CLI(argv=[*self.options, *argv]).main()
+        except SystemExit:
+            pass
+        except KeyboardInterrupt:
+            print()
+        except Exception as error:  # noqa: BLE001
+            logger.error(_(messages.SHELL_COMMAND_FAILED), error)
+            logger.debug("Traceback of the failed command", exc_info=True)
+        finally:
+            request.expire_coalesced_requests(NAME_LOOKUP_TTL)
+
+    def default(self, line):
+        """Run line as a qpc command."""
+        try:
+            argv = shlex.split(line)
+        except ValueError as error:
+            logger.error(_(messages.SHELL_SYNTAX_ERROR), error)
+            return
+        self.run_command(argv)
+
+    def emptyline(self):
+        """Do nothing, instead of running the previous command again."""
+
+    def do_help(self, arg):
+        """Show the help of qpc, or of the command named by arg."""
+        self.run_command([*shlex.split(arg), "--help"])
+
+    def do_exit(self, arg):
+        """Leave the shell."""
+        return True
+
+    do_quit = do_exit
+
+    def do_EOF(self, arg):
+        """Leave the shell at the end of input."""
+        print()
+        return True
+
+    def completenames(self, text, *ignored):
+        """Complete the first word of a line."""
+        names = [*COMMANDS, "help", *EXIT_COMMANDS]
+        if text.startswith("-"):
+            names = _option_strings(self.cli.parser)
+        return [name for name in names if name.startswith(text)]
+
+    def completedefault(self, text, line, begidx, endidx):
+        """Complete the words following the subcommand."""
+        try:
+            words = shlex.split(line[:begidx])
+        except ValueError:
+            return []
+        return self.complete_command(words, text)
+
+    def complete_help(self, text, line, begidx, endidx):
+        """Complete the command named after help."""
+        try:
+            words = shlex.split(line[:begidx])[1:]
+        except ValueError:
+            return []
+        return [
+            completion
+            for completion in self.complete_command(words, text)
+            if not completion.startswith("-")
+        ]
+
+    def complete_command(self, words, text):
+        """Return the completions of text following the words of a command.
+
+        :param words: complete words of the command line before text
+        :param text: start of the word to complete
+        :returns: list of the subcommands, actions, options or option choices
+            starting with text
+        """
+        words = self._command_words(words)
+        if not words:
+            return self.completenames(text)
+        subcommand, *words = words
+        actions = COMMANDS.get(subcommand, {})
+        if not words:
+            return [action for action in actions if action.startswith(text)]
+        action = words[0]
+        if action not in actions:
+            return []
+        parser = CLI(argv=[subcommand, action]).subcommands[subcommand][action].parser
+        option = parser._option_string_actions.get(words[-1])
+        if option is not None and option.nargs != 0:
+            choices = [str(choice) for choice in option.choices or ()]
+            return [choice for choice in choices if choice.startswith(text)]
+        return [
+            option_string
+            for option_string in _option_strings(parser)
+            if option_string.startswith(text) and option_string.startswith("-")
+        ]
+
+    def _command_words(self, words):
+        """Drop the options of the main parser and their values from words."""
+        index = 0
+        while index < len(words) and words[index].startswith("-"):
+            index += 2 if self.cli._option_value_follows(words[index]) else 1
+        return words[index:]
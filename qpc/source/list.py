@@ -23,6 +23,7 @@ class SourceListCommand(CliCommand):
 
     SUBCOMMAND = source.SUBCOMMAND
     ACTION = source.LIST
+    CACHEABLE = True
 
     def __init__(self, subparsers):
         """Create command."""
@@ -5,6 +5,7 @@ from unittest import mock
 import pytest
 
 from qpc.insights.http import InsightsClient
+from qpc.request import DEFAULT_TIMEOUTS, TIMEOUT_LONG, TIMEOUT_SHORT
 
 
 @mock.patch("requests.Session.request")
@@ -39,7 +40,9 @@ def test_request_joins_url_with_base_url(
 
     insights_client_session.request(method, url)
 
-    request_session_mocker.assert_called_with(method, full_url)
+    request_session_mocker.assert_called_with(
+        method, full_url, timeout=DEFAULT_TIMEOUTS[TIMEOUT_SHORT]
+    )
 
 
 @mock.patch("requests.Session.request")
@@ -78,7 +81,9 @@ def test_extra_args_are_passed_to_request(
 
     insights_client_session.request("post", url, args)
 
-    request_session_mocker.assert_called_with("post", full_url, args)
+    request_session_mocker.assert_called_with(
+        "post", full_url, args, timeout=DEFAULT_TIMEOUTS[TIMEOUT_SHORT]
+    )
 
 
 def test_auth():
@@ -86,3 +91,17 @@ def test_auth():
     test_token = "userJwt"
     client = InsightsClient(auth_token=test_token)
     assert client.headers["Authorization"] == f"Bearer {test_token}"
+
+
+@mock.patch("requests.Session.request")
+def test_request_uses_command_timeouts(request_session_mocker, monkeypatch):
+    """Test requests wait for the timeouts of the command class by default."""
+    monkeypatch.setattr("qpc.request.timeout_class", TIMEOUT_LONG)
+    InsightsClient().request("post", "https://console.redhat.com/")
+    request_session_mocker.assert_called_with(
+        "post", "https://console.redhat.com/", timeout=DEFAULT_TIMEOUTS[TIMEOUT_LONG]
+    )
+    InsightsClient().request("post", "https://console.redhat.com/", timeout=5)
+    request_session_mocker.assert_called_with(
+        "post", "https://console.redhat.com/", timeout=5
+    )
@@ -5,13 +5,13 @@ import secrets
 import pytest
 
 from qpc import utils
-from qpc.insights.exceptions import QPCEncryptionKeyError
-from qpc.utils import (
+from qpc.encryption import (
     decrypt_password,
     encrypt_password,
     load_encryption_key,
     write_encryption_key_if_non_existent,
 )
+from qpc.insights.exceptions import QPCEncryptionKeyError
 
 
 def test_insights_encryption_file_is_created():
@@ -1,9 +1,14 @@
 """Test the CLI module."""
 
+import base64
+import hashlib
+import io
+import json
 import logging
 import sys
+import tarfile
 from argparse import ArgumentParser, Namespace
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from unittest.mock import patch
 
 import pytest
@@ -13,6 +18,7 @@ from qpc import messages
 from qpc.cli import CLI
 from qpc.report import REPORT_URI
 from qpc.report.download import ReportDownloadCommand
+from qpc.request import QPCResponse
 from qpc.scan import SCAN_JOB_URI
 from qpc.utils import QPC_MIN_SERVER_VERSION, create_tar_buffer, get_server_location
 
@@ -170,7 +176,7 @@ class TestReportDownload:
                 )
                 assert err_msg in caplog.text
 
-    @patch("qpc.report.download.write_file")
+    @patch("qpc.report.download.write_file_chunks")
     def test_file_fails_to_write(self, file, caplog, fake_tarball):
         """Testing download failure while writing to file."""
         err = "Mock Fail"
@@ -258,3 +264,219 @@ class TestReportDownload:
                     self.command.main(args)
                 err_msg = messages.OUTPUT_FILE_TYPE % "tar.gz"
                 assert err_msg in caplog.text
+
+
+def _report_tarball(files, manifest=None):
+    """Build a report tarball, optionally with a SHA256SUM manifest."""
+    files = dict(files)
+    if manifest is None:
+        manifest = {
+            name: hashlib.sha256(content).hexdigest() for name, content in files.items()
+        }
+    if manifest:
+        files["report_id_1/SHA256SUM"] = "".join(
+            f"{digest}  {PurePosixPath(name).name}\n"
+            for name, digest in manifest.items()
+        ).encode()
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+REPORT_FILES = {"report_id_1/details.json": b'{"id": 1}' * 500}
+
+
+class _InterruptedBody(io.BytesIO):
+    """Response body that drops the connection after a number of bytes."""
+
+    def __init__(self, content, fail_after):
+        super().__init__(content)
+        self.fail_after = fail_after
+
+    def read(self, size=-1):
+        if self.tell() >= self.fail_after:
+            raise ConnectionResetError("connection lost")
+        if size is None or size < 0:
+            size = self.fail_after - self.tell()
+        return super().read(min(size, self.fail_after - self.tell()))
+
+
+@pytest.fixture
+def download_command():
+    """Return a report download command."""
+    subparser = ArgumentParser().add_subparsers(dest="subcommand")
+    return ReportDownloadCommand(subparser)
+
+
+@pytest.fixture
+def report_url(server_config):
+    """Return the url of report 1."""
+    return get_server_location() + REPORT_URI + "1"
+
+
+def _write_part(tmp_path, content, report="1", validator='"r1"'):
+    """Leave a .part file as an interrupted download of report would."""
+    (tmp_path / "report.tar.gz.part").write_bytes(content)
+    if report is not None:
+        (tmp_path / "report.tar.gz.part.json").write_text(
+            json.dumps({"report": report, "validator": validator})
+        )
+
+
+def test_download_resumes_part_file(
+    download_command, report_url, requests_mock, tmp_path
+):
+    """Test a .part file left by an earlier run is completed with a Range request."""
+    content = _report_tarball(REPORT_FILES)
+    output = tmp_path / "report.tar.gz"
+    _write_part(tmp_path, content[:100])
+    requests_mock.get(
+        report_url,
+        status_code=206,
+        content=content[100:],
+        headers={"Content-Range": f"bytes 100-{len(content) - 1}/{len(content)}"},
+    )
+    download_command.main(Namespace(scan_job_id=None, report_id="1", path=str(output)))
+    assert requests_mock.last_request.headers["Range"] == "bytes=100-"
+    assert requests_mock.last_request.headers["If-Range"] == '"r1"'
+    assert output.read_bytes() == content
+    assert not (tmp_path / "report.tar.gz.part").exists()
+    assert not (tmp_path / "report.tar.gz.part.json").exists()
+
+
+@pytest.mark.parametrize(
+    "part_info",
+    [("2", '"r1"'), ("1", None), (None, None)],
+    ids=["other-report", "no-validator", "no-record"],
+)
+def test_download_does_not_resume_unknown_part_file(
+    download_command, report_url, requests_mock, tmp_path, part_info
+):
+    """Test a .part file that may hold another report is downloaded again."""
+    content = _report_tarball(REPORT_FILES)
+    output = tmp_path / "report.tar.gz"
+    _write_part(tmp_path, b"x" * 100, *part_info)
+    requests_mock.get(report_url, content=content, headers={"ETag": '"r2"'})
+    download_command.main(Namespace(scan_job_id=None, report_id="1", path=str(output)))
+    assert "Range" not in requests_mock.last_request.headers
+    assert output.read_bytes() == content
+
+
+def test_download_resumes_after_interruption(
+    download_command, report_url, requests_mock, tmp_path, mocker
+):
+    """Test a transfer cut off midway is resumed from where it stopped."""
+    iter_chunks = QPCResponse.iter_chunks
+    # small chunks, so the bytes read before the connection drops are written
+    mocker.patch.object(
+        QPCResponse,
+        "iter_chunks",
+        lambda response: iter_chunks(response, chunk_size=100),
+    )
+    content = _report_tarball(REPORT_FILES)
+    output = tmp_path / "report.tar.gz"
+    requests_mock.get(
+        report_url,
+        [
+            {
+                "status_code": 200,
+                "body": _InterruptedBody(content, 200),
+                "headers": {"ETag": '"r1"'},
+            },
+            {
+                "status_code": 206,
+                "content": content[200:],
+                "headers": {
+                    "Content-Range": f"bytes 200-{len(content) - 1}/{len(content)}"
+                },
+            },
+        ],
+    )
+    download_command.main(Namespace(scan_job_id=None, report_id="1", path=str(output)))
+    resumed = requests_mock.last_request.headers
+    assert resumed["Range"] == "bytes=200-"
+    assert resumed["If-Range"] == '"r1"'
+    assert output.read_bytes() == content
+
+
+def test_download_restarts_when_range_ignored(
+    download_command, report_url, requests_mock, tmp_path
+):
+    """Test a 200 answer to a Range request replaces the .part file."""
+    content = _report_tarball(REPORT_FILES)
+    output = tmp_path / "report.tar.gz"
+    _write_part(tmp_path, b"stale bytes")
+    requests_mock.get(report_url, status_code=200, content=content)
+    download_command.main(Namespace(scan_job_id=None, report_id="1", path=str(output)))
+    assert requests_mock.last_request.headers["If-Range"] == '"r1"'
+    assert output.read_bytes() == content
+
+
+def test_download_complete_part_file(
+    download_command, report_url, requests_mock, tmp_path
+):
+    """Test a 416 answer for a complete .part file finishes the download."""
+    content = _report_tarball(REPORT_FILES)
+    output = tmp_path / "report.tar.gz"
+    _write_part(tmp_path, content)
+    requests_mock.get(
+        report_url,
+        status_code=416,
+        headers={"Content-Range": f"bytes */{len(content)}"},
+    )
+    download_command.main(Namespace(scan_job_id=None, report_id="1", path=str(output)))
+    assert output.read_bytes() == content
+
+
+def _repr_digest(algorithm, content):
+    digest = hashlib.new(algorithm.replace("-", ""), content).digest()
+    return f"{algorithm}=:{base64.b64encode(digest).decode()}:"
+
+
+@pytest.mark.parametrize("algorithm", ["sha-256", "sha-512"])
+def test_download_verifies_repr_digest(
+    download_command, report_url, requests_mock, tmp_path, algorithm
+):
+    """Test the download is checked against the server's Repr-Digest."""
+    content = _report_tarball(REPORT_FILES, manifest={})
+    headers = {"Repr-Digest": _repr_digest(algorithm, content)}
+    requests_mock.get(report_url, content=content, headers=headers)
+    output = tmp_path / "report.tar.gz"
+    download_command.main(Namespace(scan_job_id=None, report_id="1", path=str(output)))
+    assert output.read_bytes() == content
+
+
+def test_download_rejects_repr_digest_mismatch(
+    download_command, report_url, requests_mock, tmp_path, caplog
+):
+    """Test a download that does not match the Repr-Digest is removed."""
+    content = _report_tarball(REPORT_FILES, manifest={})
+    headers = {"Repr-Digest": _repr_digest("sha-256", content + b"x")}
+    requests_mock.get(report_url, content=content, headers=headers)
+    output = tmp_path / "report.tar.gz"
+    with pytest.raises(SystemExit):
+        download_command.main(
+            Namespace(scan_job_id=None, report_id="1", path=str(output))
+        )
+    assert not output.exists()
+    assert not (tmp_path / "report.tar.gz.part").exists()
+    assert "does not match its checksum" in caplog.text
+
+
+def test_download_verifies_manifest(
+    download_command, report_url, requests_mock, tmp_path, caplog
+):
+    """Test the download is checked against the SHA256SUM in the tarball."""
+    manifest = {"report_id_1/details.json": "0" * 64}
+    requests_mock.get(report_url, content=_report_tarball(REPORT_FILES, manifest))
+    output = tmp_path / "report.tar.gz"
+    with pytest.raises(SystemExit):
+        download_command.main(
+            Namespace(scan_job_id=None, report_id="1", path=str(output))
+        )
+    assert not output.exists()
+    assert "does not match its checksum" in caplog.text
@@ -158,7 +158,7 @@ class TestReportInsights:
                         == messages.REPORT_NO_DEPLOYMENTS_REPORT_FOR_SJ
                     )
 
-    @patch("qpc.report.insights.write_file")
+    @patch("qpc.report.insights.write_file_chunks")
     def test_insights_file_fails_to_write(self, file, caplog, fake_tarball):
         """Testing insights failure while writing to file."""
         file.side_effect = EnvironmentError()
@@ -1,6 +1,8 @@
 """Test the CLI report list subcommand."""
 
 import json
+import os
+import subprocess
 import sys
 from argparse import ArgumentParser, Namespace
 from io import StringIO
@@ -11,6 +13,7 @@ import requests_mock
 from qpc.cli import CLI
 from qpc.report import REPORT_V2_URI
 from qpc.report.list import ReportListCommand
+from qpc.tests.stub_server import StubServer, json_response
 from qpc.tests.utilities import redirect_stdout
 from qpc.utils import QPC_MIN_SERVER_VERSION, get_server_location
 
@@ -88,3 +91,33 @@ def test_list_report_as_json(
     CLI().main()
     captured = capsys.readouterr()
     assert json.loads(captured.out)
+
+
+def test_list_report_does_not_load_cryptography(tmp_path):
+    """Test commands not handling secrets do not import cryptography."""
+    reports = json_response(
+        {"count": 0, "next": None, "results": []},
+        headers={"X-Server-Version": QPC_MIN_SERVER_VERSION},
+    )
+    config_dir = tmp_path / ".config" / "qpc"
+    config_dir.mkdir(parents=True)
+    (config_dir / "client_token").write_text(json.dumps({"token": "abc"}))
+    code = (
+        "import sys\n"
+        "from qpc.__main__ import main\n"
+        "sys.argv = ['qpc', 'report', 'list']\n"
+        "main()\n"
+        "print('cryptography' in sys.modules)\n"
+    )
+    with StubServer({"*": lambda handler, body: reports}) as stub:
+        server_config = {"host": "127.0.0.1", "port": stub.port, "use_http": True}
+        (config_dir / "server.config").write_text(json.dumps(server_config))
+        completed = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "HOME": str(tmp_path)},
+        )
+        assert stub.request_count == 1
+    assert completed.stdout.splitlines()[-1] == "False"
@@ -174,6 +174,51 @@ class TestReportMergeTests:
             self.command.main(args)
         assert caplog.messages[-1] == "SOME SERVER ERROR."
 
+    def test_detail_merge_job_not_found(self, requests_mock, caplog):
+        """Testing report merge with a scan job the server does not know."""
+        requests_mock.get(
+            get_server_location() + SCAN_JOB_URI + "1/",
+            status_code=200,
+            json={"report_id": 1},
+        )
+        requests_mock.get(
+            get_server_location() + SCAN_JOB_URI + "2/",
+            status_code=404,
+            json={"detail": "Not found."},
+        )
+
+        args = Namespace(
+            scan_job_ids=[1, 2], json_files=None, report_ids=None, json_dir=None
+        )
+        caplog.set_level(logging.ERROR)
+        with pytest.raises(SystemExit):
+            self.command.main(args)
+        assert caplog.messages[-1] == messages.REPORT_SJS_DO_NOT_EXIST % [2]
+
+    @pytest.mark.parametrize(
+        "status_code,expected",
+        [(500, messages.SERVER_INTERNAL_ERROR), (403, "Error: SOME SERVER ERROR.")],
+    )
+    def test_detail_merge_job_lookup_error(
+        self, requests_mock, caplog, status_code, expected
+    ):
+        """Testing failed scan job lookups are reported once, not as not found."""
+        for scan_job_id in range(1, 4):
+            requests_mock.get(
+                get_server_location() + SCAN_JOB_URI + f"{scan_job_id}/",
+                status_code=status_code,
+                json={"detail": "SOME SERVER ERROR."},
+            )
+
+        args = Namespace(
+            scan_job_ids=[1, 2, 3], json_files=None, report_ids=None, json_dir=None
+        )
+        caplog.set_level(logging.ERROR)
+        with pytest.raises(SystemExit):
+            self.command.main(args)
+        assert caplog.messages.count(expected) == 1
+        assert "do not exist" not in caplog.text
+
     def test_detail_merge_report_ids(self, requests_mock, capsys):
         """Testing report merge command with report ids."""
         requests_mock.post(
@@ -1,5 +1,7 @@
 """Test the CLI module."""
 
+import gzip
+import json
 import logging
 from argparse import ArgumentParser, Namespace
 
@@ -10,7 +12,8 @@ from qpc import messages
 from qpc.release import QPC_VAR_PROGRAM_NAME
 from qpc.report import ASYNC_UPLOAD_URI
 from qpc.report.upload import ReportUploadCommand
-from qpc.utils import get_server_location
+from qpc.request import COMPRESSION_THRESHOLD
+from qpc.utils import QPC_MIN_SERVER_VERSION, get_server_location
 
 NONEXIST_FILE = "/tmp/does/not/exist/bad.json"
 
@@ -57,6 +60,28 @@ class TestReportUploadTests:
             }
             assert expected_message in captured_output.out
 
+    def test_upload_compresses_large_report(self, tmp_path):
+        """Test a large report is gzipped, though it is the first request sent."""
+        report = {"id": 4, "sources": [{"facts": ["A" * 100], "server_id": "8"}]}
+        report["sources"] *= COMPRESSION_THRESHOLD // 100
+        report_path = tmp_path / "large_details_report.json"
+        report_path.write_text(json.dumps(report))
+        upload_url = get_server_location() + ASYNC_UPLOAD_URI
+        with requests_mock.Mocker() as mocker:
+            mocker.options(
+                upload_url,
+                headers={
+                    "X-Server-Version": QPC_MIN_SERVER_VERSION,
+                    "Accept-Encoding": "gzip",
+                },
+            )
+            mocker.post(upload_url, status_code=201, json={"job_id": 1})
+            self.command.main(Namespace(json_file=str(report_path)))
+            sent = mocker.last_request
+        assert sent.headers["Content-Encoding"] == "gzip"
+        uploaded = json.loads(gzip.decompress(sent.body))
+        assert len(uploaded["sources"]) == len(report["sources"])
+
     def test_upload_bad_details_report(self, caplog, bad_details_report):
         """Test uploading a bad details report."""
         put_report_data = {"job_id": 1}
@@ -10,7 +10,7 @@ import requests_mock
 
 from qpc import messages
 from qpc.cli import CLI
-from qpc.request import CONNECTION_ERROR_MSG
+from qpc.request import CONNECTION_ERROR_MSG, configure_retries
 from qpc.scan import SCAN_URI
 from qpc.scan.add import ScanAddCommand
 from qpc.source import SOURCE_URI
@@ -81,6 +81,27 @@ class TestScanAddCli:
                 self.command.main(args)
             assert expected_error in caplog.text
 
+    def test_add_scan_conn_err_logged_once(self, caplog):
+        """Testing a connection error of several source lookups is logged once."""
+        expected_error = CONNECTION_ERROR_MSG % {
+            "host": DEFAULT_CONFIG["host"],
+            "port": DEFAULT_CONFIG["port"],
+            "protocol": "http",
+        }
+        # fewer failures than open the circuit breaker
+        configure_retries(0)
+        with requests_mock.Mocker() as mocker:
+            mocker.get(
+                get_server_location() + SOURCE_URI,
+                exc=requests.exceptions.ConnectionError,
+            )
+
+            args = Namespace(sources=["source1", "source2", "source3"])
+            with pytest.raises(SystemExit), caplog.at_level(logging.ERROR):
+                self.command.main(args)
+        assert caplog.messages.count(expected_error) == 1
+        assert "does not exist" not in caplog.text
+
     @pytest.mark.skip(
         reason=(
             "FIXME! This test seems reasonable, but ScanAddCommand._validate_args "
@@ -140,3 +140,32 @@ class TestScanClearCli(BulkClearTestsMixin):
             with pytest.raises(SystemExit), caplog.at_level(logging.ERROR):
                 self.command.main(args)
             assert expected in caplog.text
+
+    def test_clear_by_name_multiple_matches(self, caplog):
+        """Test clearing every scan matching a name, even if one delete fails."""
+        get_url = get_server_location() + SCAN_URI + "?name=scan1"
+        results = [
+            {"id": 1, "name": "scan1"},
+            {"id": 2, "name": "scan1"},
+            {"id": 3, "name": "scan1"},
+            {"id": 4, "name": "scan10"},
+        ]
+        data = {"count": len(results), "results": results}
+        with requests_mock.Mocker() as mocker:
+            mocker.get(get_url, status_code=200, json=data)
+            mocker.delete(get_server_location() + SCAN_URI + "1/", status_code=204)
+            mocker.delete(
+                get_server_location() + SCAN_URI + "2/",
+                status_code=400,
+                json={"detail": "scan in use"},
+            )
+            mocker.delete(get_server_location() + SCAN_URI + "3/", status_code=204)
+            args = Namespace(name="scan1")
+            with pytest.raises(SystemExit), caplog.at_level(logging.INFO):
+                self.command.main(args)
+            deleted_ids = [
+                req.path for req in mocker.request_history if req.method == "DELETE"
+            ]
+        assert sorted(deleted_ids) == [SCAN_URI + f"{i}/" for i in (1, 2, 3)]
+        assert messages.SCAN_FAILED_TO_REMOVE % "scan1" in caplog.text
+        assert caplog.text.count(messages.SCAN_REMOVED % "scan1") == 2
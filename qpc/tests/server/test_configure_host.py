@@ -8,7 +8,12 @@ import pytest
 from qpc import messages
 from qpc.cli import CLI
 from qpc.tests.utilities import HushUpStderr
-from qpc.utils import read_server_config, write_server_config
+from qpc.utils import (
+    get_client_config,
+    get_server_location,
+    read_server_config,
+    write_server_config,
+)
 
 DEFAULT_PORT = 9443
 
@@ -123,3 +128,116 @@ class TestConfigureHost:
         with pytest.raises(SystemExit):
             sys.argv = ["/bin/qpc", "cred"]
             CLI().main()
+
+    def test_config_server_unix_socket(self, caplog):
+        """Testing the configure server with a Unix socket location."""
+        sys.argv = [
+            "/bin/qpc",
+            "server",
+            "config",
+            "--host",
+            "unix:///run/quipucords/api.sock",
+        ]
+        with caplog.at_level(logging.INFO):
+            CLI().main()
+        config = read_server_config()
+        assert config["socket"] == "/run/quipucords/api.sock"
+        assert get_server_location() == "http+unix://%2Frun%2Fquipucords%2Fapi.sock"
+        expected_message = messages.SERVER_CONFIG_SOCKET_SUCCESS % {
+            "socket": "/run/quipucords/api.sock"
+        }
+        assert expected_message in caplog.text
+
+    def test_config_server_relative_unix_socket(self):
+        """Testing the configure server rejects a relative socket path."""
+        sys.argv = ["/bin/qpc", "server", "config", "--host", "unix://api.sock"]
+        with pytest.raises(SystemExit):
+            CLI().main()
+
+    def test_config_server_max_concurrency(self):
+        """Testing the configure server with a concurrency ceiling."""
+        sys.argv = [
+            "/bin/qpc",
+            "server",
+            "config",
+            "--host",
+            "127.0.0.1",
+            "--max-concurrency",
+            "32",
+        ]
+        CLI().main()
+        assert read_server_config()["max_concurrency"] == 32
+        assert get_client_config().max_concurrency == 32
+
+    @pytest.mark.parametrize("max_concurrency", ["0", "-1", "many"])
+    def test_config_server_invalid_max_concurrency(self, max_concurrency):
+        """Testing the configure server rejects a ceiling below one."""
+        sys.argv = [
+            "/bin/qpc",
+            "server",
+            "config",
+            "--host",
+            "127.0.0.1",
+            "--max-concurrency",
+            max_concurrency,
+        ]
+        with pytest.raises(SystemExit):
+            CLI().main()
+
+    def test_config_server_http2(self):
+        """Testing the configure server with HTTP/2."""
+        sys.argv = ["/bin/qpc", "server", "config", "--host", "127.0.0.1", "--http2"]
+        CLI().main()
+        assert read_server_config()["http2"] is True
+        assert get_client_config().http2
+
+    def test_config_server_response_cache(self):
+        """Testing the configure server opting in to the response cache."""
+        sys.argv = ["/bin/qpc", "server", "config", "--host", "127.0.0.1"]
+        CLI().main()
+        assert not get_client_config().response_cache
+        sys.argv.append("--response-cache")
+        CLI().main()
+        assert read_server_config()["response_cache"] is True
+        assert get_client_config().response_cache
+
+    def test_config_server_http2_unavailable(self, monkeypatch):
+        """Testing the configure server rejects HTTP/2 without httpx and h2."""
+        monkeypatch.setattr("qpc.http2.http2_available", lambda: False)
+        sys.argv = ["/bin/qpc", "server", "config", "--host", "127.0.0.1", "--http2"]
+        with pytest.raises(SystemExit):
+            CLI().main()
+        assert "http2" not in (read_server_config() or {})
+
+    def test_config_server_timeouts(self):
+        """Testing the configure server with timeouts per command class."""
+        sys.argv = [
+            "/bin/qpc",
+            "server",
+            "config",
+            "--host",
+            "127.0.0.1",
+            "--short-timeout",
+            "2,30",
+            "--long-timeout",
+            "900",
+        ]
+        CLI().main()
+        config = get_client_config()
+        assert config.timeout("short_timeout") == (2, 30)
+        assert config.timeout("long_timeout") == (900, 900)
+
+    @pytest.mark.parametrize("timeout", ["0", "5,0", "1,2,3", "5,"])
+    def test_config_server_invalid_timeout(self, timeout):
+        """Testing the configure server rejects invalid timeouts."""
+        sys.argv = [
+            "/bin/qpc",
+            "server",
+            "config",
+            "--host",
+            "127.0.0.1",
+            "--short-timeout",
+            timeout,
+        ]
+        with pytest.raises(SystemExit):
+            CLI().main()
@@ -0,0 +1,365 @@
+"""Local stub of a quipucords server used by the qpc tests and benchmarks.
+
+The stub speaks HTTP/1.1 with keep-alive (optionally over TLS, or on a Unix
+domain socket), or HTTP/2 over TLS, and counts accepted connections, so
+benchmarks can show how many handshakes a client performed. Routes map a
+path to a callable returning a ``StubResponse``.
+"""
+
+import datetime
+import http.server
+import json
+import socket
+import socketserver
+import ssl
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+
+
+@dataclass
+class StubResponse:
+    """Canned response served by the stub.
+
+    body is either bytes or an iterable of bytes; the latter is sent with
+    chunked transfer encoding as it is produced.
+    """
+
+    status: int = 200
+    body: bytes = b"{}"
+    headers: dict = field(default_factory=lambda: {"Content-Type": "application/json"})
+
+
+def json_response(data, status=200, headers=None):
+    """Build a StubResponse holding a JSON document."""
+    response_headers = {"Content-Type": "application/json"}
+    response_headers.update(headers or {})
+    return StubResponse(status, json.dumps(data).encode(), response_headers)
+
+
+def _route(server, handler, body):
+    """Return the StubResponse of the route handler.path leads to."""
+    path = handler.path.split("?", 1)[0]
+    route = server.routes.get(path) or server.routes.get("*")
+    with server.lock:
+        server.request_count += 1
+    if route is None:
+        return StubResponse(404, b'{"detail": "Not found."}')
+    return route(handler, body)
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connection_count += 1
+
+    def _dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        response = _route(self.server, self, body)
+        self.send_response(response.status)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        if not isinstance(response.body, bytes):
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in response.body:
+                if chunk:
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        if "Content-Length" not in response.headers:
+            self.send_header("Content-Length", str(len(response.body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(response.body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _dispatch
+
+    def log_message(self, format, *args):  # noqa: A002
+        """Keep test and benchmark output clean."""
+
+
+class _UnixHandler(_Handler):
+    # TCP_NODELAY does not apply to Unix sockets
+    disable_nagle_algorithm = False
+
+
+class _Http2Handler(socketserver.BaseRequestHandler):
+    """Serve one HTTP/2 connection, answering each stream on its own thread.
+
+    Routes receive a handler with the path, command and headers attributes
+    of the HTTP/1.1 handler.
+    """
+
+    def setup(self):
+        import h2.config  # noqa: PLC0415
+        import h2.connection  # noqa: PLC0415
+
+        with self.server.lock:
+            self.server.connection_count += 1
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, True)
+        self.connection = h2.connection.H2Connection(
+            h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        )
+        # guards the connection; notified when the peer opens its window
+        self.condition = threading.Condition()
+        self.closed = False
+
+    def _flush(self):
+        data = self.connection.data_to_send()
+        if data:
+            self.request.sendall(data)
+
+    def handle(self):
+        from h2 import events  # noqa: PLC0415
+
+        streams = {}
+        with self.condition:
+            self.connection.initiate_connection()
+            self._flush()
+        while True:
+            data = self.request.recv(65536)
+            if not data:
+                break
+            with self.condition:
+                received = self.connection.receive_data(data)
+                for event in received:
+                    if isinstance(event, events.RequestReceived):
+                        streams[event.stream_id] = (dict(event.headers), bytearray())
+                    elif isinstance(event, events.DataReceived):
+                        streams[event.stream_id][1].extend(event.data)
+                        self.connection.acknowledge_received_data(
+                            event.flow_controlled_length, event.stream_id
+                        )
+                    elif isinstance(event, events.StreamEnded):
+                        headers, body = streams.pop(event.stream_id)
+                        threading.Thread(
+                            target=self._respond,
+                            args=(event.stream_id, headers, bytes(body)),
+                            daemon=True,
+                        ).start()
+                self._flush()
+                self.condition.notify_all()
+                if any(isinstance(e, events.ConnectionTerminated) for e in received):
+                    break
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def _respond(self, stream_id, headers, body):
+        handler = SimpleNamespace(
+            path=headers[":path"], command=headers[":method"], headers=headers
+        )
+        response = _route(self.server, handler, body)
+        chunks = [response.body] if isinstance(response.body, bytes) else response.body
+        with self.condition:
+            if self.closed:
+                return
+            self.connection.send_headers(
+                stream_id,
+                [(":status", str(response.status)), *response.headers.items()],
+            )
+            self._flush()
+        for body_chunk in chunks:
+            chunk = body_chunk
+            while chunk:
+                with self.condition:
+                    self.condition.wait_for(
+                        lambda: (
+                            self.closed
+                            or self.connection.local_flow_control_window(stream_id) > 0
+                        )
+                    )
+                    if self.closed:
+                        return
+                    size = min(
+                        len(chunk),
+                        self.connection.local_flow_control_window(stream_id),
+                        self.connection.max_outbound_frame_size,
+                    )
+                    self.connection.send_data(stream_id, chunk[:size])
+                    self._flush()
+                chunk = chunk[size:]
+        with self.condition:
+            if not self.closed:
+                self.connection.end_stream(stream_id)
+                self._flush()
+
+
+class _ThreadingServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def get_request(self):
+        request, _address = super().get_request()
+        # BaseHTTPRequestHandler expects a (host, port) client address
+        return request, ("unix", 0)
+
+
+def _self_signed_cert(directory):
+    """Write a throwaway self-signed certificate and key into directory."""
+    from cryptography import x509  # noqa: PLC0415
+    from cryptography.hazmat.primitives import hashes, serialization  # noqa: PLC0415
+    from cryptography.hazmat.primitives.asymmetric import ec  # noqa: PLC0415
+    from cryptography.x509.oid import NameOID  # noqa: PLC0415
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    cert_path = Path(directory) / "cert.pem"
+    key_path = Path(directory) / "key.pem"
+    cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    return cert_path, key_path
+
+
+class StubServer:
+    """Run the stub server on a background thread.
+
+    Use as a context manager; ``url`` holds the base URL once started.
+    """
+
+    def __init__(self, routes=None, tls=False, unix_socket=None, http2=False):
+        self.routes = dict(routes or {})
+        self.tls = tls or http2
+        self.http2 = http2
+        self.unix_socket = unix_socket
+        self._server = None
+        self._thread = None
+        self._tmpdir = None
+
+    @property
+    def connection_count(self):
+        """Return how many TCP connections the stub has accepted."""
+        return self._server.connection_count
+
+    @property
+    def request_count(self):
+        """Return how many requests the stub has served."""
+        return self._server.request_count
+
+    @property
+    def port(self):
+        """Return the port the stub is listening on."""
+        return self._server.server_address[1]
+
+    @property
+    def url(self):
+        """Return the base URL of the stub."""
+        if self.unix_socket:
+            from qpc.unix_socket import socket_url  # noqa: PLC0415
+
+            return socket_url(self.unix_socket)
+        protocol = "https" if self.tls else "http"
+        return f"{protocol}://127.0.0.1:{self.port}"
+
+    def reset_counters(self):
+        """Reset connection and request counters."""
+        self._server.connection_count = 0
+        self._server.request_count = 0
+
+    def start(self):
+        """Start serving on an ephemeral port."""
+        if self.unix_socket:
+            server = _ThreadingUnixServer(str(self.unix_socket), _UnixHandler)
+        elif self.http2:
+            server = _ThreadingServer(("127.0.0.1", 0), _Http2Handler)
+        else:
+            server = _ThreadingServer(("127.0.0.1", 0), _Handler)
+        server.routes = self.routes
+        server.lock = threading.Lock()
+        server.connection_count = 0
+        server.request_count = 0
+        if self.tls:
+            self._tmpdir = tempfile.TemporaryDirectory()
+            cert_path, key_path = _self_signed_cert(self._tmpdir.name)
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(cert_path, key_path)
+            if self.http2:
+                context.set_alpn_protocols(["h2"])
+            # handshake on the connection thread, not serially in accept()
+            server.socket = context.wrap_socket(
+                server.socket, server_side=True, do_handshake_on_connect=False
+            )
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release resources."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self.unix_socket:
+            Path(self.unix_socket).unlink(missing_ok=True)
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+
+    def __enter__(self):
+        """Start the stub."""
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        """Stop the stub."""
+        self.stop()
+
+
+def configure_qpc(stub, directory):
+    """Point qpc's configuration at a scratch directory and at the stub.
+
+    :param stub: a started StubServer
+    :param directory: scratch directory to hold qpc's config and data files
+    """
+    from qpc import utils  # noqa: PLC0415
+
+    directory = Path(directory)
+    utils.CONFIG_DIR = directory / "config"
+    utils.DATA_DIR = directory / "data"
+    utils.QPC_LOG = utils.DATA_DIR / "qpc.log"
+    utils.QPC_SERVER_CONFIG = utils.CONFIG_DIR / "server.config"
+    utils.QPC_CLIENT_TOKEN = utils.CONFIG_DIR / "client_token"
+    utils.ensure_data_dir_exists()
+    if stub.unix_socket:
+        server_config = {
+            utils.CONFIG_HOST_KEY: "localhost",
+            utils.CONFIG_PORT_KEY: 0,
+            utils.CONFIG_USE_HTTP: True,
+            utils.CONFIG_SOCKET_KEY: str(stub.unix_socket),
+        }
+    else:
+        server_config = {
+            utils.CONFIG_HOST_KEY: "127.0.0.1",
+            utils.CONFIG_PORT_KEY: stub.port,
+            utils.CONFIG_USE_HTTP: not stub.tls,
+            utils.CONFIG_SSL_VERIFY: False,
+        }
+    utils.write_server_config(server_config)
+    utils.write_client_token({utils.CLIENT_TOKEN_KEY: "benchmark"})
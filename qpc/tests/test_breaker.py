@@ -0,0 +1,119 @@
+"""Tests for the circuit breaker of the transport."""
+
+import logging
+
+import pytest
+import requests
+
+from qpc import messages, request
+from qpc.breaker import (
+    CLOSED,
+    FAILURE_THRESHOLD,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+from qpc.request import GET, log_circuit_summary, perform_request, request_many
+
+
+def _fail(breaker, times, status_code=None):
+    for _ in range(times):
+        breaker.before_request()
+        breaker.record(status_code)
+
+
+def test_circuit_opens_after_consecutive_failures():
+    """Test the circuit opens at the threshold and then skips requests."""
+    breaker = CircuitBreaker(threshold=3)
+    _fail(breaker, 2, 503)
+    assert breaker.state == CLOSED
+    _fail(breaker, 1)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    assert breaker.failed == 3
+    assert breaker.skipped == 1
+
+
+def test_success_resets_failure_count():
+    """Test only consecutive failures count, and client errors are not failures."""
+    breaker = CircuitBreaker(threshold=3)
+    _fail(breaker, 2, 500)
+    breaker.record(404)
+    _fail(breaker, 2, 500)
+    assert breaker.state == CLOSED
+    assert breaker.completed == 1
+
+
+def test_half_open_probe_closes_circuit(caplog):
+    """Test a single probe goes through after the cool-down and closes it."""
+    breaker = CircuitBreaker(threshold=1, cooldown=0)
+    _fail(breaker, 1)
+    breaker.before_request()
+    assert breaker.state == HALF_OPEN
+    # other requests wait for the probe to answer
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    with caplog.at_level(logging.INFO):
+        breaker.record(200)
+    assert breaker.state == CLOSED
+    assert messages.CIRCUIT_CLOSED in caplog.messages
+
+
+def test_failed_probe_reopens_circuit():
+    """Test the circuit opens for another cool-down when the probe fails."""
+    breaker = CircuitBreaker(threshold=2, cooldown=60)
+    _fail(breaker, 2)
+    breaker.cooldown = 0
+    _fail(breaker, 1, 502)
+    assert breaker.state == OPEN
+    assert breaker.trip_count == 2
+
+
+def test_probe_without_outcome_lets_another_probe_through(
+    authenticated_client, requests_mock, monkeypatch
+):
+    """Test a probe raising before its outcome is recorded does not block others."""
+    breaker = CircuitBreaker(threshold=1, cooldown=0)
+    _fail(breaker, 1)
+    requests_mock.get(
+        "http://127.0.0.1:8000/api/v1/items/",
+        [{"exc": requests.exceptions.InvalidURL}, {"json": {}}],
+    )
+    monkeypatch.setattr(request, "circuit_breaker", breaker)
+    with pytest.raises(requests.exceptions.InvalidURL):
+        perform_request(GET, "http://127.0.0.1:8000/api/v1/items/")
+    assert breaker.state == HALF_OPEN
+    perform_request(GET, "http://127.0.0.1:8000/api/v1/items/")
+    assert breaker.state == CLOSED
+
+
+def test_request_many_skips_requests_once_open(
+    authenticated_client, requests_mock, caplog
+):
+    """Test a batch stops sending requests to a failing server."""
+    requests_mock.get("http://127.0.0.1:8000/api/v1/items/", status_code=503)
+    batch = [
+        {"method": GET, "path": "/api/v1/items/", "params": {"id": item}}
+        for item in range(10)
+    ]
+    results = request_many(batch, concurrency=1)
+    # the first request gets its last failed response once out of retries
+    assert results[0].response.status_code == 503
+    assert all(result.error for result in results[1:])
+    assert requests_mock.call_count == FAILURE_THRESHOLD
+    with caplog.at_level(logging.ERROR):
+        log_circuit_summary()
+    assert caplog.messages[-1] == messages.CIRCUIT_SUMMARY % {
+        "completed": 0,
+        "failed": FAILURE_THRESHOLD,
+        "skipped": 9,
+    }
+
+
+def test_no_summary_while_closed(caplog):
+    """Test nothing is logged when the circuit never opened."""
+    with caplog.at_level(logging.INFO):
+        log_circuit_summary()
+    assert not caplog.messages
@@ -0,0 +1,184 @@
+"""Tests for the on-disk response cache."""
+
+import os
+from argparse import ArgumentParser, Namespace
+
+import pytest
+import requests
+
+from qpc import cache, utils
+from qpc.cred import CREDENTIAL_URI
+from qpc.cred.list import CredListCommand
+from qpc.request import GET, forget_coalesced_requests, request
+from qpc.utils import get_client_config, get_server_location
+
+ETAG = '"v1"'
+
+
+def _response(body=b'{"count": 0}', status_code=200, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "http://127.0.0.1:8000/api/v1/credentials/"
+    response.headers.update(headers or {"ETag": ETAG})
+    response._content = body
+    return response
+
+
+@pytest.fixture
+def response_cache():
+    """Return the response cache in the patched data directory."""
+    return cache.get_response_cache()
+
+
+@pytest.fixture
+def enabled_cache(authenticated_client, monkeypatch):
+    """Opt in to the cache in server.config, as `server config --response-cache`."""
+    monkeypatch.setattr(cache, "cache_enabled", True)
+    utils.write_server_config(
+        {**utils.read_server_config(), utils.CONFIG_RESPONSE_CACHE_KEY: True}
+    )
+
+
+def test_cache_key_covers_params_server_and_token(authenticated_client):
+    """Test the cache key changes with the query string and identity."""
+    config = get_client_config()
+    url = get_server_location() + CREDENTIAL_URI
+    key = cache.cache_key(GET, url, {"cred_type": "network"}, config)
+    assert key == cache.cache_key(GET, url, {"cred_type": "network"}, config)
+    assert key != cache.cache_key(GET, url, {"cred_type": "vcenter"}, config)
+    other_token = utils.ClientConfig(config.server_config, "another-token")
+    assert key != cache.cache_key(GET, url, {"cred_type": "network"}, other_token)
+
+
+def test_put_and_get_round_trip(response_cache):
+    """Test a stored response can be rebuilt with its validators."""
+    headers = {"ETag": ETAG, "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    assert response_cache.put("key", _response(headers=headers))
+    entry = response_cache.get("key")
+    assert entry.validators() == {
+        "If-None-Match": ETAG,
+        "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+    }
+    response = entry.to_response()
+    assert response.status_code == 200
+    assert response.json() == {"count": 0}
+    assert utils.QPC_CACHE_DIR.stat().st_mode & 0o777 == 0o700
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        _response(headers={"Content-Type": "application/json"}),
+        _response(headers={"ETag": ETAG, "Cache-Control": "no-store"}),
+        _response(status_code=404),
+    ],
+)
+def test_put_skips_unrevalidatable_responses(response_cache, response):
+    """Test responses without validators, no-store or errors are not cached."""
+    assert not response_cache.put("key", response)
+    assert response_cache.get("key") is None
+
+
+def test_get_ignores_corrupted_entries(response_cache):
+    """Test a damaged metadata file behaves as a cache miss."""
+    response_cache.put("key", _response())
+    (utils.QPC_CACHE_DIR / "key.json").write_text("{not json")
+    assert response_cache.get("key") is None
+
+
+def test_evicts_least_recently_used(response_cache):
+    """Test the oldest entries are removed once the size bound is exceeded."""
+    for age, key in enumerate(["recent", "used", "old"]):
+        response_cache.put(key, _response(body=b"x" * 10))
+        mtime = 1_000_000 - age * 100
+        os.utime(utils.QPC_CACHE_DIR / f"{key}.json", (mtime, mtime))
+    # reading an entry marks it as recently used
+    assert response_cache.get("used") is not None
+    response_cache.max_bytes = 25
+    response_cache.put("new", _response(body=b"x" * 10))
+    assert response_cache.get("old") is None
+    assert response_cache.get("recent") is None
+    assert response_cache.get("used") is not None
+    assert response_cache.get("new") is not None
+
+
+def test_request_revalidates_cached_response(
+    authenticated_client, enabled_cache, requests_mock
+):
+    """Test a 304 answer is replaced by the cached body."""
+    url = get_server_location() + CREDENTIAL_URI
+    requests_mock.get(url, json={"count": 1}, headers={"ETag": ETAG})
+    assert request(GET, CREDENTIAL_URI, use_cache=True).json() == {"count": 1}
+
+    # as in a later qpc run, which does not share the first response
+    forget_coalesced_requests()
+    requests_mock.get(url, status_code=304, headers={"ETag": ETAG})
+    response = request(GET, CREDENTIAL_URI, use_cache=True)
+    assert requests_mock.last_request.headers["If-None-Match"] == ETAG
+    assert response.status_code == 200
+    assert response.json() == {"count": 1}
+
+
+def test_request_replaces_changed_response(
+    authenticated_client, enabled_cache, requests_mock
+):
+    """Test a new representation replaces the cached one."""
+    url = get_server_location() + CREDENTIAL_URI
+    requests_mock.get(url, json={"count": 1}, headers={"ETag": ETAG})
+    request(GET, CREDENTIAL_URI, use_cache=True)
+    forget_coalesced_requests()
+    requests_mock.get(url, json={"count": 2}, headers={"ETag": '"v2"'})
+    assert request(GET, CREDENTIAL_URI, use_cache=True).json() == {"count": 2}
+    forget_coalesced_requests()
+    request(GET, CREDENTIAL_URI, use_cache=True)
+    assert requests_mock.last_request.headers["If-None-Match"] == '"v2"'
+
+
+def test_request_without_use_cache(authenticated_client, enabled_cache, requests_mock):
+    """Test requests only use the cache when asked to."""
+    url = get_server_location() + CREDENTIAL_URI
+    requests_mock.get(url, json={"count": 1}, headers={"ETag": ETAG})
+    request(GET, CREDENTIAL_URI)
+    assert not utils.QPC_CACHE_DIR.exists()
+    request(GET, CREDENTIAL_URI, use_cache=True)
+    assert "If-None-Match" not in requests_mock.last_request.headers
+
+
+def test_cache_is_opt_in(authenticated_client, requests_mock):
+    """Test the cache is not used unless server.config enables it."""
+    assert not get_client_config().response_cache
+    url = get_server_location() + CREDENTIAL_URI
+    requests_mock.get(url, json={"count": 1}, headers={"ETag": ETAG})
+    request(GET, CREDENTIAL_URI, use_cache=True)
+    assert not utils.QPC_CACHE_DIR.exists()
+
+
+def test_no_cache_disables_cache(enabled_cache, monkeypatch, requests_mock):
+    """Test the cache is neither read nor written when disabled."""
+    monkeypatch.setattr(cache, "cache_enabled", False)
+    url = get_server_location() + CREDENTIAL_URI
+    requests_mock.get(url, json={"count": 1}, headers={"ETag": ETAG})
+    request(GET, CREDENTIAL_URI, use_cache=True)
+    request(GET, CREDENTIAL_URI, use_cache=True)
+    assert requests_mock.call_count == 2
+    assert "If-None-Match" not in requests_mock.last_request.headers
+    assert not utils.QPC_CACHE_DIR.exists()
+
+
+def test_cacheable_command_uses_cache(
+    authenticated_client, enabled_cache, requests_mock, capsys
+):
+    """Test `cred list` prints the cached credentials on a 304."""
+    parser = ArgumentParser()
+    command = CredListCommand(parser.add_subparsers(dest="subcommand"))
+    url = get_server_location() + CREDENTIAL_URI
+    data = {"count": 1, "results": [{"id": 1, "name": "cred1"}]}
+    requests_mock.get(url, json=data, headers={"ETag": ETAG})
+    command.main(Namespace())
+    first_output = capsys.readouterr().out
+
+    forget_coalesced_requests()
+    requests_mock.get(url, status_code=304)
+    command.main(Namespace())
+    assert capsys.readouterr().out == first_output
+    assert '"cred1"' in first_output
@@ -0,0 +1,118 @@
+"""Tests for recording and replaying server exchanges."""
+
+import json
+import time
+
+import pytest
+import requests
+import requests_mock
+
+from qpc import cassette, messages
+from qpc.request import GET, close_session, forget_coalesced_requests, request
+
+URL = "http://127.0.0.1:8000/api/v1/credentials/"
+
+
+@pytest.fixture
+def cassette_path(tmp_path):
+    """Return the path of a cassette file."""
+    return tmp_path / "cassette.jsonl"
+
+
+def _record(cassette_path, monkeypatch, responses):
+    """Record a GET of URL for each of responses into cassette_path."""
+    monkeypatch.setenv(cassette.RECORD_ENV, str(cassette_path))
+    session = requests.Session()
+    adapter = requests_mock.Adapter()
+    adapter.register_uri("GET", URL, responses)
+    session.mount("http://", adapter)
+    cassette.mount_cassette(session)
+    for _response in responses:
+        session.get(URL, params={"page": 1}, headers={"Authorization": "Token x"})
+    session.get(URL, params={"page": 2})
+    monkeypatch.delenv(cassette.RECORD_ENV)
+
+
+@pytest.fixture
+def replay(cassette_path, monkeypatch, authenticated_client):
+    """Replay cassette_path in the qpc session."""
+
+    def _replay(latency=None, bandwidth=None):
+        monkeypatch.setenv(cassette.REPLAY_ENV, str(cassette_path))
+        if latency is not None:
+            monkeypatch.setenv(cassette.LATENCY_ENV, str(latency))
+        if bandwidth is not None:
+            monkeypatch.setenv(cassette.BANDWIDTH_ENV, str(bandwidth))
+        close_session()
+
+    yield _replay
+    monkeypatch.delenv(cassette.REPLAY_ENV, raising=False)
+    close_session()
+
+
+def test_record_writes_one_line_per_exchange(cassette_path, monkeypatch):
+    """Test responses are recorded without request headers or cookies."""
+    _record(
+        cassette_path,
+        monkeypatch,
+        [{"json": {"count": 1}, "headers": {"Set-Cookie": "session=secret"}}],
+    )
+    interactions = [
+        json.loads(line) for line in cassette_path.read_text().split("\n")[:-1]
+    ]
+    assert [(i["method"], i["path"]) for i in interactions] == [
+        ("GET", "/api/v1/credentials/?page=1"),
+        ("GET", "/api/v1/credentials/?page=2"),
+    ]
+    assert json.loads(interactions[0]["body"]) == {"count": 1}
+    assert "secret" not in cassette_path.read_text()
+    assert "Token" not in cassette_path.read_text()
+
+
+def test_replay_serves_recorded_responses_in_order(cassette_path, monkeypatch, replay):
+    """Test repeated requests get the recorded responses, then the last one."""
+    _record(
+        cassette_path,
+        monkeypatch,
+        [{"json": {"count": 1}}, {"content": b"\xff\x00", "status_code": 202}],
+    )
+    replay()
+    # nothing listens on the server port: responses come from the cassette
+    assert request(GET, "/api/v1/credentials/", params={"page": 1}).json() == {
+        "count": 1
+    }
+    for _ in range(2):
+        forget_coalesced_requests()
+        response = request(GET, "/api/v1/credentials/", params={"page": 1})
+        assert response.status_code == 202
+        assert response.content == b"\xff\x00"
+
+
+def test_record_redacts_tokens(cassette_path, monkeypatch):
+    """Test the token of a login response is not recorded."""
+    _record(cassette_path, monkeypatch, [{"json": {"token": "secret", "id": 1}}])
+    interaction = json.loads(cassette_path.read_text().split("\n")[0])
+    assert json.loads(interaction["body"]) == {"token": cassette.REDACTED, "id": 1}
+    assert "secret" not in cassette_path.read_text()
+
+
+def test_replay_rejects_unrecorded_request(cassette_path, monkeypatch, replay, caplog):
+    """Test a request missing from the cassette is an error."""
+    _record(cassette_path, monkeypatch, [{"json": {}}])
+    replay()
+    with pytest.raises(SystemExit):
+        request(GET, "/api/v1/sources/")
+    assert (
+        messages.CASSETTE_NO_RESPONSE % {"method": GET, "path": "/api/v1/sources/"}
+        in caplog.text
+    )
+
+
+def test_replay_simulates_latency_and_bandwidth(cassette_path, monkeypatch, replay):
+    """Test replayed responses are delayed and read at the given bandwidth."""
+    _record(cassette_path, monkeypatch, [{"content": b"x" * 10_000}])
+    replay(latency=0.05, bandwidth=100_000)
+    start = time.monotonic()
+    response = request(GET, "/api/v1/credentials/", params={"page": 1})
+    assert len(response.content) == 10_000
+    assert time.monotonic() - start >= 0.15
@@ -1,11 +1,13 @@
 """Test the CLI module."""
 
+import os
+import subprocess
 import sys
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import pytest
 
-from qpc import cli
+from qpc import cache, cli, request
 from qpc.release import VERSION
 
 
@@ -31,3 +33,148 @@ def test_build_sha(capsys):
         cli.CLI().main()
     captured = capsys.readouterr()
     assert captured.out.strip() == expected_value
+
+
+def test_retries_option(authenticated_client):
+    """Test the `--retries` argument configures the retry policy."""
+    test_argv = ["/bin/qpc", "--retries", "5", "server", "status"]
+    with (
+        patch.object(sys, "argv", test_argv),
+        patch("qpc.server.status.ServerStatusCommand.main"),
+    ):
+        cli.CLI().main()
+    assert request.retry_policy.retries == 5
+
+
+def test_retries_option_rejects_negative(capsys):
+    """Test the `--retries` argument only accepts non-negative integers."""
+    test_argv = ["/bin/qpc", "--retries", "-1", "server", "status"]
+    with pytest.raises(SystemExit), patch.object(sys, "argv", test_argv):
+        cli.CLI().main()
+    assert "invalid non-negative int value" in capsys.readouterr().err
+
+
+def test_concurrency_option(authenticated_client):
+    """Test the `--concurrency` argument configures request_many."""
+    test_argv = ["/bin/qpc", "--concurrency", "8", "server", "status"]
+    try:
+        with (
+            patch.object(sys, "argv", test_argv),
+            patch("qpc.server.status.ServerStatusCommand.main"),
+        ):
+            cli.CLI().main()
+        assert request.request_concurrency == 8
+    finally:
+        request.set_concurrency(request.DEFAULT_CONCURRENCY)
+
+
+def test_concurrency_option_rejects_zero(capsys):
+    """Test the `--concurrency` argument only accepts positive integers."""
+    test_argv = ["/bin/qpc", "--concurrency", "0", "server", "status"]
+    with pytest.raises(SystemExit), patch.object(sys, "argv", test_argv):
+        cli.CLI().main()
+    assert "invalid positive int value" in capsys.readouterr().err
+
+
+def test_deadline_option(authenticated_client):
+    """Test the `--deadline` argument bounds the time left for the command."""
+    test_argv = ["/bin/qpc", "--deadline", "2.5", "server", "status"]
+    with (
+        patch.object(sys, "argv", test_argv),
+        patch("qpc.server.status.ServerStatusCommand.main"),
+    ):
+        cli.CLI().main()
+    assert 0 < request.remaining_time() <= 2.5
+
+
+@pytest.mark.parametrize("deadline", ["0", "-1", "nan", "soon"])
+def test_deadline_option_rejects_non_positive(capsys, deadline):
+    """Test the `--deadline` argument only accepts positive numbers."""
+    test_argv = ["/bin/qpc", "--deadline", deadline, "server", "status"]
+    with pytest.raises(SystemExit), patch.object(sys, "argv", test_argv):
+        cli.CLI().main()
+    assert "invalid positive number" in capsys.readouterr().err
+
+
+def test_no_cache_option(authenticated_client):
+    """Test the `--no-cache` argument disables the response cache."""
+    test_argv = ["/bin/qpc", "--no-cache", "server", "status"]
+    try:
+        with (
+            patch.object(sys, "argv", test_argv),
+            patch("qpc.server.status.ServerStatusCommand.main"),
+        ):
+            cli.CLI().main()
+        assert not cache.cache_enabled
+    finally:
+        cache.set_cache_enabled(True)
+
+
+@pytest.mark.parametrize(
+    "subcommand,action",
+    [(s, a) for s, actions in cli.COMMANDS.items() for a in actions],
+)
+def test_command_registry(subcommand, action):
+    """Test every registered path names the command of its subcommand and action."""
+    command = cli.load_command(subcommand, action)
+    assert (command.SUBCOMMAND, command.ACTION) == (subcommand, action)
+
+
+@pytest.mark.parametrize(
+    "argv,expected",
+    [
+        (["scan", "job", "--id", "5"], ("scan", "job")),
+        (["-vv", "--retries", "2", "--no-cache", "report", "list"], ("report", "list")),
+        (["--deadline=3", "cred", "add", "--name", "x"], ("cred", "add")),
+        (["scan"], None),
+        (["scan", "bogus"], None),
+        (["--retr", "2", "scan", "list"], None),
+        (["-vh", "scan", "list"], None),
+        (["scan", "--help", "list"], None),
+        (["scan", "list", "--help"], ("scan", "list")),
+    ],
+)
+def test_invoked_command(argv, expected):
+    """Test the command to build is found in the arguments, when plainly named."""
+    with patch.object(sys, "argv", ["/bin/qpc", *argv]):
+        built = cli.CLI()
+    assert built._invoked_command(argv) == expected
+    if expected:
+        subcommand, action = expected
+        assert built.subcommands == {subcommand: {action: ANY}}
+        # the other subcommands are still choices of the main parser
+        assert list(built.subparsers.choices) == [*cli.COMMANDS, cli.SHELL]
+    else:
+        assert built.subcommands == {
+            subcommand: dict.fromkeys(actions, ANY)
+            for subcommand, actions in cli.COMMANDS.items()
+        }
+
+
+def test_shell_builds_no_command():
+    """Test no command is built to start the shell, from the given arguments."""
+    argv = ["-v", "shell"]
+    with patch.object(sys, "argv", ["/bin/qpc", "scan", "list"]):
+        built = cli.CLI(argv=argv)
+    assert built._invoked_command(argv) == (None, None)
+    assert built.subcommands == {}
+    assert built.parser.parse_args(built.argv).subcommand == cli.SHELL
+
+
+def test_only_invoked_command_is_imported(tmp_path):
+    """Test the modules of the commands that do not run are not imported."""
+    code = (
+        "import sys\n"
+        "from qpc.cli import CLI\n"
+        "sys.argv = ['qpc', 'scan', 'job', '--id', '5']\n"
+        "CLI()\n"
+        "print(sorted(m for m in sys.modules if m.startswith('qpc.scan.')))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "HOME": str(tmp_path)},
+    )
+    assert completed.stdout.strip() == "['qpc.scan.job', 'qpc.scan.utils']"
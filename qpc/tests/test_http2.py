@@ -0,0 +1,103 @@
+"""Tests for the HTTP/2 transport."""
+
+import gzip
+import json
+import logging
+
+import pytest
+import requests
+
+from qpc import http2, messages, request
+from qpc.utils import (
+    CONFIG_HOST_KEY,
+    CONFIG_HTTP2_KEY,
+    CONFIG_PORT_KEY,
+    CONFIG_USE_HTTP,
+    write_client_token,
+    write_server_config,
+)
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("h2")
+
+
+@pytest.fixture
+def http2_config():
+    """Configure qpc for a server reached over HTTP/2."""
+    write_server_config(
+        {
+            CONFIG_HOST_KEY: "127.0.0.1",
+            CONFIG_PORT_KEY: 8000,
+            CONFIG_USE_HTTP: True,
+            CONFIG_HTTP2_KEY: True,
+        }
+    )
+    write_client_token({"token": "abc123"})
+    yield
+    request.close_session()
+
+
+@pytest.fixture
+def sent_requests(http2_config, monkeypatch):
+    """Answer the requests of the HTTP/2 adapter with a mock transport."""
+    sent = []
+
+    def handler(http_request):
+        sent.append(http_request)
+        if http_request.url.path == "/api/v1/unreachable/":
+            raise httpx.ConnectError("refused", request=http_request)
+        body = json.dumps({"path": str(http_request.url.raw_path, "ascii")})
+        return httpx.Response(
+            200,
+            content=gzip.compress(body.encode()),
+            headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+        )
+
+    def client(self, verify, cleartext):
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    monkeypatch.setattr(http2.Http2Adapter, "_client", client)
+    return sent
+
+
+def test_session_uses_http2_adapter(http2_config):
+    """Test the http2 flag of server.config selects the HTTP/2 transport."""
+    session = request.get_session()
+    assert isinstance(session.get_adapter("http://127.0.0.1:8000/"), http2.Http2Adapter)
+
+
+def test_session_follows_server_config(http2_config):
+    """Test the session is built again when the http2 flag is turned off."""
+    session = request.get_session()
+    assert request.get_session() is session
+    write_server_config(
+        {CONFIG_HOST_KEY: "127.0.0.1", CONFIG_PORT_KEY: 8000, CONFIG_USE_HTTP: True}
+    )
+    adapter = request.get_session().get_adapter("http://127.0.0.1:8000/")
+    assert isinstance(adapter, requests.adapters.HTTPAdapter)
+
+
+def test_session_falls_back_to_http1(http2_config, monkeypatch, caplog):
+    """Test HTTP/1.1 is used, with a warning, when httpx or h2 is missing."""
+    monkeypatch.setattr(http2, "http2_available", lambda: False)
+    with caplog.at_level(logging.WARNING):
+        session = request.get_session()
+    adapter = session.get_adapter("http://127.0.0.1:8000/")
+    assert isinstance(adapter, requests.adapters.HTTPAdapter)
+    assert messages.HTTP2_TRANSPORT_UNAVAILABLE in caplog.text
+
+
+def test_request_over_http2(sent_requests):
+    """Test requests go through httpx and responses come back decoded."""
+    response = request.request(request.GET, "/api/v1/credentials/", params={"a": 1})
+    assert response.status_code == 200
+    assert response.json() == {"path": "/api/v1/credentials/?a=1"}
+    assert "content-encoding" not in response.headers
+    assert sent_requests[0].headers["Authorization"] == "Token abc123"
+
+
+def test_http2_connection_error(sent_requests, caplog):
+    """Test transport errors are reported like those of the HTTP/1.1 session."""
+    with caplog.at_level(logging.ERROR), pytest.raises(SystemExit):
+        request.request(request.GET, "/api/v1/unreachable/")
+    assert len(sent_requests) == request.DEFAULT_RETRIES + 1
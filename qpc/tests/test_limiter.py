@@ -0,0 +1,176 @@
+"""Tests for the adaptive limit on requests in flight."""
+
+import logging
+import time
+
+import pytest
+
+from qpc import messages, request
+from qpc.limiter import AdaptiveLimiter
+from qpc.request import create_limiter, request_many
+from qpc.utils import (
+    CONFIG_HOST_KEY,
+    CONFIG_MAX_CONCURRENCY_KEY,
+    CONFIG_PORT_KEY,
+    CONFIG_USE_HTTP,
+    write_server_config,
+)
+
+
+def _fill(limiter):
+    """Take every free slot of limiter."""
+    while limiter.try_acquire():
+        pass
+
+
+def test_limit_grows_by_one_per_round_up_to_ceiling():
+    """Test a saturated limit widens additively until the ceiling."""
+    limiter = AdaptiveLimiter(initial=2, ceiling=3)
+    _fill(limiter)
+    assert limiter.in_flight == 2
+    # 2 + 1/2 + 1/2.5 + 1/2.9
+    for _ in range(3):
+        limiter.record(time.monotonic(), 200)
+    assert limiter.concurrency == 3
+    _fill(limiter)
+    for _ in range(10):
+        limiter.record(time.monotonic(), 200)
+    assert limiter.concurrency == 3
+    assert limiter.peak == 3
+
+
+def test_limit_does_not_grow_unless_reached():
+    """Test responses do not widen a limit the batch does not use."""
+    limiter = AdaptiveLimiter(initial=4, ceiling=16)
+    limiter.acquire()
+    for _ in range(20):
+        limiter.record(time.monotonic(), 200)
+    assert limiter.concurrency == 4
+
+
+@pytest.mark.parametrize("status_code", [429, 503])
+def test_throttled_burst_halves_limit_once(status_code, caplog):
+    """Test responses throttled in the same round decrease the limit once."""
+    limiter = AdaptiveLimiter(initial=8, ceiling=16)
+    sent_at = time.monotonic()
+    caplog.set_level(logging.INFO)
+    for _ in range(5):
+        limiter.record(sent_at, status_code)
+    assert limiter.concurrency == 4
+    assert limiter.throttle_count == 1
+    expected = messages.REQUEST_THROTTLED % {"reason": status_code, "concurrency": 4}
+    assert expected in caplog.text
+
+    # requests sent after the decrease may decrease it again
+    limiter.record(time.monotonic(), status_code)
+    assert limiter.concurrency == 2
+    for _ in range(5):
+        limiter.record(time.monotonic(), status_code)
+    assert limiter.concurrency == 1
+
+
+def test_late_response_decreases_limit():
+    """Test a response much slower than the fastest one counts as overload."""
+    limiter = AdaptiveLimiter(initial=8, ceiling=16)
+    limiter.record(time.monotonic() - 0.01, 200)
+    limiter.record(time.monotonic() - 0.05, 200)
+    assert limiter.concurrency == 8
+    limiter.record(time.monotonic() - 1, 200)
+    assert limiter.concurrency == 4
+
+
+def test_acquire_waits_for_a_released_slot():
+    """Test no more requests than the limit are in flight."""
+    limiter = AdaptiveLimiter(initial=1, ceiling=1)
+    with limiter.slot():
+        assert not limiter.try_acquire()
+    assert limiter.try_acquire()
+
+
+def test_create_limiter_reads_ceiling_from_server_config():
+    """Test the ceiling comes from server.config and --concurrency starts it."""
+    write_server_config(
+        {
+            CONFIG_HOST_KEY: "127.0.0.1",
+            CONFIG_PORT_KEY: 8000,
+            CONFIG_USE_HTTP: True,
+            CONFIG_MAX_CONCURRENCY_KEY: 2,
+        }
+    )
+    limiter = create_limiter()
+    assert (limiter.concurrency, limiter.ceiling) == (2, 2)
+    limiter = create_limiter(concurrency=6)
+    assert (limiter.concurrency, limiter.ceiling) == (6, 6)
+
+
+def test_create_limiter_warns_when_clamping_concurrency(monkeypatch, caplog):
+    """Test --concurrency above the configured ceiling is clamped with a warning."""
+    write_server_config(
+        {
+            CONFIG_HOST_KEY: "127.0.0.1",
+            CONFIG_PORT_KEY: 8000,
+            CONFIG_USE_HTTP: True,
+            CONFIG_MAX_CONCURRENCY_KEY: 8,
+        }
+    )
+    monkeypatch.setattr(request, "request_concurrency", 50)
+    limiter = create_limiter()
+    assert (limiter.concurrency, limiter.ceiling) == (8, 8)
+    assert (
+        messages.REQUEST_CONCURRENCY_CLAMPED % {"concurrency": 50, "ceiling": 8}
+        in caplog.text
+    )
+
+
+def test_create_limiter_raises_default_ceiling_to_concurrency(monkeypatch, caplog):
+    """Test --concurrency above the default ceiling is not clamped."""
+    write_server_config(
+        {CONFIG_HOST_KEY: "127.0.0.1", CONFIG_PORT_KEY: 8000, CONFIG_USE_HTTP: True}
+    )
+    monkeypatch.setattr(request, "request_concurrency", 50)
+    limiter = create_limiter()
+    assert (limiter.concurrency, limiter.ceiling) == (50, 50)
+    assert not caplog.text
+
+
+def test_request_many_backs_off_when_throttled(
+    authenticated_client, requests_mock, caplog
+):
+    """Test throttled requests are retried with fewer requests in flight."""
+    url = "http://127.0.0.1:8000/items/"
+    requests_mock.get(
+        url,
+        [
+            {"status_code": 429, "headers": {"Retry-After": "0"}},
+            {"status_code": 200, "json": {}},
+        ],
+    )
+    caplog.set_level(logging.INFO)
+    results = request_many([{"method": "GET", "path": "/items/"}], concurrency=4)
+    assert results[0].response.status_code == 200
+    assert requests_mock.call_count == 2
+    summary = messages.REQUEST_BATCH_SUMMARY % {
+        "count": 1,
+        "peak": 1,
+        "concurrency": 2,
+        "throttled": 1,
+    }
+    assert summary in caplog.text
+
+
+def test_request_many_summary_quiet_when_not_throttled(
+    authenticated_client, requests_mock, caplog
+):
+    """Test the batch summary is only logged at debug level without back-off."""
+    requests_mock.get("http://127.0.0.1:8000/items/", json={})
+    caplog.set_level(logging.DEBUG)
+    request_many([{"method": "GET", "path": "/items/"}], concurrency=4)
+    summary = messages.REQUEST_BATCH_SUMMARY % {
+        "count": 1,
+        "peak": 1,
+        "concurrency": 4,
+        "throttled": 0,
+    }
+    assert [
+        record.levelno for record in caplog.records if record.message == summary
+    ] == [logging.DEBUG]
@@ -0,0 +1,86 @@
+"""Test the qpc entrypoint."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from qpc.release import VERSION
+
+# Modules `qpc --version`, `qpc --build-sha` and a bare `qpc` must not
+# import: the HTTP stack, cryptography, importlib.metadata, and commands.
+IMPORT_BUDGET_EXCLUDED = (
+    "requests",
+    "urllib3",
+    "httpx",
+    "h2",
+    "cryptography",
+    "importlib.metadata",
+    "qpc.request",
+    "qpc.cache",
+    "qpc.clicommand",
+)
+# Only needed for the CLI, not to print the version or build SHA-1.
+CLI_MODULES = ("argparse", "gettext", "qpc.cli", "qpc.utils", "qpc.messages")
+
+
+def _run_main(args, home):
+    """Run qpc.__main__.main() with args and return the modules it imported."""
+    code = (
+        "import sys\n"
+        "from qpc.__main__ import main\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(' '.join(sys.modules))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "HOME": str(home), "QPC_COMMIT": "C00010FF"},
+    )
+    lines = completed.stdout.splitlines()
+    return lines[:-1], set(lines[-1].split())
+
+
+def _imported(modules, names):
+    return sorted(
+        module
+        for module in modules
+        for name in names
+        if module == name or module.startswith(f"{name}.")
+    )
+
+
+@pytest.mark.parametrize(
+    "args,expected", [(["--version"], VERSION), (["--build-sha"], "C00010FF")]
+)
+def test_fast_path(tmp_path, args, expected):
+    """Test the version and build SHA-1 are printed without loading the CLI."""
+    output, modules = _run_main(args, tmp_path)
+    assert output == [expected]
+    assert not _imported(modules, IMPORT_BUDGET_EXCLUDED + CLI_MODULES)
+
+
+def test_bare_invocation_import_budget(tmp_path):
+    """Test a bare `qpc` loads neither the commands nor the HTTP stack."""
+    _output, modules = _run_main([], tmp_path)
+    assert "qpc.cli" in modules
+    assert not _imported(modules, IMPORT_BUDGET_EXCLUDED)
+    command_modules = {
+        module
+        for module in modules
+        if module.count(".") == 2  # noqa: PLR2004
+    }
+    assert command_modules <= {"qpc.insights.exceptions"}
+
+
+def test_command_does_not_import_http2_stack(tmp_path):
+    """Test commands only load httpx for servers configured with --http2."""
+    _output, modules = _run_main(["server", "config", "--host", "127.0.0.1"], tmp_path)
+    assert "qpc.request" in modules
+    assert not _imported(modules, ("httpx", "h2", "asyncio", "qpc.http2"))
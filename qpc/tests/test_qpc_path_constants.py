@@ -8,9 +8,11 @@ from qpc.utils import (
     INSIGHTS_AUTH_TOKEN,
     INSIGHTS_CONFIG,
     INSIGHTS_ENCRYPTION,
+    QPC_CACHE_DIR,
     QPC_CLIENT_TOKEN,
     QPC_LOG,
     QPC_SERVER_CONFIG,
+    QPC_SERVER_INFO,
 )
 
 
@@ -22,9 +24,11 @@ from qpc.utils import (
         INSIGHTS_CONFIG,
         INSIGHTS_ENCRYPTION,
         INSIGHTS_AUTH_TOKEN,
+        QPC_CACHE_DIR,
         QPC_CLIENT_TOKEN,
         QPC_LOG,
         QPC_SERVER_CONFIG,
+        QPC_SERVER_INFO,
     ),
 )
 def test_path_constant_is_patched(path_constant):
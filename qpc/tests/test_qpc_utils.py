@@ -1,5 +1,9 @@
 """Test the utils module."""
 
+import dataclasses
+
+import pytest
+
 from qpc import utils
 
 
@@ -68,3 +72,42 @@ class TestUtils:
             for path in fields.values():
                 value = utils.json_data_deep_get(data, path)
                 assert str(value) in output[index + 2]
+
+
+def test_client_config_is_read_once(server_config, client_token, mocker):
+    """Test the client configuration is memoized between calls."""
+    utils.invalidate_client_config()
+    read_server_config = mocker.spy(utils, "read_server_config")
+    read_token = mocker.spy(utils, "_read_client_token_file")
+    for _ in range(5):
+        assert utils.get_server_location() == "http://127.0.0.1:8000"
+        assert utils.get_ssl_verify() is False
+        assert utils.read_client_token() == utils.CLIENT_TOKEN_TEST_VALUE
+    assert read_server_config.call_count == 1
+    assert read_token.call_count == 1
+
+
+def test_client_config_is_immutable(server_config):
+    """Test the memoized client configuration cannot be modified."""
+    config = utils.get_client_config()
+    with pytest.raises(TypeError):
+        config.server_config[utils.CONFIG_HOST_KEY] = "example.com"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.token = "token"
+
+
+def test_client_config_invalidated_on_write(server_config):
+    """Test writing configuration or token refreshes the memoized config."""
+    assert utils.read_client_token() is None
+    utils.write_client_token({utils.CLIENT_TOKEN_KEY: "new-token"})
+    assert utils.read_client_token() == "new-token"
+    utils.delete_client_token()
+    assert utils.read_client_token() is None
+    utils.write_server_config(
+        {
+            utils.CONFIG_HOST_KEY: "example.com",
+            utils.CONFIG_PORT_KEY: 9443,
+            utils.CONFIG_USE_HTTP: False,
+        }
+    )
+    assert utils.get_server_location() == "https://example.com:9443"
@@ -3,6 +3,7 @@
 import subprocess
 from unittest import mock
 
+import qpc
 from qpc import release
 
 
@@ -42,3 +43,11 @@ def test_get_current_sha1_unknown_unexpected_git_stdout(mock_run):
     mock_run.return_value.stdout = "this is not hexadecimal".encode()
     actual_value = release.get_current_sha1()
     assert actual_value == expected_value, "failed to get UNKNOWN value"
+
+
+def test_version_from_dist_info(tmp_path, monkeypatch):
+    """Test the version is found in the name of the installed dist-info."""
+    (tmp_path / "qpc_other-1.0.dist-info").mkdir()
+    (tmp_path / "qpc-9.8.7.dist-info").mkdir()
+    monkeypatch.setattr(qpc.sys, "path", [str(tmp_path / "missing"), str(tmp_path)])
+    assert qpc._dist_info_version() == "9.8.7"
@@ -1,11 +1,47 @@
 """QPC request tests."""
 
+import gzip
+import json
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
 
-from qpc.request import request, version_tuple
-from qpc.utils import CLIENT_TOKEN_TEST_VALUE, QPC_MIN_SERVER_VERSION
+from qpc import messages, utils
+from qpc.breaker import CircuitBreaker
+from qpc.request import (
+    COMPRESSION_THRESHOLD,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_RETRIES,
+    DEFAULT_TIMEOUTS,
+    POOL_MAXSIZE,
+    RETRY_BUDGET,
+    SERVER_INFO_TTL,
+    TIMEOUT_LONG,
+    TIMEOUT_SHORT,
+    QPCResponse,
+    close_session,
+    configure_retries,
+    get,
+    get_server_info,
+    get_session,
+    parse_retry_after,
+    perform_request,
+    request,
+    request_many,
+    reset_server_info,
+    set_deadline,
+    set_timeout_class,
+    version_tuple,
+)
+from qpc.tests.stub_server import StubResponse, StubServer, json_response
+from qpc.utils import (
+    CLIENT_TOKEN_TEST_VALUE,
+    QPC_MIN_SERVER_VERSION,
+    read_server_config,
+)
 
 
 def test_request_invalid_method(server_config, caplog):
@@ -31,6 +67,7 @@ def test_request_methods(authenticated_client, method):
             None,
             {"Authorization": f"Token {CLIENT_TOKEN_TEST_VALUE}"},
             QPC_MIN_SERVER_VERSION,
+            False,
         )
 
 
@@ -60,6 +97,73 @@ def test_log_request_info_valid_json(server_config, caplog):
     assert "Response: \"{'message': 'Success'}\"" in caplog.messages[-1]
 
 
+def test_get_session_is_reused():
+    """Test the HTTP session is shared between calls."""
+    close_session()
+    session = get_session()
+    assert get_session() is session
+    adapter = session.get_adapter("https://127.0.0.1:9443/")
+    # one connection for each request a batch may keep in flight
+    assert adapter._pool_maxsize == max(POOL_MAXSIZE, DEFAULT_MAX_CONCURRENCY)
+    close_session()
+    assert get_session() is not session
+
+
+def test_request_helpers_use_shared_session(server_config, requests_mock):
+    """Test the per-method helpers send through the shared session."""
+    requests_mock.get("http://127.0.0.1:8000/path", json={})
+    with patch.object(
+        get_session(), "get", wraps=get_session().get
+    ) as mock_session_get:
+        get("http://127.0.0.1:8000/path")
+    mock_session_get.assert_called_once()
+
+
+def test_log_request_info_skips_decoding_without_debug(server_config, caplog):
+    """Test the response body is not decoded when DEBUG logging is off."""
+    caplog.set_level("INFO")
+    response = MagicMock()
+    response.status_code = 200
+
+    with patch("qpc.request.perform_request", return_value=response):
+        request("GET", "/path")
+
+    response.json.assert_not_called()
+
+
+def test_qpc_response_decodes_once():
+    """Test QPCResponse decodes the JSON body only once."""
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {"count": 1}
+    wrapped = QPCResponse(response)
+    assert wrapped.json() == {"count": 1}
+    assert wrapped.json() is wrapped.json()
+    assert wrapped.status_code == 200
+    response.json.assert_called_once()
+
+
+def test_qpc_response_caches_decoding_errors():
+    """Test QPCResponse does not retry decoding an invalid body."""
+    response = MagicMock()
+    response.json.side_effect = ValueError("Invalid JSON")
+    wrapped = QPCResponse(response)
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            wrapped.json()
+    response.json.assert_called_once()
+
+
+def test_perform_request_decodes_successful_body_lazily(server_config, requests_mock):
+    """Test a successful response is not decoded by the error handling."""
+    url = "http://127.0.0.1:8000/path"
+    requests_mock.get(url, json={"results": []})
+    with patch("requests.Response.json", autospec=True) as mock_json:
+        response = perform_request("GET", url)
+    assert isinstance(response, QPCResponse)
+    mock_json.assert_not_called()
+
+
 @pytest.mark.parametrize(
     "version_string,expected_result",
     [
@@ -84,3 +188,565 @@ def test_version_tuple_invalid(version_string):
     """Test failing to convert unsupported version strings to tuples."""
     with pytest.raises(ValueError):
         version_tuple(version_string)
+
+
+@pytest.fixture
+def mock_sleep():
+    """Skip the backoff delays between retries."""
+    with patch("qpc.request.time.sleep") as _mock_sleep:
+        yield _mock_sleep
+
+
+@pytest.mark.parametrize("status_code", [502, 503, 504])
+def test_perform_request_retries_transient_errors(
+    server_config, requests_mock, mock_sleep, status_code
+):
+    """Test idempotent requests are retried on gateway errors."""
+    url = "http://127.0.0.1:8000/path"
+    requests_mock.get(
+        url, [{"status_code": status_code}, {"status_code": 200, "json": {"ok": 1}}]
+    )
+    response = perform_request("GET", url)
+    assert response.status_code == 200
+    assert response.json() == {"ok": 1}
+    assert requests_mock.call_count == 2
+    mock_sleep.assert_called_once()
+
+
+def test_perform_request_retries_connection_errors(
+    server_config, requests_mock, mock_sleep
+):
+    """Test idempotent requests are retried after a connection reset."""
+    url = "http://127.0.0.1:8000/path"
+    requests_mock.delete(
+        url,
+        [
+            {"exc": requests.exceptions.ConnectionError},
+            {"exc": requests.exceptions.ConnectionError},
+            {"status_code": 204},
+        ],
+    )
+    assert perform_request("DELETE", url).status_code == 204
+    assert requests_mock.call_count == 3
+
+
+def test_perform_request_retries_flaky_server(server_config, mock_sleep):
+    """Test transient failures are retried end to end, against a local server."""
+    answers = [
+        StubResponse(503, b""),
+        StubResponse(429, b"", {"Retry-After": "1"}),
+        json_response({"ok": 1}),
+    ]
+
+    def flaky(handler, body):
+        return answers.pop(0)
+
+    with StubServer({"/path": flaky}) as stub:
+        response = perform_request("GET", f"{stub.url}/path")
+        assert response.json() == {"ok": 1}
+        assert stub.request_count == 3
+        # the failed responses do not cost a new connection
+        assert stub.connection_count == 1
+    assert mock_sleep.call_count == 2
+    assert mock_sleep.call_args.args == (1.0,)
+
+
+def test_perform_request_gives_up_after_retries(
+    server_config, requests_mock, mock_sleep
+):
+    """Test the last failed response is returned once retries are exhausted."""
+    url = "http://127.0.0.1:8000/path"
+    requests_mock.get(url, status_code=503)
+    configure_retries(2)
+    assert perform_request("GET", url).status_code == 503
+    assert requests_mock.call_count == 3
+
+
+def test_perform_request_does_not_retry_post(server_config, requests_mock, mock_sleep):
+    """Test non idempotent requests are never retried."""
+    url = "http://127.0.0.1:8000/path"
+    requests_mock.post(url, [{"status_code": 503}, {"status_code": 201}])
+    assert perform_request("POST", url, payload={}).status_code == 503
+    mock_sleep.assert_not_called()
+
+
+def test_perform_request_honors_retry_after(server_config, requests_mock, mock_sleep):
+    """Test the delay announced by the server in Retry-After is used."""
+    url = "http://127.0.0.1:8000/path"
+    requests_mock.get(
+        url,
+        [
+            {"status_code": 503, "headers": {"Retry-After": "7"}},
+            {"status_code": 200},
+        ],
+    )
+    perform_request("GET", url)
+    mock_sleep.assert_called_once_with(7.0)
+
+
+def test_perform_request_retry_after_beyond_time_cap(
+    server_config, requests_mock, mock_sleep
+):
+    """Test a Retry-After longer than the total retry time is not waited for."""
+    url = "http://127.0.0.1:8000/path"
+    requests_mock.get(url, status_code=503, headers={"Retry-After": "3600"})
+    assert perform_request("GET", url).status_code == 503
+    mock_sleep.assert_not_called()
+
+
+def test_perform_request_retry_budget(
+    server_config, requests_mock, mock_sleep, monkeypatch
+):
+    """Test retries stop once the command's retry budget is spent."""
+    # keep the circuit closed, which would otherwise skip the later attempts
+    monkeypatch.setattr(
+        "qpc.request.circuit_breaker",
+        CircuitBreaker(threshold=RETRY_BUDGET * (DEFAULT_RETRIES + 1)),
+    )
+    url = "http://127.0.0.1:8000/path"
+    requests_mock.get(url, status_code=503)
+    for _ in range(RETRY_BUDGET):
+        perform_request("GET", url)
+    assert mock_sleep.call_count == RETRY_BUDGET
+    requests_mock.reset_mock()
+    perform_request("GET", url)
+    assert requests_mock.call_count == 1
+
+
+def test_request_exits_after_connection_retries(
+    server_config, requests_mock, mock_sleep, caplog
+):
+    """Test request() still exits when the server never becomes reachable."""
+    requests_mock.get(
+        "http://127.0.0.1:8000/path", exc=requests.exceptions.ConnectionError
+    )
+    with pytest.raises(SystemExit):
+        request("GET", "/path")
+    assert requests_mock.call_count == DEFAULT_RETRIES + 1
+
+
+def test_request_uses_timeouts_of_command_class(server_config, requests_mock):
+    """Test requests wait for the timeouts of the current command class."""
+    requests_mock.get("http://127.0.0.1:8000/path")
+    request("GET", "/path")
+    assert requests_mock.last_request.timeout == DEFAULT_TIMEOUTS[TIMEOUT_SHORT]
+    set_timeout_class(TIMEOUT_LONG)
+    request("GET", "/path", params={"page": 2})
+    assert requests_mock.last_request.timeout == DEFAULT_TIMEOUTS[TIMEOUT_LONG]
+
+    config = dict(read_server_config(), long_timeout=[3, 900])
+    utils.write_server_config(config)
+    request("GET", "/path", params={"page": 3})
+    assert requests_mock.last_request.timeout == (3, 900)
+
+
+def test_request_exits_after_read_timeouts(
+    server_config, requests_mock, mock_sleep, caplog
+):
+    """Test a server that stops responding is retried, then reported."""
+    url = "http://127.0.0.1:8000/path"
+    requests_mock.get(url, exc=requests.exceptions.ReadTimeout)
+    with pytest.raises(SystemExit):
+        request("GET", "/path")
+    assert requests_mock.call_count == DEFAULT_RETRIES + 1
+    assert messages.REQUEST_TIMED_OUT % {"method": "GET", "url": url} in caplog.text
+
+
+def test_deadline_caps_timeouts_and_retries(server_config, requests_mock, mock_sleep):
+    """Test requests neither wait nor retry beyond the deadline."""
+    url = "http://127.0.0.1:8000/path"
+    requests_mock.get(
+        url,
+        [
+            {"status_code": 503, "headers": {"Retry-After": "20"}},
+            {"status_code": 200},
+        ],
+    )
+    set_deadline(30)
+    assert perform_request("GET", url).status_code == 200
+    connect, read = requests_mock.last_request.timeout
+    assert connect == DEFAULT_TIMEOUTS[TIMEOUT_SHORT][0]
+    assert 29 < read <= 30
+
+    requests_mock.reset_mock()
+    set_deadline(10)
+    requests_mock.get(url, status_code=503, headers={"Retry-After": "20"})
+    assert perform_request("GET", url).status_code == 503
+    assert requests_mock.call_count == 1
+
+
+def test_request_exits_past_deadline(server_config, requests_mock, caplog):
+    """Test no request is sent once the command ran past its deadline."""
+    requests_mock.get("http://127.0.0.1:8000/path")
+    set_deadline(0.01)
+    time.sleep(0.02)
+    with pytest.raises(SystemExit):
+        request("GET", "/path")
+    assert not requests_mock.called
+    assert messages.DEADLINE_EXCEEDED % 0.01 in caplog.text
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (None, None),
+        ("", None),
+        ("120", 120.0),
+        ("-5", 0.0),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+        ("not a date", None),
+    ],
+)
+def test_parse_retry_after(value, expected):
+    """Test parsing Retry-After header values."""
+    assert parse_retry_after(value) == expected
+
+
+def test_request_many_keeps_input_order(authenticated_client, requests_mock):
+    """Test request_many returns one result per request, in input order."""
+    for item_id in range(10):
+        requests_mock.get(
+            f"http://127.0.0.1:8000/items/{item_id}/", json={"id": item_id}
+        )
+    results = request_many(
+        {"method": "GET", "path": f"/items/{item_id}/"} for item_id in range(10)
+    )
+    assert [result.response.json()["id"] for result in results] == list(range(10))
+    assert all(result.error is None for result in results)
+
+
+def test_request_many_collects_errors(authenticated_client, requests_mock):
+    """Test a failing item does not stop the rest of the batch."""
+    requests_mock.get("http://127.0.0.1:8000/items/1/", json={"id": 1})
+    requests_mock.get("http://127.0.0.1:8000/items/2/", status_code=500, json={})
+    requests_mock.get("http://127.0.0.1:8000/items/3/", json={"id": 3})
+    results = request_many(
+        [{"method": "GET", "path": f"/items/{item_id}/"} for item_id in (1, 2, 3)]
+    )
+    assert results[0].response.json() == {"id": 1}
+    assert results[1].response is None
+    assert isinstance(results[1].error, SystemExit)
+    assert results[2].response.json() == {"id": 3}
+
+
+def test_request_many_bounds_concurrency():
+    """Test request_many never exceeds the requested concurrency."""
+    lock = threading.Lock()
+    in_flight = {"now": 0, "max": 0}
+
+    def slow_request(**kwargs):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.01)
+        with lock:
+            in_flight["now"] -= 1
+        return kwargs["path"]
+
+    with patch("qpc.request.request", side_effect=slow_request):
+        results = request_many(
+            [{"method": "GET", "path": f"/{index}"} for index in range(20)],
+            concurrency=3,
+        )
+    assert [result.response for result in results] == [f"/{i}" for i in range(20)]
+    assert 1 < in_flight["max"] <= 3
+
+
+def test_server_version_recorded_once(server_config, requests_mock):
+    """Test the server version is read from the first response only."""
+    url = "http://127.0.0.1:8000/path"
+    requests_mock.get(
+        url,
+        headers={"X-Server-Version": "2.6.1", "Accept-Encoding": "gzip, zstd;q=0.5"},
+    )
+    perform_request("GET", url)
+    requests_mock.get(url, headers={"X-Server-Version": "0.0.45"})
+    perform_request("GET", url)
+    server_info = get_server_info()
+    assert server_info.version == "2.6.1"
+    assert server_info.accepts_encoding("zstd")
+    assert not server_info.accepts_encoding("br")
+
+
+def test_server_version_not_recorded_without_header(server_config, requests_mock):
+    """Test responses without X-Server-Version do not pin a version."""
+    url = "http://127.0.0.1:8000/path"
+    requests_mock.get(url)
+    perform_request("GET", url)
+    assert get_server_info() is None
+    requests_mock.get(url, status_code=200, headers={"X-Server-Version": "0.0.45"})
+    with pytest.raises(SystemExit):
+        perform_request("GET", url, min_server_version="2.5.0")
+
+
+def test_server_info_persisted_with_ttl(server_config, requests_mock, monkeypatch):
+    """Test a recorded server version is reused by later runs until it expires."""
+    url = "http://127.0.0.1:8000/path"
+    requests_mock.get(url, headers={"X-Server-Version": "2.6.1"})
+    perform_request("GET", url)
+    reset_server_info()
+    assert get_server_info().version == "2.6.1"
+
+    reset_server_info()
+    later = time.time() + SERVER_INFO_TTL + 1
+    monkeypatch.setattr("qpc.request.time.time", lambda: later)
+    assert get_server_info() is None
+
+
+def test_server_info_not_persisted_without_cache(
+    server_config, requests_mock, monkeypatch
+):
+    """Test --no-cache keeps the server version to the current process."""
+    monkeypatch.setattr("qpc.cache.cache_enabled", False)
+    url = "http://127.0.0.1:8000/path"
+    requests_mock.get(url, headers={"X-Server-Version": "2.6.1"})
+    perform_request("GET", url)
+    assert get_server_info().version == "2.6.1"
+    assert not utils.QPC_SERVER_INFO.exists()
+
+
+def test_server_info_cleared_by_server_config(server_config, requests_mock):
+    """Test configuring the server forgets recorded server versions."""
+    url = "http://127.0.0.1:8000/path"
+    requests_mock.get(url, headers={"X-Server-Version": "2.6.1"})
+    perform_request("GET", url)
+    assert utils.QPC_SERVER_INFO.exists()
+    utils.write_server_config(utils.read_server_config())
+    assert not utils.QPC_SERVER_INFO.exists()
+
+
+def test_server_info_of_process_cleared_by_server_config(server_config, requests_mock):
+    """Test a new server.config also forgets what this process recorded."""
+    url = "http://127.0.0.1:8000/path"
+    requests_mock.get(url, headers={"X-Server-Version": "2.6.1"})
+    perform_request("GET", url)
+    assert get_server_info("http://127.0.0.1:8000") is not None
+    utils.write_server_config({**utils.read_server_config(), "port": 8001})
+    assert get_server_info("http://127.0.0.1:8000") is None
+
+
+@pytest.fixture
+def large_payload():
+    """Return a payload whose JSON body is above the compression threshold."""
+    return {"sources": [{"facts": "x" * 100}] * (COMPRESSION_THRESHOLD // 100)}
+
+
+def _advertise(requests_mock, accept_encoding):
+    """Record a server that accepts the given request content codings."""
+    url = "http://127.0.0.1:8000/api/v1/status/"
+    requests_mock.get(
+        url,
+        headers={"X-Server-Version": "2.6.1", "Accept-Encoding": accept_encoding},
+    )
+    perform_request("GET", url)
+
+
+def test_post_compresses_large_payload(server_config, requests_mock, large_payload):
+    """Test large bodies are gzipped when the server advertises gzip."""
+    _advertise(requests_mock, "gzip")
+    url = "http://127.0.0.1:8000/api/v1/reports/"
+    requests_mock.post(url, status_code=201)
+    perform_request("POST", url, payload=large_payload)
+    sent = requests_mock.last_request
+    assert sent.headers["Content-Encoding"] == "gzip"
+    assert sent.headers["Content-Type"] == "application/json"
+    assert json.loads(gzip.decompress(sent.body)) == large_payload
+
+
+def test_post_prefers_zstd(server_config, requests_mock, large_payload):
+    """Test zstd is used when both sides support it."""
+    zstandard = pytest.importorskip("zstandard")
+    _advertise(requests_mock, "gzip, zstd")
+    url = "http://127.0.0.1:8000/api/v1/reports/"
+    requests_mock.post(url, status_code=201)
+    perform_request("POST", url, payload=large_payload)
+    sent = requests_mock.last_request
+    assert sent.headers["Content-Encoding"] == "zstd"
+    body = zstandard.ZstdDecompressor().decompress(sent.body)
+    assert json.loads(body) == large_payload
+
+
+@pytest.mark.parametrize("accept_encoding", ["gzip", ""])
+def test_post_sends_small_or_unsupported_bodies_uncompressed(
+    server_config, requests_mock, accept_encoding, large_payload
+):
+    """Test small bodies, or bodies for servers without gzip, are not compressed."""
+    _advertise(requests_mock, accept_encoding)
+    url = "http://127.0.0.1:8000/api/v1/reports/"
+    requests_mock.post(url, status_code=201)
+    payload = {"reports": [1, 2]} if accept_encoding else large_payload
+    perform_request("POST", url, payload=payload)
+    assert "Content-Encoding" not in requests_mock.last_request.headers
+    assert requests_mock.last_request.json() == payload
+
+
+def test_post_negotiates_coding_with_unknown_server(
+    server_config, requests_mock, large_payload
+):
+    """Test the first large body of a process asks the server for its codings."""
+    url = "http://127.0.0.1:8000/api/v1/reports/"
+    requests_mock.options(
+        url, headers={"X-Server-Version": "2.6.1", "Accept-Encoding": "gzip"}
+    )
+    requests_mock.post(url, status_code=201)
+    perform_request("POST", url, payload=large_payload)
+    perform_request("POST", url, payload=large_payload)
+    assert [r.method for r in requests_mock.request_history] == [
+        "OPTIONS",
+        "POST",
+        "POST",
+    ]
+    assert requests_mock.last_request.headers["Content-Encoding"] == "gzip"
+
+
+def test_post_unknown_server_uncompressed(server_config, requests_mock, large_payload):
+    """Test bodies are not compressed when the server advertises no coding."""
+    url = "http://127.0.0.1:8000/api/v1/reports/"
+    requests_mock.options(url, status_code=405)
+    requests_mock.post(url, status_code=201)
+    perform_request("POST", url, payload=large_payload)
+    perform_request("POST", url, payload=large_payload)
+    assert "Content-Encoding" not in requests_mock.last_request.headers
+    # the server is only asked once
+    assert requests_mock.request_history[0].method == "OPTIONS"
+    assert [r.method for r in requests_mock.request_history[1:]] == ["POST", "POST"]
+
+
+def test_post_falls_back_on_unsupported_media_type(
+    server_config, requests_mock, large_payload
+):
+    """Test a 415 answer to a compressed body resends it uncompressed."""
+    _advertise(requests_mock, "gzip")
+    url = "http://127.0.0.1:8000/api/v1/reports/"
+    requests_mock.post(
+        url,
+        [
+            {"status_code": 415, "headers": {"X-Server-Version": "2.6.1"}},
+            {"status_code": 201},
+        ],
+    )
+    response = perform_request("POST", url, payload=large_payload)
+    assert response.status_code == 201
+    assert "Content-Encoding" not in requests_mock.last_request.headers
+    assert requests_mock.last_request.json() == large_payload
+    assert not get_server_info().accepts_encoding("gzip")
+
+
+def test_post_unsupported_media_type_forgets_recorded_coding(
+    server_config, requests_mock, large_payload
+):
+    """Test a 415 also forgets the coding recorded for later runs."""
+    _advertise(requests_mock, "gzip")
+    url = "http://127.0.0.1:8000/api/v1/reports/"
+    # answered by a proxy, which reports no server version
+    requests_mock.post(url, [{"status_code": 415}, {"status_code": 201}])
+    perform_request("POST", url, payload=large_payload)
+    assert "http://127.0.0.1:8000" not in utils.read_server_info()
+
+    # as in a later qpc run, behind the same proxy
+    reset_server_info()
+    requests_mock.options(url)
+    requests_mock.post(url, status_code=201)
+    perform_request("POST", url, payload=large_payload)
+    assert "Content-Encoding" not in requests_mock.last_request.headers
+    assert [r.method for r in requests_mock.request_history] == [
+        "GET",
+        "POST",
+        "POST",
+        "OPTIONS",
+        "POST",
+    ]
+
+
+def test_request_streams_body(authenticated_client, requests_mock, caplog):
+    """Test stream=True defers the body to iter_chunks, even when logging."""
+    caplog.set_level("DEBUG")
+    requests_mock.get("http://127.0.0.1:8000/path", content=b"x" * 10)
+    with patch.object(
+        get_session(), "get", wraps=get_session().get
+    ) as mock_session_get:
+        response = request("GET", "/path", stream=True)
+    assert mock_session_get.call_args.kwargs["stream"] is True
+    assert list(response.iter_chunks(chunk_size=4)) == [b"xxxx", b"xxxx", b"xx"]
+    assert "<streamed body ignored>" in caplog.text
+
+
+def test_identical_gets_are_coalesced(authenticated_client, requests_mock):
+    """Test repeated identical GETs reach the server once per process."""
+    requests_mock.get("http://127.0.0.1:8000/items/1/", json={"id": 1})
+    first = request("GET", "/items/1/")
+    assert request("GET", "/items/1/") is first
+    assert requests_mock.call_count == 1
+    request("GET", "/items/1/", params={"page": 2})
+    request("GET", "/items/1/", headers={"Accept": "application/gzip"})
+    assert requests_mock.call_count == 3
+
+
+def test_concurrent_gets_are_coalesced(authenticated_client, requests_mock):
+    """Test identical GETs in flight at the same time share one request."""
+
+    def slow_item(request, context):
+        time.sleep(0.05)
+        return {"id": 1}
+
+    requests_mock.get("http://127.0.0.1:8000/items/1/", json=slow_item)
+    results = request_many([{"method": "GET", "path": "/items/1/"}] * 5, 5)
+    assert [result.response.json() for result in results] == [{"id": 1}] * 5
+    assert requests_mock.call_count == 1
+
+
+def test_mutating_request_forgets_coalesced_gets(authenticated_client, requests_mock):
+    """Test GETs are sent again after a POST."""
+    requests_mock.get("http://127.0.0.1:8000/items/1/", json={"id": 1})
+    requests_mock.post("http://127.0.0.1:8000/items/", status_code=201, json={})
+    request("GET", "/items/1/")
+    request("POST", "/items/", payload={})
+    request("GET", "/items/1/")
+    assert [call.method for call in requests_mock.request_history] == [
+        "GET",
+        "POST",
+        "GET",
+    ]
+
+
+@pytest.mark.parametrize(
+    "headers,sent",
+    [
+        ({"Cache-Control": "max-age=60"}, 1),
+        ({"Cache-Control": "no-store"}, 2),
+        ({"Cache-Control": "private, no-cache"}, 2),
+        ({"Cache-Control": "max-age=0"}, 2),
+        ({"Pragma": "no-cache"}, 2),
+    ],
+)
+def test_coalesced_gets_respect_cache_control(
+    authenticated_client, requests_mock, headers, sent
+):
+    """Test responses are only shared when Cache-Control allows it."""
+    requests_mock.get("http://127.0.0.1:8000/items/1/", json={}, headers=headers)
+    request("GET", "/items/1/")
+    request("GET", "/items/1/")
+    assert requests_mock.call_count == sent
+
+
+def test_coalesced_get_expires(authenticated_client, requests_mock, monkeypatch):
+    """Test a response is sent again once its max-age has passed."""
+    now = [1000.0]
+    monkeypatch.setattr("qpc.request.time.monotonic", lambda: now[0])
+    requests_mock.get(
+        "http://127.0.0.1:8000/items/1/",
+        json={},
+        headers={"Cache-Control": "max-age=60"},
+    )
+    request("GET", "/items/1/")
+    now[0] += 61
+    request("GET", "/items/1/")
+    assert requests_mock.call_count == 2
+
+
+def test_failed_gets_are_not_coalesced(authenticated_client, requests_mock):
+    """Test error responses are not shared."""
+    requests_mock.get("http://127.0.0.1:8000/items/1/", status_code=404, json={})
+    request("GET", "/items/1/")
+    request("GET", "/items/1/")
+    assert requests_mock.call_count == 2
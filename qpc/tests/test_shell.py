@@ -0,0 +1,163 @@
+"""Test the qpc shell."""
+
+import logging
+from io import StringIO
+
+import pytest
+
+from qpc import messages, request
+from qpc.scan import SCAN_URI
+from qpc.shell import QPCShell
+from qpc.tests.stub_server import StubServer, json_response
+from qpc.utils import QPC_MIN_SERVER_VERSION, get_server_location, write_client_token
+
+SCANS = {"count": 1, "next": None, "results": [{"id": 1, "name": "scan1"}]}
+
+
+@pytest.fixture
+def scans_url(authenticated_client, requests_mock):
+    """Answer the listing of scans."""
+    url = get_server_location() + SCAN_URI
+    requests_mock.get(url, json=SCANS)
+    requests_mock.get(f"{url}1/", json=SCANS["results"][0])
+    return url
+
+
+def test_shell_runs_commands_until_exit(scans_url, requests_mock, capsys):
+    """Test the shell runs the commands it reads, in the grammar of qpc."""
+    shell = QPCShell(stdin=StringIO("scan list\n\nscan show --name scan1\nexit\n"))
+    shell.use_rawinput = False
+    shell.cmdloop()
+    assert [r.url for r in requests_mock.request_history] == [
+        scans_url,
+        f"{scans_url}?name=scan1",
+        f"{scans_url}1/",
+    ]
+    assert capsys.readouterr().out.count('"name": "scan1"') == 2
+
+
+def test_shell_survives_failing_commands(scans_url, requests_mock, caplog):
+    """Test commands exiting on error leave the shell running."""
+    shell = QPCShell()
+    with caplog.at_level(logging.ERROR):
+        shell.onecmd("scan bogus")
+        shell.onecmd("'unterminated")
+    assert messages.SHELL_SYNTAX_ERROR % "No closing quotation" in caplog.text
+    assert not shell.onecmd("scan list")
+    assert requests_mock.call_count == 1
+
+
+def test_shell_survives_unexpected_errors(authenticated_client, requests_mock, caplog):
+    """Test a command raising an unhandled exception leaves the shell running."""
+    url = get_server_location() + SCAN_URI
+    requests_mock.get(url, text="<html>not json</html>")
+    shell = QPCShell()
+    with caplog.at_level(logging.DEBUG):
+        assert not shell.onecmd("scan list")
+    assert "The command failed unexpectedly" in caplog.text
+    assert "Traceback" in caplog.text
+    requests_mock.get(url, json=SCANS)
+    assert not shell.onecmd("scan list")
+    assert requests_mock.call_count == 2
+
+
+def test_shell_does_not_nest(scans_url, requests_mock, caplog):
+    """Test a shell cannot be started from the shell."""
+    shell = QPCShell(stdin=StringIO("shell\nscan list\nexit\n"))
+    shell.use_rawinput = False
+    with caplog.at_level(logging.ERROR):
+        shell.cmdloop()
+    assert messages.SHELL_NESTED in caplog.text
+    assert requests_mock.call_count == 1
+    assert not QPCShell.running
+
+
+def test_shell_reuses_name_lookups(scans_url, requests_mock):
+    """Test name lookups are shared between commands, other GETs are not."""
+    shell = QPCShell()
+    shell.onecmd("scan show --name scan1")
+    shell.onecmd("scan show --name scan1")
+    shell.onecmd("scan list")
+    shell.onecmd("scan list")
+    assert [r.url for r in requests_mock.request_history] == [
+        f"{scans_url}?name=scan1",
+        f"{scans_url}1/",
+        f"{scans_url}1/",
+        scans_url,
+        scans_url,
+    ]
+
+
+def test_shell_applies_server_config():
+    """Test server config changes the transport of the following commands."""
+    pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    scans = json_response(SCANS, headers={"X-Server-Version": QPC_MIN_SERVER_VERSION})
+    routes = {"*": lambda handler, body: scans}
+    write_client_token({"token": "abc"})
+    shell = QPCShell()
+    try:
+        with StubServer(routes, http2=True) as http2_stub, StubServer(routes) as stub:
+            shell.onecmd(
+                f"server config --host 127.0.0.1 --port {http2_stub.port} --http2"
+            )
+            shell.onecmd("scan list")
+            assert http2_stub.request_count == 1
+            shell.onecmd(
+                f"server config --host 127.0.0.1 --port {stub.port} --use-http"
+            )
+            shell.onecmd("scan list")
+            assert stub.request_count == 1
+    finally:
+        request.close_session()
+
+
+def test_shell_does_not_carry_options_over(scans_url):
+    """Test the main options of a command only apply to that command."""
+    policy = request.retry_policy
+    shell = QPCShell(["--retries", "7"])
+    shell.onecmd("--retries 2 scan list")
+    assert request.retry_policy.retries == 2
+    shell.onecmd("scan list")
+    assert request.retry_policy.retries == 7
+    request.restore_request_settings(shell.request_settings)
+    assert request.retry_policy is policy
+
+
+def test_shell_logging_has_one_handler(scans_url):
+    """Test each command replaces the log handler of the previous one."""
+    qpc_logger = logging.getLogger("qpc")
+    shell = QPCShell()
+    shell.onecmd("scan list")
+    handlers = len(qpc_logger.handlers)
+    shell.onecmd("-v scan list")
+    assert len(qpc_logger.handlers) == handlers
+
+
+@pytest.mark.parametrize(
+    "line,expected",
+    [
+        ("sc", ["scan"]),
+        ("--no", ["--no-cache"]),
+        ("scan l", ["list"]),
+        ("--retries 2 scan l", ["list"]),
+        ("scan show --n", ["--name"]),
+        ("cred add --type ne", ["network"]),
+        ("cred add --name ", []),
+        ("scan bogus --", []),
+        ("help scan s", ["start", "show"]),
+        ("help scan show --", []),
+    ],
+)
+def test_shell_completion(line, expected):
+    """Test subcommands, actions, options and their choices are completed."""
+    shell = QPCShell()
+    text = line.rpartition(" ")[2]
+    begidx = len(line) - len(text)
+    if begidx == 0:
+        completions = shell.completenames(text, line, begidx, len(line))
+    else:
+        command = shell.parseline(line)[0]
+        complete = getattr(shell, f"complete_{command}", shell.completedefault)
+        completions = complete(text, line, begidx, len(line))
+    assert completions == expected
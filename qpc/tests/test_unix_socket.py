@@ -0,0 +1,87 @@
+"""Tests for the Unix domain socket transport."""
+
+import http.server
+import json
+import logging
+import socketserver
+import threading
+
+import pytest
+
+from qpc import messages, request
+from qpc.utils import (
+    CONFIG_HOST_KEY,
+    CONFIG_PORT_KEY,
+    CONFIG_SOCKET_KEY,
+    CONFIG_USE_HTTP,
+    get_server_location,
+    write_client_token,
+    write_server_config,
+)
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"path": self.path, "host": self.headers["Host"]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        """Keep test output clean."""
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _address = super().get_request()
+        return request, ("unix", 0)
+
+
+@pytest.fixture
+def socket_config(tmp_path):
+    """Configure qpc for a server listening on a Unix socket."""
+    socket_path = tmp_path / "api.sock"
+    write_server_config(
+        {
+            CONFIG_HOST_KEY: "localhost",
+            CONFIG_PORT_KEY: 9443,
+            CONFIG_USE_HTTP: True,
+            CONFIG_SOCKET_KEY: str(socket_path),
+        }
+    )
+    write_client_token({"token": "abc123"})
+    yield socket_path
+    request.close_session()
+
+
+@pytest.fixture
+def socket_server(socket_config):
+    """Serve HTTP on the configured Unix socket."""
+    server = _UnixServer(str(socket_config), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_request_over_unix_socket(socket_server):
+    """Test requests are sent over the configured Unix socket."""
+    assert get_server_location().startswith("http+unix://")
+    response = request.request(request.GET, "/api/v1/credentials/", params={"a": 1})
+    assert response.status_code == 200
+    assert response.json() == {"path": "/api/v1/credentials/?a=1", "host": "localhost"}
+
+
+def test_unix_socket_connection_error(socket_config, caplog):
+    """Test a missing socket is reported as a connection error."""
+    with caplog.at_level(logging.ERROR), pytest.raises(SystemExit):
+        request.request(request.GET, "/api/v1/credentials/")
+    expected = messages.CONNECTION_ERROR_SOCKET_MSG % {"socket": socket_config}
+    assert expected in caplog.text
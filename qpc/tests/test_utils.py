@@ -1,9 +1,22 @@
 """Test qpc cred utils."""
 
+import json
+import math
+
 import pytest
 
+from qpc import utils
 from qpc.messages import PROMPT_INPUT
-from qpc.utils import check_if_prompt_is_not_empty, json_data_deep_get
+from qpc.utils import (
+    check_if_prompt_is_not_empty,
+    create_tar_buffer,
+    extract_json_from_tar,
+    json_data_deep_get,
+    json_dumps,
+    json_loads,
+    spool_chunks,
+    write_file_chunks,
+)
 
 
 @pytest.mark.parametrize("pass_prompt", ["", None])
@@ -29,3 +42,109 @@ def test_json_data_deep_get(json_data, key_path, expected_result):
     """Test json_data_deep_get function."""
     result = json_data_deep_get(json_data, key_path)
     assert result == expected_result
+
+
+def test_write_file_chunks(tmp_path):
+    """Test chunks are written to the file in order."""
+    path = tmp_path / "report.tar.gz"
+    write_file_chunks(str(path), iter([b"abc", b"", b"def"]))
+    assert path.read_bytes() == b"abcdef"
+
+
+def test_extract_json_from_spooled_tar():
+    """Test a tarball spooled from chunks is extracted like in-memory bytes."""
+    report = {"id": 1, "report": [{"key": "value"}]}
+    content = create_tar_buffer({"report.json": report})
+    chunks = (content[i : i + 10] for i in range(0, len(content), 10))
+    with spool_chunks(chunks) as tarball:
+        assert extract_json_from_tar(tarball, print_pretty=False) == report
+    assert extract_json_from_tar(content, print_pretty=False) == report
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_codec(request, monkeypatch):
+    """Run a test with orjson, if installed, and with the json fallback."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(utils, "orjson", None)
+    return request.param
+
+
+@pytest.mark.parametrize(
+    "json_data",
+    [
+        {"b": [1, 2.5, None, True], "a": {"nested": {}, "empty": []}},
+        {"name": "caf\u00e9 \U0001f600", "control": "\x00\x7f\n"},
+        [1e-05, 0.0001, 1e16, 123456789.125, -0.0, 5e-324],
+        {"big": 2**70, "small": -(2**64)},
+        {"text": "two  spaces,  node-1", "deep": [[[{"a": "x"}]], 1e-07]},
+        "plain",
+    ],
+)
+def test_json_dumps_matches_json_module(json_codec, json_data):
+    """Test the codec writes the same documents as the json module."""
+    assert json_dumps(json_data) == json.dumps(json_data, separators=(",", ":")).encode(
+        "ascii"
+    )
+    assert json_dumps(json_data, indent=4, sort_keys=True) == json.dumps(
+        json_data, indent=4, sort_keys=True, separators=(",", ": ")
+    ).encode("ascii")
+    assert json_loads(json_dumps(json_data)) == json_data
+
+
+class _Key(str):
+    """A str subclass, which marshal does not encode."""
+
+
+@pytest.mark.parametrize(
+    "json_data,indent",
+    [
+        ({"nan": math.nan, "inf": [math.inf, -math.inf], "none": None}, None),
+        ({"nan": math.nan, "inf": [math.inf, -math.inf], "none": None}, 4),
+        ([None, -1, -1.0, 2.5, -math.inf], None),
+        ({_Key("key"): [None, math.inf]}, None),
+        ([None] * 300_000 + [math.nan], None),
+    ],
+)
+def test_json_dumps_writes_non_finite_floats_like_json(json_codec, json_data, indent):
+    """Test NaN and infinities are written as json writes them, not as null."""
+    assert json_dumps(json_data, indent=indent) == json.dumps(
+        json_data, indent=indent, separators=(",", ":" if indent is None else ": ")
+    ).encode("ascii")
+    with pytest.raises(ValueError):
+        json_dumps(json_data, allow_nan=False)
+
+
+def test_json_dumps_writes_decoded_non_finite_floats_like_json(json_codec, monkeypatch):
+    """Test NaN and infinities json_loads decoded are written back unchanged."""
+    # not even looked for in the data: their type tells orjson to step aside
+    monkeypatch.setattr(utils, "_has_non_finite_floats", lambda json_data: False)
+    document = b'{"nan":NaN,"inf":[Infinity,-Infinity],"none":null}'
+    assert json_dumps(json_loads(document)) == document
+    with pytest.raises(ValueError):
+        json_dumps(json_loads(document), allow_nan=False)
+
+
+def test_json_dumps_rejects_unsupported_types(json_codec):
+    """Test values json cannot encode are rejected whatever the codec."""
+    with pytest.raises(TypeError):
+        json_dumps({"when": object()})
+
+
+@pytest.mark.parametrize("document", [b'{"n": NaN}', '{"n": -Infinity}'])
+def test_json_loads_accepts_what_json_accepts(json_codec, document):
+    """Test documents orjson rejects are decoded by the json module."""
+    assert not math.isfinite(json_loads(document)["n"])
+
+
+def test_json_loads_decodes_big_integers(json_codec):
+    """Test integers beyond 64 bits are decoded, as floats with orjson."""
+    decoded = json_loads('{"big": 123456789012345678901234567890}')
+    assert decoded == {"big": pytest.approx(123456789012345678901234567890)}
+
+
+def test_json_loads_rejects_invalid_json(json_codec):
+    """Test invalid documents raise json.JSONDecodeError."""
+    with pytest.raises(json.JSONDecodeError):
+        json_loads(b'{"a": ')
@@ -0,0 +1,109 @@
+"""HTTP over a Unix domain socket, for a server running on the same host.
+
+A server configured with ``server config --host unix:///path/to/socket`` is
+addressed with ``http+unix://`` URLs whose host is the percent-encoded
+socket path. UnixSocketAdapter, mounted on the shared session, sends those
+requests over the socket instead of TCP, so neither TLS nor the loopback
+network stack is involved.
+"""
+
+import socket
+import threading
+from urllib.parse import quote, unquote, urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import NewConnectionError
+
+# Location prefix accepted by `server config --host`.
+UNIX_SOCKET_PREFIX = "unix://"
+# URL scheme of requests sent through UnixSocketAdapter.
+UNIX_SOCKET_SCHEME = "http+unix"
+# Host sent in the Host header; the server only sees the socket.
+UNIX_SOCKET_HOST = "localhost"
+
+
+def socket_url(socket_path):
+    """Return the base URL addressing the server listening on socket_path."""
+    return f"{UNIX_SOCKET_SCHEME}://{quote(str(socket_path), safe='')}"
+
+
+def url_socket_path(url):
+    """Return the socket path a http+unix URL points to.
+
+    :param url: URL built with socket_url()
+    :returns: the socket path, or None for other URLs
+    """
+    parts = urlsplit(url)
+    if parts.scheme != UNIX_SOCKET_SCHEME:
+        return None
+    return unquote(parts.netloc)
+
+
+class UnixSocketConnection(HTTPConnection):
+    """HTTP connection to a Unix domain socket."""
+
+    def __init__(self, *args, socket_path, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as err:
+            sock.close()
+            raise NewConnectionError(
+                self, f"Failed to connect to {self.socket_path}: {err}"
+            ) from err
+        return sock
+
+
+class UnixSocketConnectionPool(HTTPConnectionPool):
+    """Pool of keep-alive connections to a Unix domain socket."""
+
+    ConnectionCls = UnixSocketConnection
+
+    def __init__(self, socket_path, maxsize):
+        super().__init__(UNIX_SOCKET_HOST, maxsize=maxsize, socket_path=socket_path)
+
+
+class UnixSocketAdapter(HTTPAdapter):
+    """Transport adapter sending http+unix requests over a Unix socket."""
+
+    def __init__(self, pool_maxsize):
+        super().__init__(pool_maxsize=pool_maxsize)
+        self._unix_pools = {}
+        self._unix_pools_lock = threading.Lock()
+
+    def _unix_pool(self, url):
+        socket_path = url_socket_path(url)
+        with self._unix_pools_lock:
+            pool = self._unix_pools.get(socket_path)
+            if pool is None:
+                pool = UnixSocketConnectionPool(socket_path, self._pool_maxsize)
+                self._unix_pools[socket_path] = pool
+            return pool
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        """Return the pool for the socket the request is addressed to."""
+        return self._unix_pool(request.url)
+
+    def get_connection(self, url, proxies=None):
+        """Return the pool for the socket url is addressed to."""
+        return self._unix_pool(url)
+
+    def request_url(self, request, proxies):
+        """Send the path only; the socket path is not part of the request."""
+        return request.path_url
+
+    def close(self):
+        """Close the pooled socket connections."""
+        with self._unix_pools_lock:
+            for pool in self._unix_pools.values():
+                pool.close()
+            self._unix_pools.clear()
+        super().close()
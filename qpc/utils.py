@@ -1,20 +1,29 @@
 """QPC Command Line utilities."""
 
+import argparse
 import io
 import json
 import logging
+import marshal
+import math
 import os
 import sys
 import tarfile
+import tempfile
 from collections import defaultdict
+from dataclasses import dataclass
 from pathlib import Path
-
-from cryptography.fernet import Fernet, InvalidToken
+from types import MappingProxyType
 
 from qpc import messages
 from qpc.insights.exceptions import QPCEncryptionKeyError
 from qpc.translation import _ as t
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 QPC_PATH = "qpc"
 CONFIG_HOME_PATH = Path("~/.config/")
 DATA_HOME_PATH = Path("~/.local/share/")
@@ -25,16 +34,24 @@ DATA_DIR = DATA_HOME / QPC_PATH
 QPC_LOG = DATA_DIR / "qpc.log"
 QPC_SERVER_CONFIG = CONFIG_DIR / "server.config"
 QPC_CLIENT_TOKEN = CONFIG_DIR / "client_token"
+QPC_SERVER_INFO = CONFIG_DIR / "server_info"
 INSIGHTS_CONFIG = CONFIG_DIR / "insights.config"
 INSIGHTS_AUTH_TOKEN = CONFIG_DIR / "insights_token"
 
 INSIGHTS_ENCRYPTION = DATA_DIR / "insights_encryption"
+QPC_CACHE_DIR = DATA_DIR / "cache"
 
 CONFIG_HOST_KEY = "host"
 CONFIG_PORT_KEY = "port"
 CONFIG_USE_HTTP = "use_http"
 CONFIG_SSL_VERIFY = "ssl_verify"
 CONFIG_SSO_HOST_KEY = "sso_host"
+CONFIG_SOCKET_KEY = "socket"
+CONFIG_MAX_CONCURRENCY_KEY = "max_concurrency"
+CONFIG_SHORT_TIMEOUT_KEY = "short_timeout"
+CONFIG_LONG_TIMEOUT_KEY = "long_timeout"
+CONFIG_HTTP2_KEY = "http2"
+CONFIG_RESPONSE_CACHE_KEY = "response_cache"
 
 CLIENT_TOKEN_KEY = "token"
 CLIENT_TOKEN_TEST_VALUE = "abc123"
@@ -66,16 +83,120 @@ def ensure_config_dir_exists():
         CONFIG_DIR.mkdir(parents=True)
 
 
+@dataclass(frozen=True)
+class ClientConfig:
+    """Server configuration and client token, as loaded from disk.
+
+    Instances are immutable; use get_client_config() to obtain the memoized
+    instance and invalidate_client_config() after writing new values.
+    """
+
+    server_config: MappingProxyType | None
+    token: str | None
+
+    @property
+    def ssl_verify(self):
+        """Obtain configuration for using ssl cert verification."""
+        if self.server_config is None:
+            # No configuration written to server.config
+            return None
+        ssl_verify = self.server_config.get(CONFIG_SSL_VERIFY, False)
+        if not ssl_verify:
+            ssl_verify = False
+        return ssl_verify
+
+    @property
+    def server_location(self):
+        """Build URI from server configuration.
+
+        :returns: The URI to the sonar server.
+        """
+        config = self.server_config
+        if config is None:
+            # No configuration written to server.config
+            return None
+
+        if self.socket_path:
+            from qpc.unix_socket import socket_url  # noqa: PLC0415
+
+            return socket_url(self.socket_path)
+
+        use_http = config.get(CONFIG_USE_HTTP, False)
+        protocol = "https"
+        if use_http:
+            protocol = "http"
+
+        return f"{protocol}://{config[CONFIG_HOST_KEY]}:{config[CONFIG_PORT_KEY]}"
+
+    @property
+    def socket_path(self):
+        """Obtain the Unix socket the server listens on, if configured."""
+        if self.server_config is None:
+            return None
+        return self.server_config.get(CONFIG_SOCKET_KEY)
+
+    @property
+    def max_concurrency(self):
+        """Obtain the most requests that may be in flight at the same time."""
+        if self.server_config is None:
+            return None
+        return self.server_config.get(CONFIG_MAX_CONCURRENCY_KEY)
+
+    @property
+    def http2(self):
+        """Obtain configuration for talking to the server over HTTP/2."""
+        if self.server_config is None:
+            return False
+        return self.server_config.get(CONFIG_HTTP2_KEY, False)
+
+    @property
+    def response_cache(self):
+        """Obtain whether responses are kept in the on-disk response cache."""
+        if self.server_config is None:
+            return False
+        return self.server_config.get(CONFIG_RESPONSE_CACHE_KEY, False)
+
+    def timeout(self, timeout_key):
+        """Obtain the connect and read timeouts configured under timeout_key.
+
+        :param timeout_key: CONFIG_SHORT_TIMEOUT_KEY or CONFIG_LONG_TIMEOUT_KEY
+        :returns: (connect, read) timeouts in seconds, or None if not configured
+        """
+        if self.server_config is None:
+            return None
+        timeout = self.server_config.get(timeout_key)
+        return tuple(timeout) if timeout else None
+
+
+# Memoized ClientConfig, keyed by the paths it was read from.
+_client_config_cache = {}
+
+
+def get_client_config():
+    """Return the client configuration, reading it from disk only once.
+
+    :returns: ClientConfig instance
+    """
+    key = (QPC_SERVER_CONFIG, QPC_CLIENT_TOKEN)
+    client_config = _client_config_cache.get(key)
+    if client_config is None:
+        server_config = read_server_config()
+        if server_config is not None:
+            server_config = MappingProxyType(server_config)
+        client_config = ClientConfig(server_config, _read_client_token_file())
+        _client_config_cache.clear()
+        _client_config_cache[key] = client_config
+    return client_config
+
+
+def invalidate_client_config():
+    """Forget the memoized client configuration so it is read again."""
+    _client_config_cache.clear()
+
+
 def get_ssl_verify():
     """Obtain configuration for using ssl cert verification."""
-    config = read_server_config()
-    if config is None:
-        # No configuration written to server.config
-        return None
-    ssl_verify = config.get(CONFIG_SSL_VERIFY, False)
-    if not ssl_verify:
-        ssl_verify = False
-    return ssl_verify
+    return get_client_config().ssl_verify
 
 
 def get_server_location():
@@ -83,25 +204,20 @@ def get_server_location():
 
     :returns: The URI to the sonar server.
     """
-    config = read_server_config()
-    if config is None:
-        # No configuration written to server.config
-        return None
-
-    use_http = config.get(CONFIG_USE_HTTP, False)
-    protocol = "https"
-    if use_http:
-        protocol = "http"
-
-    server_location = (
-        f"{protocol}://{config[CONFIG_HOST_KEY]}:{config[CONFIG_PORT_KEY]}"
-    )
-    return server_location
+    return get_client_config().server_location
 
 
 def read_client_token():
     """Retrieve client token for sonar server.
 
+    :returns: The client token or None
+    """
+    return get_client_config().token
+
+
+def _read_client_token_file():
+    """Read the client token from disk.
+
     :returns: The client token or None
     """
     if not QPC_CLIENT_TOKEN.exists():
@@ -130,7 +246,7 @@ def read_insights_config():
     return insights_config
 
 
-def read_server_config():  # noqa: C901 PLR0911
+def read_server_config():  # noqa: C901 PLR0911 PLR0912
     """Retrieve configuration for sonar server.
 
     :returns: The validate dictionary with configuration
@@ -148,6 +264,15 @@ def read_server_config():  # noqa: C901 PLR0911
     port = config.get(CONFIG_PORT_KEY)
     use_http = config.get(CONFIG_USE_HTTP)
     ssl_verify = config.get(CONFIG_SSL_VERIFY, False)
+    socket_path = config.get(CONFIG_SOCKET_KEY)
+    max_concurrency = config.get(CONFIG_MAX_CONCURRENCY_KEY)
+    http2 = config.get(CONFIG_HTTP2_KEY, False)
+    response_cache = config.get(CONFIG_RESPONSE_CACHE_KEY, False)
+    timeouts = {
+        key: config[key]
+        for key in (CONFIG_SHORT_TIMEOUT_KEY, CONFIG_LONG_TIMEOUT_KEY)
+        if config.get(key) is not None
+    }
 
     host_empty = host is None or host == ""
     port_empty = port is None or port == ""
@@ -206,12 +331,82 @@ def read_server_config():  # noqa: C901 PLR0911
         )
         return None
 
-    return {
+    if socket_path is not None and not isinstance(socket_path, str):
+        logger.error(
+            "Server config %s has invalid value for socket %s",
+            QPC_SERVER_CONFIG,
+            socket_path,
+        )
+        return None
+
+    if max_concurrency is not None and (
+        not isinstance(max_concurrency, int)
+        or isinstance(max_concurrency, bool)
+        or max_concurrency <= 0
+    ):
+        logger.error(
+            "Server config %s has invalid value for max_concurrency %s",
+            QPC_SERVER_CONFIG,
+            max_concurrency,
+        )
+        return None
+
+    if not isinstance(http2, bool):
+        logger.error(
+            "Server config %s has invalid value for http2 %s",
+            QPC_SERVER_CONFIG,
+            http2,
+        )
+        return None
+
+    if not isinstance(response_cache, bool):
+        logger.error(
+            "Server config %s has invalid value for response_cache %s",
+            QPC_SERVER_CONFIG,
+            response_cache,
+        )
+        return None
+
+    for key, timeout in timeouts.items():
+        if not _is_timeout(timeout):
+            logger.error(
+                "Server config %s has invalid value for %s %s",
+                QPC_SERVER_CONFIG,
+                key,
+                timeout,
+            )
+            return None
+
+    server_config = {
         CONFIG_HOST_KEY: host,
         CONFIG_PORT_KEY: port,
         CONFIG_USE_HTTP: use_http,
         CONFIG_SSL_VERIFY: ssl_verify,
     }
+    if socket_path:
+        server_config[CONFIG_SOCKET_KEY] = socket_path
+    if max_concurrency is not None:
+        server_config[CONFIG_MAX_CONCURRENCY_KEY] = max_concurrency
+    if http2:
+        server_config[CONFIG_HTTP2_KEY] = http2
+    if response_cache:
+        server_config[CONFIG_RESPONSE_CACHE_KEY] = response_cache
+    server_config.update(timeouts)
+    return server_config
+
+
+def _is_timeout(timeout):
+    """Check timeout is a [connect, read] pair of positive numbers."""
+    return (
+        isinstance(timeout, list)
+        and len(timeout) == 2  # noqa: PLR2004
+        and all(
+            isinstance(seconds, (int, float))
+            and not isinstance(seconds, bool)
+            and seconds > 0
+            for seconds in timeout
+        )
+    )
 
 
 def write_config(config_file_path, config_dict):
@@ -232,6 +427,35 @@ def write_server_config(server_config):
     :param server_config: dict containing server configuration
     """
     write_config(QPC_SERVER_CONFIG, server_config)
+    invalidate_client_config()
+    clear_server_info()
+
+
+def read_server_info():
+    """Read the server versions and capabilities recorded in server_info.
+
+    :returns: dict mapping server locations to their recorded information
+    """
+    try:
+        server_info = json.loads(QPC_SERVER_INFO.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(server_info, dict):
+        return {}
+    return server_info
+
+
+def write_server_info(server_info):
+    """Write server versions and capabilities to server_info.
+
+    :param server_info: dict mapping server locations to their information
+    """
+    write_config(QPC_SERVER_INFO, server_info)
+
+
+def clear_server_info():
+    """Forget the recorded server versions and capabilities."""
+    Path(QPC_SERVER_INFO).unlink(missing_ok=True)
 
 
 def write_insights_config(insights_config):
@@ -256,6 +480,8 @@ def read_insights_auth_token():
     if not INSIGHTS_AUTH_TOKEN.exists():
         return None
 
+    from qpc.encryption import decrypt_password  # noqa: PLC0415
+
     try:
         return decrypt_password(INSIGHTS_AUTH_TOKEN.read_text())
     except QPCEncryptionKeyError:
@@ -267,6 +493,8 @@ def write_insights_auth_token(auth_token):
 
     :param auth_token: Insight's user JWT auth token
     """
+    from qpc.encryption import encrypt_password  # noqa: PLC0415
+
     ensure_config_dir_exists()
 
     if auth_token:
@@ -285,6 +513,7 @@ def write_client_token(client_token):
 
     with QPC_CLIENT_TOKEN.open("w", encoding="utf-8") as config_file:
         json.dump(client_token, config_file)
+    invalidate_client_config()
 
 
 def delete_client_token():
@@ -294,6 +523,7 @@ def delete_client_token():
         QPC_CLIENT_TOKEN.unlink()
     except FileNotFoundError:
         pass
+    invalidate_client_config()
 
 
 def ensure_data_dir_exists():
@@ -302,6 +532,49 @@ def ensure_data_dir_exists():
         DATA_DIR.mkdir(parents=True)
 
 
+def positive_int(value):
+    """Argparse type for options accepting an integer greater than zero."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"invalid positive int value: '{value}'")
+    return number
+
+
+def positive_float(value):
+    """Argparse type for options accepting a number greater than zero."""
+    try:
+        number = float(value)
+    except ValueError:
+        number = 0
+    if not number > 0 or number == float("inf"):
+        raise argparse.ArgumentTypeError(f"invalid positive number: '{value}'")
+    return number
+
+
+def timeout_pair(value):
+    """Argparse type for options accepting CONNECT,READ timeouts in seconds.
+
+    A single number sets both timeouts.
+
+    :returns: [connect, read] timeouts
+    """
+    timeouts = [positive_float(seconds) for seconds in value.split(",")]
+    if len(timeouts) == 1:
+        timeouts *= 2
+    if len(timeouts) != 2:  # noqa: PLR2004
+        raise argparse.ArgumentTypeError(f"invalid CONNECT,READ timeouts: '{value}'")
+    return timeouts
+
+
+# Whether setup_logging() configured the root logger, and the handler it added
+# to print the messages of qpc, both replaced when it is run again.
+_root_logging_configured = False
+_stream_handler = None
+
+
 def setup_logging(verbosity):
     """Set up Python logging for qpc.
 
@@ -322,9 +595,18 @@ def setup_logging(verbosity):
         log_prefix += " - [%(funcName)s] - %(pathname)s:%(lineno)d"
 
     log_fmt = f"{log_prefix} - %(message)s"
-    # Using basicConfig here means that all log messages, even
-    # those not coming from qpc, will go to the log file
-    logging.basicConfig(filename=QPC_LOG, format=log_fmt, level=log_level)
+    global _root_logging_configured, _stream_handler  # noqa: PLW0603
+    root_logger = logging.getLogger()
+    if _root_logging_configured:
+        # run again by `qpc shell` for each command, with its own verbosity
+        root_logger.setLevel(log_level)
+        for handler in root_logger.handlers:
+            handler.setFormatter(logging.Formatter(log_fmt))
+    elif not root_logger.handlers:
+        # Using basicConfig here means that all log messages, even
+        # those not coming from qpc, will go to the log file
+        logging.basicConfig(filename=QPC_LOG, format=log_fmt, level=log_level)
+        _root_logging_configured = True
     stream_handler = logging.StreamHandler()
     if log_level == logging.DEBUG:
         # changing log format was breaking camayoc tests. let's add this extra logging
@@ -334,7 +616,10 @@ def setup_logging(verbosity):
     stream_handler.setLevel(log_level)
     main_package_name, *_ = __name__.partition(".")
     global_logger = logging.getLogger(main_package_name)
+    if _stream_handler is not None:
+        global_logger.removeHandler(_stream_handler)
     global_logger.addHandler(stream_handler)
+    _stream_handler = stream_handler
 
 
 def log_request_info(method, command, url, response_json, response_code):
@@ -391,13 +676,204 @@ def handle_error_response(response):  # noqa: C901 PLR0912
         pass
 
 
+# orjson is used when installed, but only where its result is the same as
+# json's. Documents are checked for what it handles differently by mapping
+# their bytes to a few classes with bytes.translate() and searching the
+# result, a chunk at a time to bound the memory used.
+_JSON_SCAN_CHUNK = 16 * 1024 * 1024
+_JSON_SCAN_OVERLAP = 32
+
+
+def _byte_classes(classes, default="x"):
+    table = bytearray(default.encode() * 256)
+    for members, symbol in classes.items():
+        for member in members.encode("latin-1"):
+            table[member] = ord(symbol)
+    return bytes(table)
+
+
+# Floats below 1e-4 are written 0.0000125 or 1.25e-7 by orjson, where json
+# writes 1.25e-05 and 1.25e-07; other floats are written the same. A value
+# ends with one of ",]}\n", which tells exponents from hex digits in text.
+_FLOAT_CLASSES = _byte_classes(
+    {"0": "0", "123456789": "1", ".": ".", "e": "e", "-": "-", ",]}\n": ","}
+)
+# Runs of spaces other than the indentation, i.e. in strings.
+_SPACE_CLASSES = _byte_classes({" ": " ", "\n": "\n"})
+
+
+def _translated_chunks(document, classes):
+    """Yield the document mapped to classes, in overlapping chunks."""
+    for start in range(0, len(document), _JSON_SCAN_CHUNK):
+        end = start + _JSON_SCAN_CHUNK + _JSON_SCAN_OVERLAP
+        yield document[start:end].translate(classes)
+
+
+def _find_all(chunk, needle):
+    position = chunk.find(needle)
+    while position != -1:
+        yield position
+        position = chunk.find(needle, position + 1)
+
+
+def _has_small_floats(document):
+    """Check whether orjson wrote floats json would write differently."""
+    for chunk in _translated_chunks(document, _FLOAT_CLASSES):
+        for position in _find_all(chunk, b"0.0000"):
+            if chunk[position - 1 : position] not in {b"0", b"1", b"."}:
+                return True
+        for position in _find_all(chunk, b"e-1"):
+            mantissa = chunk[position - 1 : position]
+            exponent = chunk[position + 3 : position + 4]
+            if mantissa in {b"0", b"1"} and exponent in {b",", b""}:
+                return True
+    return False
+
+
+def json_loads(document):
+    """Decode a JSON document, with orjson if it is installed.
+
+    Documents orjson rejects, like those with NaN, are decoded by json, with
+    NaN and infinities decoded as NonFiniteFloat so json_dumps() writes them
+    back unchanged. Like with orjson, integers beyond 64 bits are decoded as
+    floats; the documents of the server hold none.
+
+    :param document: the JSON document, as str or bytes
+    :returns: the decoded data
+    :raises: json.JSONDecodeError if the document is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(document)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(document, parse_constant=NonFiniteFloat)
+
+
+class NonFiniteFloat(float):
+    """NaN or infinity decoded by json_loads().
+
+    orjson writes non-finite floats as null but does not encode float
+    subclasses, so json_dumps() has json write these as NaN, Infinity and
+    -Infinity without looking for them in the data.
+    """
+
+
+# marshal writes a float as "g", with 0x80 added when it is referenced again,
+# and 8 little-endian bytes. The last two are f0-ff and 7f or ff for NaN and
+# infinities, whose exponent bits are all set.
+_MARSHAL_FLOAT_TYPES = frozenset({ord("g"), ord("g") | 0x80})
+_MARSHAL_FLOAT_OFFSET = 7
+_EXPONENT_CLASSES = _byte_classes(
+    {bytes(range(0xF0, 0xFF)).decode("latin-1"): "F", "\xff": "B", "\x7f": "H"}
+)
+_NON_FINITE_EXPONENTS = (b"FH", b"FB", b"BH", b"BB")
+
+
+def _has_non_finite_floats(json_data):
+    """Check whether data holds NaN or infinite floats, written null by orjson.
+
+    The data is marshalled, which walks it much faster than Python code, and
+    the floats of the result are looked for.
+    """
+    try:
+        marshalled = marshal.dumps(json_data, marshal.version)
+    except ValueError:
+        # subclasses of str, list and the like, which orjson also encodes
+        return _walk_non_finite_floats(json_data)
+    for start in range(0, len(marshalled), _JSON_SCAN_CHUNK):
+        chunk = marshalled[start : start + _JSON_SCAN_CHUNK + _JSON_SCAN_OVERLAP]
+        classes = chunk.translate(_EXPONENT_CLASSES)
+        for exponent in _NON_FINITE_EXPONENTS:
+            for position in _find_all(classes, exponent):
+                float_type = position - _MARSHAL_FLOAT_OFFSET
+                if float_type >= 0 and chunk[float_type] in _MARSHAL_FLOAT_TYPES:
+                    return True
+    return False
+
+
+def _walk_non_finite_floats(json_data):
+    if isinstance(json_data, float):
+        return not math.isfinite(json_data)
+    if isinstance(json_data, dict):
+        json_data = json_data.values()
+    elif not isinstance(json_data, (list, tuple)):
+        return False
+    return any(_walk_non_finite_floats(value) for value in json_data)
+
+
+def json_dumps(json_data, indent=None, sort_keys=False, allow_nan=True):
+    """Encode data as a JSON document, with orjson if it is installed.
+
+    The document is the one json.dumps() writes with ensure_ascii and
+    separators (",", ":"), or (",", ": ") when indented. Data orjson would
+    encode differently, i.e. non-ASCII text, small and non-finite floats and
+    values orjson does not support, are encoded by json.
+
+    :param json_data: the data to encode
+    :param indent: number of spaces nested values are indented with, or None
+        for a compact document
+    :param sort_keys: write the keys of objects in sorted order
+    :param allow_nan: write NaN and infinite floats as NaN, Infinity and
+        -Infinity like json does, instead of raising ValueError
+    :returns: the JSON document as bytes
+    """
+    if orjson is not None and (indent is None or indent > 0):
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent is not None:
+            option |= orjson.OPT_INDENT_2
+        try:
+            document = orjson.dumps(json_data, option=option)
+        except TypeError:
+            document = None
+        if (
+            document is not None
+            and document.isascii()
+            and b"\x7f" not in document
+            and not _has_small_floats(document)
+            and not (b"null" in document and _has_non_finite_floats(json_data))
+        ):
+            if indent is not None:
+                document = _reindent(document, indent)
+            return document
+    separators = (",", ":") if indent is None else (",", ": ")
+    return json.dumps(
+        json_data,
+        indent=indent,
+        sort_keys=sort_keys,
+        separators=separators,
+        allow_nan=allow_nan,
+    ).encode("ascii")
+
+
+def _reindent(document, indent):
+    """Widen the two space indentation orjson writes to indent spaces."""
+    if indent == 2:  # noqa: PLR2004
+        return document
+    if not any(
+        b"x  " in chunk for chunk in _translated_chunks(document, _SPACE_CLASSES)
+    ):
+        # every pair of spaces is a level of indentation
+        return document.replace(b"  ", b" " * indent)
+    depth = 0
+    while b"\n" + b"  " * (depth + 1) in document:
+        depth += 1
+    # deepest lines first, marking converted levels with NUL bytes, which
+    # orjson always escapes
+    for level in range(depth, 0, -1):
+        document = document.replace(b"\n" + b"  " * level, b"\n" + b"\0" * level)
+    return document.replace(b"\0", b" " * indent)
+
+
 def pretty_format(json_data):
     """Provide pretty formatting of output json data.
 
     :param json_data: the json data to pretty print
     :returns: the pretty print string of the json data
     """
-    return json.dumps(json_data, sort_keys=True, indent=4, separators=(",", ": "))
+    return json_dumps(json_data, indent=4, sort_keys=True).decode("ascii")
 
 
 def tabular_format(json_data: list[dict], fields: dict) -> str:
@@ -520,17 +996,46 @@ def write_file(filename, content, binary=False):
     return result
 
 
+def write_file_chunks(filename, chunks, append=False):
+    """Write binary chunks to a file as they are produced.
+
+    :param filename: the filename to write
+    :param chunks: iterable of bytes, i.e. a streamed response body
+    :param append: add the chunks after the current content of the file
+    :raises: EnvironmentError if file cannot be written
+    """
+    output_path = Path(os.path.expandvars(filename)).expanduser()
+    with output_path.open("ab" if append else "wb") as out_file:
+        for chunk in chunks:
+            out_file.write(chunk)
+
+
+def spool_chunks(chunks):
+    """Spool binary chunks to an anonymous temporary file.
+
+    :param chunks: iterable of bytes, i.e. a streamed response body
+    :returns: the temporary file, positioned at its start
+    """
+    spool = tempfile.TemporaryFile()
+    for chunk in chunks:
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
 def extract_json_from_tar(fileobj_content, print_pretty=True):
     """Extract json data from tar.gz bytes.
 
-    :param fileobj_content: BytesIo object with tarball of json dict
+    :param fileobj_content: tarball of json dict, as bytes or a binary file
     :param print_pretty: Boolean to determine whether to return pretty
         print json (str) or normal json
     """
-    with tarfile.open(fileobj=io.BytesIO(fileobj_content), mode="r:gz") as tar:
+    if isinstance(fileobj_content, bytes):
+        fileobj_content = io.BytesIO(fileobj_content)
+    with tarfile.open(fileobj=fileobj_content, mode="r:gz") as tar:
         json_file = tar.getmembers()[0]
         tar_info = tar.extractfile(json_file)
-        json_data = json.loads(tar_info.read().decode("utf-8"))
+        json_data = json_loads(tar_info.read())
         if print_pretty:
             return pretty_format(json_data)
         return json_data
@@ -570,54 +1075,6 @@ def check_extension(extension, path):
         sys.exit(1)
 
 
-def write_encryption_key_if_non_existent():
-    """Generate encryption key.
-
-    Key will be generated only once and saved at INSIGHTS_ENCRYPTION file,
-    the function will check its existence every time it is called
-    """
-    if not INSIGHTS_ENCRYPTION.exists():
-        key = Fernet.generate_key()
-        INSIGHTS_ENCRYPTION.write_bytes(key)
-        INSIGHTS_ENCRYPTION.chmod(0o600)
-
-
-def load_encryption_key():
-    """Load encryption from insights_encryption file."""
-    stats = INSIGHTS_ENCRYPTION.stat()
-    if oct(stats.st_mode).endswith("00"):
-        return INSIGHTS_ENCRYPTION.read_bytes()
-
-    raise QPCEncryptionKeyError(
-        "There was a problem while trying to load the password encryption key."
-    )
-
-
-def encrypt_password(password):
-    """Encrypt password before saving it to a config file."""
-    write_encryption_key_if_non_existent()
-    key = load_encryption_key()
-
-    encryption_algorithm = Fernet(key)
-
-    encrypted_password = encryption_algorithm.encrypt(password.encode())
-    return encrypted_password.decode()
-
-
-def decrypt_password(password):
-    """Retrieve password from login config file and decrypt it."""
-    key = load_encryption_key()
-    encryption_algorithm = Fernet(key)
-
-    try:
-        decrypted_password = encryption_algorithm.decrypt(password.encode())
-    except InvalidToken as exc:
-        raise QPCEncryptionKeyError(
-            "There was a problem while decrypting your password."
-        ) from exc
-    return decrypted_password.decode()
-
-
 def check_if_prompt_is_not_empty(pass_prompt):
     """Validate user prompt."""
     if not pass_prompt: